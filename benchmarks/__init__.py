@@ -0,0 +1,5 @@
+"""
+Micro benchmarks for the hot paths of the app.
+
+Run them from the root of the repo, eg: `poetry run python -m benchmarks.read_path`
+"""
@@ -0,0 +1,92 @@
+"""
+Benchmark: parse of the pages from their text or from their bytes
+
+Compares the two ways of handing a fetched page to the `Scrapper`:
+ - text: what `response.text` does when the response declares no charset,
+   the encoding is guessed from the bytes (charset_normalizer), the page is
+   decoded, and lxml parses the text
+ - bytes: the bytes are parsed as is, with the encoding found from the BOM,
+   the `<meta>` charset or the utf-8 check (`detect_encoding`)
+
+The pages are the ones the tests use, plus a large page without a declared
+charset and with a latin-1 body, where guessing the charset costs the most.
+The output of both must be the same.
+
+Usage:
+    poetry run python -m benchmarks.decoding [--count 200]
+"""
+
+# Builtin imports
+import argparse
+import os
+import timeit
+
+# Project specific imports
+from requests.compat import chardet
+
+# Local imports
+from recommend_app.scrapper.scrapper import Scrapper
+
+RESOURCES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "tests", "scrapper", "resources"
+)
+
+# -----------------------------------------------------------------------------#
+# Pages
+# -----------------------------------------------------------------------------#
+
+
+def load_pages() -> list[tuple[str, bytes]]:
+    pages = []
+    for filename in sorted(os.listdir(RESOURCES_DIR)):
+        with open(os.path.join(RESOURCES_DIR, filename), "rb") as f:
+            pages.append((filename, f.read()))
+
+    body = "".join(f"<p>Paragraphe {i}, café crème à emporter</p>" for i in range(5000))
+    page = (
+        "<html><head><title>Menu du café</title>"
+        '<meta name="description" content="Crème brûlée"></head>'
+        f"<body>{body}</body></html>"
+    )
+    pages.append(("large_latin1", page.encode("latin-1")))
+    return pages
+
+
+# -----------------------------------------------------------------------------#
+# Benchmark
+# -----------------------------------------------------------------------------#
+
+
+def from_text(content: bytes) -> dict:
+    encoding = chardet.detect(content)["encoding"] or "utf-8"
+    return Scrapper(content.decode(encoding, errors="replace")).scrap()
+
+
+def from_bytes(content: bytes) -> dict:
+    return Scrapper(content).scrap()
+
+
+def parse(func, content: bytes, count: int) -> float:
+    """
+    Seconds per parse
+    """
+    return min(timeit.repeat(lambda: func(content), number=count, repeat=3)) / count
+
+
+def run(count: int) -> None:
+    print(f"{'page':<18}{'text (us)':>14}{'bytes (us)':>14}{'speedup':>10}")
+    for name, content in load_pages():
+        # Same output from both
+        assert from_text(content) == from_bytes(content), name
+
+        before = parse(from_text, content, count)
+        after = parse(from_bytes, content, count)
+        print(
+            f"{name:<18}{before * 1e6:>14.1f}{after * 1e6:>14.1f}{before / after:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--count", type=int, default=200)
+    run(parser.parse_args().count)
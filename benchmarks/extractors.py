@@ -0,0 +1,75 @@
+"""
+Benchmark: extractors of the known sites
+
+Compares the parse of the pages of each registered site, from the bytes
+that were fetched to the card data:
+ - before: the generic `Scrapper`, building a tree of the tags of the page
+ - after: the extractor of the site (`extractors.extract`), falling back to
+   the generic `Scrapper` when the page misses some fields
+
+The pages are the ones the tests use. The output of both must be the same.
+
+Usage:
+    poetry run python -m benchmarks.extractors [--count 2000]
+"""
+
+# Builtin imports
+import argparse
+import os
+import timeit
+
+# Local imports
+from recommend_app.scrapper.extractors import extract, get_extractor
+from recommend_app.scrapper.scrapper import Scrapper
+
+RESOURCES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "tests", "scrapper", "resources"
+)
+
+# Page of each registered site, with the url it is served at
+PAGES = [
+    ("netflix.html", "https://www.netflix.com/gb/title/81767635"),
+    ("netflix_og.html", "https://www.netflix.com/gb/title/81767635"),
+    ("prime.html", "https://www.primevideo.com/detail/0LFTUUH6Q7ZCJJ9TWV4ZAZW9QN"),
+    ("disney.html", "https://www.disneyplus.com/movies/the-batman"),
+    ("dplus.html", "https://www.discoveryplus.com/gb/show/grand-designs"),
+]
+
+# -----------------------------------------------------------------------------#
+# Benchmark
+# -----------------------------------------------------------------------------#
+
+
+def parse(func, count: int) -> float:
+    """
+    Seconds per parse
+    """
+    return min(timeit.repeat(func, number=count, repeat=3)) / count
+
+
+def run(count: int) -> None:
+    print(
+        f"{'page':<18}{'extractor':<22}{'before (us)':>14}{'after (us)':>14}"
+        f"{'speedup':>10}"
+    )
+    for filename, url in PAGES:
+        with open(os.path.join(RESOURCES_DIR, filename), "rb") as f:
+            content = f.read()
+
+        # Same output from both
+        expected = Scrapper(content).scrap()
+        assert extract(content, url=url) == expected, filename
+
+        before = parse(lambda: Scrapper(content).scrap(), count)
+        after = parse(lambda: extract(content, url=url), count)
+        name = type(get_extractor(url)).__name__
+        print(
+            f"{filename:<18}{name:<22}{before * 1e6:>14.1f}{after * 1e6:>14.1f}"
+            f"{before / after:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--count", type=int, default=2000)
+    run(parser.parse_args().count)
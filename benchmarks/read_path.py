@@ -0,0 +1,125 @@
+"""
+Benchmark: Mongo document to *InDb model
+
+Compares the per document cost of the two read paths:
+ - before: raw document -> beanie document -> model_dump -> *InDb (validated)
+ - after: raw document -> *InDb.model_construct (trusted, see `model_from_raw`)
+
+Beanie documents can only be created once beanie is initialised, so this
+needs the same DB_* environment variables as the app. Nothing is written to
+the database.
+
+Usage:
+    poetry run python -m benchmarks.read_path [--count 10000]
+"""
+
+# Builtin imports
+import argparse
+import asyncio
+import timeit
+
+# Project specific imports
+from bson import ObjectId
+from dotenv import load_dotenv
+
+# Local imports
+from recommend_app.db import RecommendDB
+from recommend_app.db.impl.documents.base import model_from_raw
+from recommend_app.db.impl.documents.user import UserDocument
+from recommend_app.db.impl.documents.board import BoardDocument
+from recommend_app.db.impl.documents.card import CardDocument
+from recommend_app.db.models.user import UserInDb
+from recommend_app.db.models.board import BoardInDb
+from recommend_app.db.models.card import CardInDb
+
+# -----------------------------------------------------------------------------#
+# Raw documents
+# -----------------------------------------------------------------------------#
+
+
+def raw_user(index: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "email_address": f"john.doe{index}@email.com",
+        "user_name": f"john_doe{index}",
+        "first_name": "John",
+        "last_name": "Doe",
+        "password": "$2b$12$KIXQJ2v0D8p9M2Ijh6c1Ue3lV1m7q8Jm3pQ6m0tQp8Jb0l1n2o3p4",
+    }
+
+
+def raw_board(index: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "name": f"Movies to watch {index}",
+        "private": False,
+        "owner_id": "6744a0ddee62a60d03f06d99",
+    }
+
+
+def raw_card(index: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "url": f"https://www.netflix.com/gb/title/{index}",
+        "title": "Godzilla Minus One",
+        "description": "Post war Japan is at its lowest point when a new crisis emerges.",
+        "thumbnail": "https://occ-0-5262-1168.1.nflxso.net/dnm/api/v6/image.jpg",
+        "board_id": "67407a5d14376db5b4218532",
+    }
+
+
+CASES = [
+    ("user", UserDocument, UserInDb, raw_user),
+    ("board", BoardDocument, BoardInDb, raw_board),
+    ("card", CardDocument, CardInDb, raw_card),
+]
+
+# -----------------------------------------------------------------------------#
+# Benchmark
+# -----------------------------------------------------------------------------#
+
+
+def run(count: int) -> None:
+    print(f"{'model':<8}{'before (us/doc)':>18}{'after (us/doc)':>18}{'speedup':>10}")
+    for name, doc_inst, model_cls, factory in CASES:
+        raws = [factory(index) for index in range(count)]
+
+        # Same output from both paths
+        assert doc_inst.model_validate(raws[0]).to_model() == model_from_raw(
+            model_cls, raws[0]
+        )
+
+        before = min(
+            timeit.repeat(
+                lambda: [doc_inst.model_validate(raw).to_model() for raw in raws],
+                number=1,
+                repeat=3,
+            )
+        )
+        after = min(
+            timeit.repeat(
+                lambda: [model_from_raw(model_cls, raw) for raw in raws],
+                number=1,
+                repeat=3,
+            )
+        )
+        print(
+            f"{name:<8}{before / count * 1e6:>18.2f}{after / count * 1e6:>18.2f}"
+            f"{before / after:>9.1f}x"
+        )
+
+
+async def main(count: int) -> None:
+    db = RecommendDB("RecommendBenchmarkDB")
+    await db.connect()
+    try:
+        run(count)
+    finally:
+        await db.disconnect(clear_db=True)
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--count", type=int, default=10000)
+    asyncio.run(main(parser.parse_args().count))
@@ -0,0 +1,164 @@
+"""
+Benchmark: extraction of the card data from a page
+
+Compares the extraction of the data once the page is parsed:
+ - before: one `soup.find` per key and source, each walking the whole tree
+ - after: a single walk indexing the og, meta, title and ld+json tags
+   (`Scrapper`)
+
+The pages are the ones the tests use, plus a page with a large head to show
+how the walks add up. The output of both must be the same.
+
+Usage:
+    poetry run python -m benchmarks.scrapper [--count 2000]
+"""
+
+# Builtin imports
+import argparse
+import json
+import os
+import timeit
+from typing import Optional
+
+# Project specific imports
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Local imports
+from recommend_app.scrapper.scrapper import PARSED_TAGS, Scrapper
+
+RESOURCES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "tests", "scrapper", "resources"
+)
+
+# -----------------------------------------------------------------------------#
+# Before: one find per key
+# -----------------------------------------------------------------------------#
+
+
+class FindScrapper:
+    """
+    `Scrapper` as it was, with a `soup.find` per key
+    """
+
+    def __init__(self, content: str):
+        self.soup = BeautifulSoup(content, "lxml", parse_only=SoupStrainer(PARSED_TAGS))
+        self.keys = ["url", "title", "description", "thumbnail"]
+        self.extracted: dict[str, Optional[str]] = {}
+
+    def scrap(self) -> dict[str, Optional[str]]:
+        for method in (self.from_ldjson, self.from_og, self.from_meta, self.get_title):
+            method()
+            if not self.keys:
+                break
+        return self.extracted
+
+    def from_ldjson(self) -> None:
+        schema = self.soup.find("script", type="application/ld+json")
+        if not schema:
+            return
+        mapper = {
+            "url": "url",
+            "title": "name",
+            "description": "description",
+            "thumbnail": "image",
+        }
+        schema_dict = json.loads(schema.text)
+        for key, schema_key in mapper.items():
+            if schema_key in schema_dict:
+                self.extracted[key] = schema_dict[schema_key]
+                self.keys.remove(key)
+
+    def from_og(self) -> None:
+        mapper = {
+            "url": "og:url",
+            "title": "og:title",
+            "description": "og:description",
+            "thumbnail": "og:image",
+        }
+        for key, og_key in mapper.items():
+            if key not in self.keys:
+                continue
+            prop = self.soup.find("meta", property=og_key, content=True)
+            if not prop:
+                continue
+            self.extracted[key] = prop["content"]
+            self.keys.remove(key)
+
+    def from_meta(self) -> None:
+        mapper = {"title": "title", "description": "description"}
+        for key, meta_key in mapper.items():
+            if key not in self.keys:
+                continue
+            meta = self.soup.find("meta", attrs={"name": meta_key}, content=True)
+            if not meta:
+                continue
+            self.extracted[key] = meta["content"]
+            self.keys.remove(key)
+
+    def get_title(self) -> None:
+        if "title" not in self.keys or not self.soup.title:
+            return
+        self.extracted["title"] = self.soup.title.text
+        self.keys.remove("title")
+
+
+# -----------------------------------------------------------------------------#
+# Pages
+# -----------------------------------------------------------------------------#
+
+
+def load_pages() -> list[tuple[str, str]]:
+    pages = []
+    for filename in sorted(os.listdir(RESOURCES_DIR)):
+        with open(os.path.join(RESOURCES_DIR, filename), encoding="utf-8") as f:
+            pages.append((filename, f.read()))
+
+    # Real heads carry hundreds of tags before the ones we look for
+    filler = "".join(
+        f'<meta name="filler-{i}" content="{i}"><script>var x{i} = {i};</script>'
+        for i in range(300)
+    )
+    pages.append(
+        (
+            "large_head",
+            f"<html><head>{filler}<title>Large</title>"
+            '<meta name="description" content="A large head"></head></html>',
+        )
+    )
+    return pages
+
+
+# -----------------------------------------------------------------------------#
+# Benchmark
+# -----------------------------------------------------------------------------#
+
+
+def extract(scrapper_cls, page: str, count: int) -> float:
+    """
+    Seconds per extraction. The page is parsed once, outside of the timing,
+    so only the extraction is measured.
+    """
+    scrappers = [scrapper_cls(page) for _ in range(count)]
+    iterator = iter(scrappers)
+    return min(
+        timeit.repeat(lambda: next(iterator).scrap(), number=count // 3, repeat=3)
+    ) / (count // 3)
+
+
+def run(count: int) -> None:
+    print(f"{'page':<18}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for name, page in load_pages():
+        # Same output from both
+        assert FindScrapper(page).scrap() == Scrapper(page).scrap(), name
+
+        before = extract(FindScrapper, page, count)
+        after = extract(Scrapper, page, count)
+        print(
+            f"{name:<18}{before * 1e6:>14.1f}{after * 1e6:>14.1f}{before / after:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--count", type=int, default=2000)
+    run(parser.parse_args().count)
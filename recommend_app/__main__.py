@@ -1,16 +1,21 @@
 """
 Entrypoint to the app
+
+`python -m recommend_app worker` runs the background jobs and
+`python -m recommend_app refresh` a single refresh pass, see `worker`.
 """
 
 # Builtin imports
 import asyncio
+import logging
+import sys
 import uuid
 
 # Project specific imports
 from dotenv import load_dotenv
 
 # Local imports
-from . import db
+from . import db, worker
 from .db.models.user import NewUser, UpdateUser
 from .db.models.board import NewBoard, UpdateBoard
 from .db.hashing import Hasher
@@ -127,4 +132,11 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if sys.argv[1:2] == ["worker"]:
+        logging.basicConfig(level=logging.INFO)
+        asyncio.run(worker.main())
+    elif sys.argv[1:2] == ["refresh"]:
+        logging.basicConfig(level=logging.INFO)
+        asyncio.run(worker.refresh())
+    else:
+        asyncio.run(main())
@@ -16,6 +16,8 @@ from dotenv import load_dotenv
 
 # Local imports
 from ..db import create_client
+from ..scrapper import ScrapeCache, close as close_scrapper
+from ..enrichment import EnrichmentWorkers, get_cached_scrap
 from .. import ui
 from . import dependencies, exceptions
 from .routers import session, users, boards, me, cards, scrapper, extension, internal
@@ -50,11 +52,20 @@ async def lifespan(app: FastAPI):
     client = get_db_client()
     await client.connect()
     dependencies.add_db_client(client)
+    scrape_cache = ScrapeCache(client)
+    dependencies.add_scrape_cache(scrape_cache)
+
+    # Enrich the cards added without their data, in the background
+    workers = EnrichmentWorkers(client, get_cached_scrap(scrape_cache))
+    workers.start()
 
     yield
 
     # Shutdown
+    await workers.stop()
     await client.disconnect()
+    client.hasher.shutdown()
+    await close_scrapper()
 
 
 app = FastAPI(lifespan=lifespan)
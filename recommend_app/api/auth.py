@@ -1,13 +1,37 @@
 """
 OAuth related functionality
+
+The users decoded from the access tokens are kept in a small LRU, keyed by
+the digest of the token, until the token expires. A token seen again is not
+verified again.
+
+The users read by the refresh path are kept for a few seconds too, keyed by
+the subject of the refresh token, so that refreshing a session doesn't read
+the db every time. Updating a user drops its entry in this process. The
+other workers keep theirs until the TTL runs out.
+
+Environment Variables:
+- `ACCESS_TOKEN_EXPIRE_MINUTES`: (Optional) Lifetime of the access tokens.
+- `REFRESH_TOKEN_EXPIRE_DAYS`: (Optional) Lifetime of the refresh tokens.
+- `AUTH_TOKEN_CACHE_MAX_BYTES`: (Optional) Size limit of the verified tokens
+                                cache. 0 disables it.
+- `AUTH_REFRESH_USER_CACHE_TTL`: (Optional) Seconds a user read by the refresh
+                                 path is kept. 0 disables it.
+
+The variables are read on first use, so that a `.env` file loaded by the app
+is taken into account.
 """
 
 # Builtin imports
+import hashlib
+import logging
+import os
+import time
 from typing import Any, Optional, Annotated, TYPE_CHECKING
 from datetime import datetime, timezone, timedelta
 
 # Project specific imports
-from fastapi import Depends, Request, HTTPException, status
+from fastapi import BackgroundTasks, Depends, Request, HTTPException, status
 from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
@@ -17,11 +41,14 @@ from jwt.exceptions import InvalidTokenError, ExpiredSignatureError
 # Local imports
 from . import dependencies, constants
 from ..db.exceptions import RecommendAppDbError, RecommendDBModelNotFound
-from ..db.hashing import Hasher
+from ..db.types import ReadPreference
+from ..lru import LRUCache, CacheStats
 
 if TYPE_CHECKING:
     from ..db.models.user import UserInDb
 
+LOGGER = logging.getLogger(__name__)
+
 
 # -----------------------------------------------------------------------------#
 # OAUTH extensions
@@ -151,16 +178,68 @@ class AuthenticatedUser(BaseModel):
         )
 
 
+# -----------------------------------------------------------------------------#
+# Caches
+# -----------------------------------------------------------------------------#
+# Users of the verified access tokens, keyed by the digest of the token
+_TOKEN_CACHE: Optional[LRUCache[bytes, AuthenticatedUser]] = None
+# Users read by the refresh path, keyed by the subject of the refresh token
+_REFRESH_USER_CACHE: Optional[LRUCache[str, AuthenticatedUser]] = None
+
+
+def _sizeof_user(user: AuthenticatedUser) -> int:
+    return len(user.model_dump_json())
+
+
+def _get_token_cache() -> LRUCache[bytes, AuthenticatedUser]:
+    global _TOKEN_CACHE
+    if _TOKEN_CACHE is None:
+        max_bytes = int(
+            os.getenv("AUTH_TOKEN_CACHE_MAX_BYTES", constants.TOKEN_CACHE_MAX_BYTES)
+        )
+        _TOKEN_CACHE = LRUCache(max_bytes=max_bytes, sizeof=_sizeof_user)
+    return _TOKEN_CACHE
+
+
+def _get_refresh_user_cache() -> LRUCache[str, AuthenticatedUser]:
+    global _REFRESH_USER_CACHE
+    if _REFRESH_USER_CACHE is None:
+        ttl = float(
+            os.getenv("AUTH_REFRESH_USER_CACHE_TTL", constants.REFRESH_USER_CACHE_TTL)
+        )
+        # No room at all disables the cache
+        max_bytes = constants.REFRESH_USER_CACHE_MAX_BYTES if ttl > 0 else 0
+        _REFRESH_USER_CACHE = LRUCache(
+            max_bytes=max_bytes, ttl=ttl, sizeof=_sizeof_user
+        )
+    return _REFRESH_USER_CACHE
+
+
 # -----------------------------------------------------------------------------#
 # Methods
 # -----------------------------------------------------------------------------#
 
 
 async def authenticate_user(
-    emailOrUserName: str, password: str
+    emailOrUserName: str,
+    password: str,
+    background_tasks: Optional[BackgroundTasks] = None,
 ) -> Optional[AuthenticatedUser]:
     """
     Authenticate the user using the email address and the password.
+
+    If the password was hashed with other settings than the current ones
+    (e.g. fewer bcrypt rounds), it is hashed again in the background, after
+    the response is sent.
+
+    Args:
+        emailOrUserName (str): Email address or user name of the user
+        password (str): Password of the user
+        background_tasks (BackgroundTasks): Tasks of the request. Optional, the
+            password is not hashed again if not given.
+
+    Returns:
+        `AuthenticatedUser` if the credentials are valid, None otherwise.
     """
     try:
         if "@" in emailOrUserName:
@@ -174,13 +253,48 @@ async def authenticate_user(
     except (RecommendAppDbError, RecommendDBModelNotFound):
         return None
 
-    verified = Hasher.verify_password(password, user.password)
+    hasher = dependencies.get_db_client().hasher
+    verified = await hasher.verify_password(password, user.password)
     if not verified:
         return None
 
+    if background_tasks is not None and hasher.needs_update(user.password):
+        background_tasks.add_task(rehash_password, user.id, password, user.password)
+
     return AuthenticatedUser.from_dbuser(user)
 
 
+async def rehash_password(user_id: str, password: str, hashed_password: str) -> None:
+    """
+    Hashes the password of the user again. Failing is harmless: the old hash
+    still works and the next login tries again.
+    """
+    try:
+        await dependencies.get_db_client().rehash_password(
+            user_id, password, hashed_password
+        )
+    except (RecommendAppDbError, RecommendDBModelNotFound) as err:
+        LOGGER.warning("Failed to rehash the password of %s: %s", user_id, err)
+
+
+def get_access_token_expires() -> timedelta:
+    """
+    Returns the lifetime of the access tokens
+    """
+    minutes = os.getenv(
+        "ACCESS_TOKEN_EXPIRE_MINUTES", constants.ACCESS_TOKEN_EXPIRE_MINUTES
+    )
+    return timedelta(minutes=float(minutes))
+
+
+def get_refresh_token_expires() -> timedelta:
+    """
+    Returns the lifetime of the refresh tokens
+    """
+    days = os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", constants.REFRESH_TOKEN_EXPIRE_DAYS)
+    return timedelta(days=float(days))
+
+
 def create_token(name: str, data: dict[str, Any], expires_delta: timedelta) -> Token:
     """
     Create a JWT token for the given data
@@ -210,8 +324,7 @@ def create_access_token_set_cookie(user: AuthenticatedUser) -> JSONResponse:
     Returns:
         A JsonResponse that sets the cookie
     """
-    access_token_expires = timedelta(minutes=constants.ACCESS_TOKEN_EXPIRE_MINUTES)
-    token = create_access_token(user, access_token_expires)
+    token = create_access_token(user, get_access_token_expires())
 
     response = JSONResponse({"status": "authenticated"})
     response.set_cookie(token.name, token.access_token, httponly=True, secure=True)
@@ -225,11 +338,50 @@ def create_refresh_token(user: AuthenticatedUser, expires_delta: timedelta) -> T
     return create_token("refresh_token", {"sub": user.sub}, expires_delta)
 
 
+def get_token_cache_stats() -> CacheStats:
+    """
+    Returns the hit, miss and eviction counters of the verified tokens cache
+    """
+    return _get_token_cache().stats
+
+
+def get_refresh_user_cache_stats() -> CacheStats:
+    """
+    Returns the hit, miss and eviction counters of the refresh path's users
+    cache
+    """
+    return _get_refresh_user_cache().stats
+
+
+def invalidate_refresh_user(email_address: str) -> None:
+    """
+    Drops the user from the refresh path's cache. To be called whenever the
+    user is updated.
+
+    Args:
+        email_address (str): Email address of the user, the subject of its
+            refresh tokens.
+    """
+    _get_refresh_user_cache().pop(email_address)
+
+
 def _decode_token(token: str) -> Optional[AuthenticatedUser]:
     """
     Decode the token and if its active, convert the payload to an authenticated
-    user object
+    user object.
+
+    The user is cached until the token expires, so a token seen again skips
+    the verification. The caller gets its own copy.
     """
+    if not token:
+        return None
+
+    key = hashlib.sha256(token.encode()).digest()
+    cache = _get_token_cache()
+    cached = cache.get(key)
+    if cached is not None:
+        return cached.model_copy()
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except (InvalidTokenError, ExpiredSignatureError):
@@ -238,25 +390,39 @@ def _decode_token(token: str) -> Optional[AuthenticatedUser]:
     # Convert payload to an authenticated user
     authenticate_user = AuthenticatedUser.from_payload(payload)
     authenticate_user.access_token = token
-    return authenticate_user
+
+    ttl = payload["exp"] - time.time()
+    if ttl > 0:
+        cache.set(key, authenticate_user, ttl=ttl)
+    return authenticate_user.model_copy()
 
 
 async def _decode_refresh_token(token: str) -> Optional[AuthenticatedUser]:
     """
-    Decode the refresh token and get the authenticated user form the payload
+    Decode the refresh token and get the authenticated user form the payload.
+
+    The user is read from the db, or from the refresh path's cache if it was
+    read a moment ago. The caller gets its own copy.
     """
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except (InvalidTokenError, ExpiredSignatureError):
         return None
 
+    cache = _get_refresh_user_cache()
+    cached = cache.get(payload["sub"])
+    if cached is not None:
+        return cached.model_copy()
+
     try:
         user = await dependencies.get_db_client().get_user(email_address=payload["sub"])
     except (RecommendAppDbError, RecommendDBModelNotFound):
         return None
 
     # Convert payload to an authenticated user
-    return AuthenticatedUser.from_dbuser(user)
+    authenticated_user = AuthenticatedUser.from_dbuser(user)
+    cache.set(payload["sub"], authenticated_user)
+    return authenticated_user.model_copy()
 
 
 async def get_user(
@@ -274,6 +440,23 @@ async def get_user(
     return _decode_token(token)
 
 
+def get_read_preference(user: Optional[AuthenticatedUser]) -> ReadPreference:
+    """
+    Read preference of the public reads of a request. Anonymous visitors can
+    live with slightly stale data, their reads go to the secondaries. A
+    logged in user reads from the primary, so that they see their own writes.
+
+    Args:
+        user (AuthenticatedUser): User making the request. None if anonymous.
+
+    Returns:
+        ReadPreference
+    """
+    if user is None:
+        return ReadPreference.SECONDARY_PREFERRED
+    return ReadPreference.PRIMARY
+
+
 async def get_authenticated_user(
     token: Annotated[str, Depends(OAUTH2_SCHEME)],
 ) -> AuthenticatedUser:
@@ -30,6 +30,7 @@ class ROUTES:
 
     # cards
     ADD_CARD = "/boards/{board_id}/cards"
+    ADD_CARDS = "/boards/{board_id}/cards:bulk"
     SHOW_CARD = "/cards/{card_id}"
     GET_CARD = "/cards/{card_id}"
     UPDATE_CARD = "/cards/{card_id}"
@@ -37,6 +38,7 @@ class ROUTES:
 
     # scrapper
     SCRAP = "/scrapper/?url={url}"
+    SCRAP_BATCH = "/scrapper/batch"
 
     # extension
     CREATE_TOKEN = "/extension/token"
@@ -54,3 +56,22 @@ class ROUTES:
 
 ACCESS_TOKEN_EXPIRE_MINUTES = 1
 REFRESH_TOKEN_EXPIRE_DAYS = 7
+
+# Verified tokens
+TOKEN_CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+# Users read by the refresh path
+REFRESH_USER_CACHE_TTL = 30
+REFRESH_USER_CACHE_MAX_BYTES = 1024 * 1024
+
+# Access tokens reissued by the extension
+REISSUED_TOKEN_CACHE_MAX_BYTES = 1024 * 1024
+
+# Pagination
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+CURSOR_PATTERN = "^[0-9a-fA-F]{24}$"
+
+# Bulk
+MAX_BULK_CARDS = 500
+MAX_SCRAP_URLS = 50
@@ -7,12 +7,14 @@ from typing import Any, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..db.client import RecommendDbClient
+    from ..scrapper import ScrapeCache
 
 # -----------------------------------------------------------------------------#
 # Globals
 # -----------------------------------------------------------------------------#
 __DEPENDENCIES: dict[str, Any] = {}
 DB_CLIENT = "db_client"
+SCRAPE_CACHE = "scrape_cache"
 
 # -----------------------------------------------------------------------------#
 # Functions
@@ -68,3 +70,23 @@ def get_db_client() -> "RecommendDbClient":
         Instance of the db client
     """
     return get(DB_CLIENT)
+
+
+def add_scrape_cache(scrape_cache: "ScrapeCache") -> None:
+    """
+    Adds the cache of the scraps to the dependency dictionary
+
+    Args:
+        scrape_cache (ScrapeCache): Cache of the scrapped cards
+    """
+    add(SCRAPE_CACHE, scrape_cache)
+
+
+def get_scrape_cache() -> "ScrapeCache":
+    """
+    Returns the cache of the scraps from the dependency dictionary
+
+    Returns:
+        Cache of the scrapped cards
+    """
+    return get(SCRAPE_CACHE)
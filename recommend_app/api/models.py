@@ -2,14 +2,27 @@
 API specific data models. Mostly used to Request and Responses
 """
 
+# Builtin imports
+from typing import Annotated, Optional, Sequence
+
 # Project specific imports
+from fastapi import Query
 from pydantic import BaseModel
 
 # Local imports
+from ..db.models.bases import BaseRecommendModel
 from ..db.models.user import UserInDb
 from ..db.models.board import BoardInDb
 from ..db.models.card import CardInDb
+from ..db.models.bulk import BulkAddFailure
 from .auth import AuthenticatedUser
+from . import constants
+
+# -----------------------------------------------------------------------------#
+# Query parameters
+# -----------------------------------------------------------------------------#
+PAGE_LIMIT = Annotated[int, Query(ge=1, le=constants.MAX_PAGE_SIZE)]
+PAGE_CURSOR = Annotated[Optional[str], Query(pattern=constants.CURSOR_PATTERN)]
 
 # -----------------------------------------------------------------------------#
 # Models
@@ -19,18 +32,50 @@ from .auth import AuthenticatedUser
 class AuthUserWithBoards(BaseModel):
     user: AuthenticatedUser
     boards: list[BoardInDb]
+    next_cursor: Optional[str] = None
 
 
 class UserWithBoards(BaseModel):
     user: UserInDb
     boards: list[BoardInDb]
+    next_cursor: Optional[str] = None
 
 
 class BoardWithCards(BaseModel):
     board: BoardInDb
     cards: list[CardInDb]
+    next_cursor: Optional[str] = None
 
 
 class BoardAndCard(BaseModel):
     board: BoardInDb
     card: CardInDb
+
+
+class BulkCards(BaseModel):
+    cards: list[CardInDb]
+    failures: list[BulkAddFailure]
+
+
+# -----------------------------------------------------------------------------#
+# Functions
+# -----------------------------------------------------------------------------#
+
+
+def get_next_cursor(
+    models: Sequence[BaseRecommendModel], limit: Optional[int]
+) -> Optional[str]:
+    """
+    Returns the cursor to fetch the page that follows the given models.
+
+    Args:
+        models (list[BaseRecommendModel]): Models of the current page.
+        limit (int): Page size the models were queried with.
+
+    Returns:
+        Id of the last model if the page is full. None if there is nothing
+        more to fetch.
+    """
+    if not limit or len(models) < limit:
+        return None
+    return models[-1].id
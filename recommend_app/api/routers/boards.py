@@ -3,12 +3,21 @@ All the boards related routes
 
 boards
     POST    /boards              - Add a new board to the db
+    POST    /boards/{id}/cards:bulk - Add a list of cards to the board
+
+The cards added with only their url are returned right away, their title,
+description and thumbnail are scrapped in the background (see `enrichment`).
 """
 
+# Builtin imports
+import logging
+from typing import Annotated
+
 # Project specific imports
-from fastapi import APIRouter, status, HTTPException, Request
+from fastapi import APIRouter, status, HTTPException, Request, Body
 
 # Local imports
+from ...enrichment import needs_enrichment
 from ...db.models.board import NewBoard, BoardInDb, UpdateBoard
 from ...db.models.card import NewCard, CardInDb
 
@@ -17,11 +26,19 @@ from ...db.exceptions import (
     RecommendDBModelNotFound,
     RecommendAppDbError,
 )
-from .. import auth, dependencies
-from ..models import BoardWithCards
+from .. import auth, dependencies, constants
+from ..models import (
+    BoardWithCards,
+    BulkCards,
+    PAGE_LIMIT,
+    PAGE_CURSOR,
+    get_next_cursor,
+)
 
 router = APIRouter()
 
+LOGGER = logging.getLogger(__name__)
+
 
 # -----------------------------------------------------------------------------#
 # Routes
@@ -49,12 +66,21 @@ async def add_board(new_board: NewBoard, user: auth.REQUIRED_USER) -> BoardInDb:
     "/{board_id}", status_code=status.HTTP_200_OK, response_model=BoardWithCards
 )
 async def get_board(
-    request: Request, board_id: str, user: auth.OPTIONAL_USER
+    request: Request,
+    board_id: str,
+    user: auth.OPTIONAL_USER,
+    limit: PAGE_LIMIT = constants.DEFAULT_PAGE_SIZE,
+    after: PAGE_CURSOR = None,
 ) -> BoardWithCards:
     try:
         owner_id = user.id if user else None
-        board = await dependencies.get_db_client().get_board(board_id, owner_id)
-        cards = await dependencies.get_db_client().get_all_cards(board_id)
+        board, cards = await dependencies.get_db_client().get_board_with_cards(
+            board_id,
+            owner_id,
+            limit=limit,
+            after=after,
+            read_preference=auth.get_read_preference(user),
+        )
     except RecommendDBModelNotFound as err:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail={"error": err.message})
     except RecommendAppDbError as err:
@@ -64,28 +90,23 @@ async def get_board(
             )
         raise HTTPException(status.HTTP_403_FORBIDDEN, detail={"error": err.message})
 
-    return BoardWithCards(board=board, cards=cards)
+    return BoardWithCards(
+        board=board, cards=cards, next_cursor=get_next_cursor(cards, limit)
+    )
 
 
 @router.put("/{board_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def update_board(board_id: str, data: UpdateBoard, user: auth.REQUIRED_USER):
-    try:
-        if not user:
-            raise HTTPException(
-                status.HTTP_401_UNAUTHORIZED,
-                detail={"error": "Please sign in"},
-            )
-
-        board = await dependencies.get_db_client().get_board(board_id, user.id)
-
-        # Only the owners of the board can update it
-        if board.owner_id != user.id:
-            raise HTTPException(
-                status.HTTP_403_FORBIDDEN,
-                detail={"error": "Only owners can update the board"},
-            )
+    if not user:
+        raise HTTPException(
+            status.HTTP_401_UNAUTHORIZED,
+            detail={"error": "Please sign in"},
+        )
 
-        await dependencies.get_db_client().update_board(board.id, data)
+    # Only the owners of the board can update it. The owner check is part of
+    # the update query.
+    try:
+        await dependencies.get_db_client().update_board(board_id, data, user.id)
     except RecommendDBModelNotFound as err:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail={"error": err.message})
     except RecommendAppDbError as err:
@@ -94,23 +115,16 @@ async def update_board(board_id: str, data: UpdateBoard, user: auth.REQUIRED_USE
 
 @router.delete("/{board_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remove_board(board_id: str, user: auth.REQUIRED_USER):
-    try:
-        if not user:
-            raise HTTPException(
-                status.HTTP_401_UNAUTHORIZED,
-                detail={"error": "Please sign in"},
-            )
-
-        board = await dependencies.get_db_client().get_board(board_id, user.id)
-
-        # Only the owners of the board can delete it
-        if board.owner_id != user.id:
-            raise HTTPException(
-                status.HTTP_403_FORBIDDEN,
-                detail={"error": "Only owners can delete the board"},
-            )
+    if not user:
+        raise HTTPException(
+            status.HTTP_401_UNAUTHORIZED,
+            detail={"error": "Please sign in"},
+        )
 
-        await dependencies.get_db_client().remove_board(board.id)
+    # Only the owners of the board can delete it. The owner check is part of
+    # the delete query.
+    try:
+        await dependencies.get_db_client().remove_board(board_id, user.id)
     except RecommendDBModelNotFound as err:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail={"error": err.message})
     except RecommendAppDbError as err:
@@ -144,7 +158,7 @@ async def add_card(
                 detail={"error": "Only owner can add a card to the board."},
             )
 
-        card = await dependencies.get_db_client().add_card(new_card, board_id)
+        card = await dependencies.get_db_client().add_card(new_card, board_id, user.id)
 
     except RecommendDBModelNotFound as err:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail={"error": err.message})
@@ -155,4 +169,65 @@ async def add_card(
             status.HTTP_500_INTERNAL_SERVER_ERROR, detail={"error": err.message}
         )
 
+    await _enqueue_enrichment([card])
     return card
+
+
+@router.post(
+    "/{board_id}/cards:bulk", status_code=status.HTTP_200_OK, response_model=BulkCards
+)
+async def add_cards(
+    board_id: str,
+    new_cards: Annotated[
+        list[NewCard], Body(min_length=1, max_length=constants.MAX_BULK_CARDS)
+    ],
+    user: auth.REQUIRED_USER,
+) -> BulkCards:
+    # STATUS_UPDATE: 401
+    if not user:
+        raise HTTPException(
+            status.HTTP_401_UNAUTHORIZED, detail={"error": "Please sign in"}
+        )
+
+    try:
+        # Make sure the board belongs to the user
+        board = await dependencies.get_db_client().get_board(board_id, user.id)
+        if board.owner_id != user.id:
+            # STATUS_UPDATE: 403
+            raise HTTPException(
+                status.HTTP_403_FORBIDDEN,
+                detail={"error": "Only owner can add cards to the board."},
+            )
+
+        # Cards that cannot be created are reported in failures
+        cards, failures = await dependencies.get_db_client().add_cards(
+            board_id, new_cards, user.id
+        )
+
+    except RecommendDBModelNotFound as err:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail={"error": err.message})
+    except RecommendAppDbError as err:
+        raise HTTPException(status.HTTP_403_FORBIDDEN, detail={"error": err.message})
+
+    await _enqueue_enrichment(cards)
+    return BulkCards(cards=cards, failures=failures)
+
+
+# -----------------------------------------------------------------------------#
+# Functions
+# -----------------------------------------------------------------------------#
+
+
+async def _enqueue_enrichment(cards: list[CardInDb]) -> None:
+    """
+    Queues the cards added with only their url, to be scrapped in the
+    background. The cards stay added if the queue fails.
+    """
+    cards = [card for card in cards if needs_enrichment(card)]
+    if not cards:
+        return
+
+    try:
+        await dependencies.get_db_client().enqueue_enrichment(cards)
+    except RecommendAppDbError as err:
+        LOGGER.warning("Failed to queue the enrichment of the cards: %s", err.message)
@@ -78,18 +78,9 @@ async def update_card(card_id: str, data: UpdateCard, user: auth.REQUIRED_USER):
             status.HTTP_401_UNAUTHORIZED, detail={"error": "Please sign in"}
         )
 
-    # Validate that the user is authorized to update this card
-    models = await get_board_and_card(card_id, user.id)
-
-    # Only the owner can edit it.
-    if models.board.owner_id != user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail={"error": "Only owner can edit it."},
-        )
-
+    # Only the owner can edit it. The owner check is part of the update query.
     try:
-        await dependencies.get_db_client().update_card(card_id, data)
+        await dependencies.get_db_client().update_card(card_id, data, user.id)
     except RecommendDBModelNotFound as err:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail={"error": err.message})
     except RecommendAppDbError as err:
@@ -103,19 +94,10 @@ async def remove_card(card_id: str, user: auth.REQUIRED_USER):
             status.HTTP_401_UNAUTHORIZED, detail={"error": "Please sign in"}
         )
 
-    # Validate that the user is authorized to remove this card
-    models = await get_board_and_card(card_id, user.id)
-
-    # Only the owner can edit it.
-    if models.board.owner_id != user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail={"error": "Only owner can remove it."},
-        )
-
+    # Only the owner can remove it. The owner check is part of the delete query.
     try:
-        await dependencies.get_db_client().remove_card(card_id)
+        await dependencies.get_db_client().remove_card(card_id, user.id)
     except RecommendDBModelNotFound as err:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail={"error": err.message})
     except RecommendAppDbError as err:
-        raise HTTPException(status.HTTP_401_UNAUTHORIZED, detail={"error": err.message})
+        raise HTTPException(status.HTTP_403_FORBIDDEN, detail={"error": err.message})
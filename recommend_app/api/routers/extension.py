@@ -5,17 +5,25 @@ Browser extensions send the Authorization token in the request header.
 """
 
 # Builtin imports
+import hashlib
 import json
-from datetime import timedelta
 
 # Project specific imports
 from fastapi import APIRouter, Request, status, HTTPException
 
 # Local imports
 from .. import auth, constants
+from ...lru import LRUCache
 
 router = APIRouter()
 
+# Access tokens reissued for the expired ones, keyed by the digest of the auth
+# data they were reissued for. A client that sends the same expired token
+# again gets the same new token, until it expires.
+_REISSUED_TOKENS: LRUCache[bytes, str] = LRUCache(
+    max_bytes=constants.REISSUED_TOKEN_CACHE_MAX_BYTES, sizeof=len
+)
+
 # -----------------------------------------------------------------------------#
 # Functions
 # -----------------------------------------------------------------------------#
@@ -45,9 +53,17 @@ def reissue_token(request: Request) -> auth.AuthenticatedUser:
 
         del loaded_data["access_token"]
         user = auth.AuthenticatedUser(**loaded_data)
-        access_token_expires = timedelta(minutes=constants.ACCESS_TOKEN_EXPIRE_MINUTES)
-        token = auth.create_access_token(user, access_token_expires)
-        access_token = token.access_token
+
+        key = hashlib.sha256(data.encode()).digest()
+        reissued = _REISSUED_TOKENS.get(key)
+        if reissued is None:
+            access_token_expires = auth.get_access_token_expires()
+            token = auth.create_access_token(user, access_token_expires)
+            reissued = token.access_token
+            _REISSUED_TOKENS.set(
+                key, reissued, ttl=access_token_expires.total_seconds()
+            )
+        access_token = reissued
 
     user.access_token = access_token
     return user
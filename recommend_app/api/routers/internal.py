@@ -13,7 +13,8 @@ from fastapi.responses import RedirectResponse
 # Local imports
 from .cards import get_board_and_card
 from .. import auth, dependencies, constants
-from ... import ui
+from ..models import PAGE_LIMIT, PAGE_CURSOR, get_next_cursor
+from ... import scrapper, ui
 
 from ...db.exceptions import (
     RecommendDBConnectionError,
@@ -30,17 +31,26 @@ router = APIRouter()
 
 @router.get("/", status_code=status.HTTP_200_OK)
 async def show_landing_page(
-    request: Request, user: auth.REQUIRED_USER
+    request: Request,
+    user: auth.REQUIRED_USER,
+    limit: PAGE_LIMIT = constants.DEFAULT_PAGE_SIZE,
+    after: PAGE_CURSOR = None,
 ) -> ui.JinjaTemplateResponse:
     """
     Displays the landing page
     """
-    boards = await dependencies.get_db_client().get_all_boards(user.id)
+    boards = await dependencies.get_db_client().get_all_boards(
+        user.id, limit=limit, after=after
+    )
 
     return ui.show_page(
         request=request,
         name="landing.html",
-        context={"user": user, "boards": boards},
+        context={
+            "user": user,
+            "boards": boards,
+            "next_cursor": get_next_cursor(boards, limit),
+        },
     )
 
 
@@ -56,10 +66,34 @@ async def show_health(
     except RecommendDBConnectionError:
         status = None
 
+    hashing = dependencies.get_db_client().hasher.stats
+    tokens = auth.get_token_cache_stats()
+    scrapes = dependencies.get_scrape_cache().stats
+    circuits = scrapper.get_guard().stats
     report = [
         {"key": "App Version", "value": importlib.metadata.version("recommend_app")},
         {"key": "DB Client", "value": "active" if status else "inactive"},
+        {
+            "key": "Password Hashing",
+            "value": f"{hashing.in_flight}/{hashing.max_concurrency} running, "
+            f"{hashing.waiting} waiting",
+        },
         {"key": "User", "value": "Authenticated" if user else "Unauthenticated"},
+        {
+            "key": "Token Cache",
+            "value": f"{tokens.hits} hits, {tokens.misses} misses",
+        },
+        {
+            "key": "Scrape Cache",
+            "value": f"{scrapes.hits} hits, {scrapes.misses} misses, "
+            f"{scrapes.coalesced} coalesced",
+        },
+        {
+            "key": "Scrape Circuits",
+            "value": f"{len(circuits.open)}/{circuits.hosts} open"
+            + (f" ({', '.join(circuits.open)})" if circuits.open else "")
+            + f", {circuits.rejected} rejected, {circuits.throttled} throttled",
+        },
     ]
 
     context: dict[str, Any] = {"report": report}
@@ -96,15 +130,26 @@ async def show_login_page(request: Request) -> ui.JinjaTemplateResponse:
 
 @router.get("/users/{requested_user_id}", status_code=status.HTTP_200_OK)
 async def show_user_page(
-    request: Request, requested_user_id: str, user: auth.OPTIONAL_USER
+    request: Request,
+    requested_user_id: str,
+    user: auth.OPTIONAL_USER,
+    limit: PAGE_LIMIT = constants.DEFAULT_PAGE_SIZE,
+    after: PAGE_CURSOR = None,
 ):
     if user and requested_user_id == user.id:
         return RedirectResponse(constants.ROUTES.INTERNAL_LANDING)
 
     try:
-        requested_user = await dependencies.get_db_client().get_user(requested_user_id)
+        read_preference = auth.get_read_preference(user)
+        requested_user = await dependencies.get_db_client().get_user(
+            requested_user_id, read_preference=read_preference
+        )
         boards = await dependencies.get_db_client().get_all_boards(
-            requested_user_id, only_public=True
+            requested_user_id,
+            only_public=True,
+            limit=limit,
+            after=after,
+            read_preference=read_preference,
         )
     except RecommendDBModelNotFound as err:
         raise HTTPException(
@@ -114,7 +159,12 @@ async def show_user_page(
     return ui.show_page(
         request=request,
         name="user.html",
-        context={"user": user, "requested_user": requested_user, "boards": boards},
+        context={
+            "user": user,
+            "requested_user": requested_user,
+            "boards": boards,
+            "next_cursor": get_next_cursor(boards, limit),
+        },
     )
 
 
@@ -138,12 +188,21 @@ async def show_create_board_page(
 
 @router.get("/boards/{board_id}", status_code=status.HTTP_200_OK)
 async def show_board(
-    request: Request, board_id: str, user: auth.OPTIONAL_USER
+    request: Request,
+    board_id: str,
+    user: auth.OPTIONAL_USER,
+    limit: PAGE_LIMIT = constants.DEFAULT_PAGE_SIZE,
+    after: PAGE_CURSOR = None,
 ) -> ui.JinjaTemplateResponse:
     try:
         owner_id = user.id if user else None
-        board = await dependencies.get_db_client().get_board(board_id, owner_id)
-        cards = await dependencies.get_db_client().get_all_cards(board_id)
+        board, cards = await dependencies.get_db_client().get_board_with_cards(
+            board_id,
+            owner_id,
+            limit=limit,
+            after=after,
+            read_preference=auth.get_read_preference(user),
+        )
     except RecommendDBModelNotFound as err:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail={"error": err.message})
     except RecommendAppDbError as err:
@@ -152,7 +211,12 @@ async def show_board(
     return ui.show_page(
         request=request,
         name="board.html",
-        context={"user": user, "board": board, "cards": cards},
+        context={
+            "user": user,
+            "board": board,
+            "cards": cards,
+            "next_cursor": get_next_cursor(cards, limit),
+        },
     )
 
 
@@ -6,8 +6,8 @@ Landing page
 from fastapi import APIRouter, Request, status
 
 # Local imports
-from .. import auth, dependencies
-from ..models import AuthUserWithBoards
+from .. import auth, dependencies, constants
+from ..models import AuthUserWithBoards, PAGE_LIMIT, PAGE_CURSOR, get_next_cursor
 
 
 router = APIRouter()
@@ -18,9 +18,18 @@ router = APIRouter()
 
 
 @router.get("/", status_code=status.HTTP_200_OK, response_model=AuthUserWithBoards)
-async def get_me(request: Request, user: auth.REQUIRED_USER) -> AuthUserWithBoards:
+async def get_me(
+    request: Request,
+    user: auth.REQUIRED_USER,
+    limit: PAGE_LIMIT = constants.DEFAULT_PAGE_SIZE,
+    after: PAGE_CURSOR = None,
+) -> AuthUserWithBoards:
     """
     Get the logged in user data
     """
-    boards = await dependencies.get_db_client().get_all_boards(user.id)
-    return AuthUserWithBoards(user=user, boards=boards)
+    boards = await dependencies.get_db_client().get_all_boards(
+        user.id, limit=limit, after=after
+    )
+    return AuthUserWithBoards(
+        user=user, boards=boards, next_cursor=get_next_cursor(boards, limit)
+    )
@@ -2,13 +2,19 @@
 Route to scrap the data from the URL
 """
 
+# Builtin imports
+from typing import Annotated, AsyncIterator
+
 # Project specific imports
-from fastapi import APIRouter, status, HTTPException
+from fastapi import APIRouter, Body, status, HTTPException
+from fastapi.responses import StreamingResponse
 
 # Local imports
 from ...db.models.card import NewCard
 from ...exceptions import RecommendAppError
+from ...scrapper.exceptions import RecommendScrapperHostUnavailable
 from ... import scrapper
+from .. import constants, dependencies
 
 router = APIRouter()
 
@@ -24,10 +30,35 @@ async def scrap_url(url: str = "") -> NewCard:
             detail={"error": "Please provide an url to scrap"},
         )
     try:
-        card = scrapper.from_url(url)
+        card = await dependencies.get_scrape_cache().get(url, scrapper.from_url_async)
+    except RecommendScrapperHostUnavailable as err:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"error": err.message},
+        )
     except RecommendAppError as err:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail={"error": err.message}
         )
 
     return card
+
+
+@router.post("/batch", status_code=status.HTTP_200_OK)
+async def scrap_urls(
+    urls: Annotated[list[str], Body(min_length=1, max_length=constants.MAX_SCRAP_URLS)],
+) -> StreamingResponse:
+    """
+    Scraps the urls concurrently. Streams one `ScrapResult` per url, as
+    newline delimited JSON, in the order the scraps complete.
+    """
+    cache = dependencies.get_scrape_cache()
+
+    async def scrap(url: str) -> NewCard:
+        return await cache.get(url, scrapper.from_url_async)
+
+    async def lines() -> AsyncIterator[str]:
+        async for result in scrapper.scrap_many(urls, scrap):
+            yield result.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
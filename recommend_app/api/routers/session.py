@@ -4,16 +4,15 @@ Authentication
 
 # Builtin imports
 from typing import Annotated
-from datetime import timedelta
 
 # Project specific imports
-from fastapi import APIRouter, HTTPException, status, Depends, Request
+from fastapi import APIRouter, HTTPException, status, Depends, Request, BackgroundTasks
 from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 
 # Local imports
 from ... import ui
-from .. import auth, constants
+from .. import auth
 
 # Route
 router = APIRouter()
@@ -26,9 +25,13 @@ router = APIRouter()
 
 @router.post("/", status_code=status.HTTP_200_OK, response_model=auth.AuthenticatedUser)
 async def create_session(
-    form_data: Annotated[OAuth2PasswordRequestForm, Depends()], set_cookie: bool = False
+    form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    background_tasks: BackgroundTasks,
+    set_cookie: bool = False,
 ) -> JSONResponse | auth.AuthenticatedUser:
-    user = await auth.authenticate_user(form_data.username, form_data.password)
+    user = await auth.authenticate_user(
+        form_data.username, form_data.password, background_tasks
+    )
 
     if not user:
         raise HTTPException(
@@ -40,13 +43,11 @@ async def create_session(
         return auth.create_access_token_set_cookie(user)
 
     # access token
-    access_token_expires = timedelta(minutes=constants.ACCESS_TOKEN_EXPIRE_MINUTES)
-    token = auth.create_access_token(user, access_token_expires)
+    token = auth.create_access_token(user, auth.get_access_token_expires())
     user.access_token = token.access_token
 
     # refresh token
-    refresh_token_expires = timedelta(days=constants.REFRESH_TOKEN_EXPIRE_DAYS)
-    refresh_token = auth.create_refresh_token(user, refresh_token_expires)
+    refresh_token = auth.create_refresh_token(user, auth.get_refresh_token_expires())
     user.refresh_token = refresh_token.access_token
 
     return user
@@ -69,8 +70,7 @@ async def refresh_session(request: Request):
         )
 
     # access token
-    access_token_expires = timedelta(minutes=constants.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = auth.create_access_token(user, access_token_expires)
+    access_token = auth.create_access_token(user, auth.get_access_token_expires())
     user.access_token = access_token.access_token
     user.refresh_token = refresh_token
 
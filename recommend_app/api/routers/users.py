@@ -21,7 +21,7 @@ from ...db.exceptions import (
     RecommendDBModelNotFound,
 )
 from .. import dependencies, auth, constants
-from ..models import UserWithBoards
+from ..models import UserWithBoards, PAGE_LIMIT, PAGE_CURSOR, get_next_cursor
 
 router = APIRouter()
 
@@ -49,22 +49,35 @@ async def add_user(new_user: NewUser) -> UserInDb:
     response_model=UserWithBoards,
 )
 async def get_user(
-    request: Request, requested_user_id: str, user: auth.OPTIONAL_USER
+    request: Request,
+    requested_user_id: str,
+    user: auth.OPTIONAL_USER,
+    limit: PAGE_LIMIT = constants.DEFAULT_PAGE_SIZE,
+    after: PAGE_CURSOR = None,
 ) -> RedirectResponse | UserWithBoards:
     if user and requested_user_id == user.id:
         return RedirectResponse(constants.ROUTES.INTERNAL_LANDING)
 
     try:
-        requested_user = await dependencies.get_db_client().get_user(requested_user_id)
+        read_preference = auth.get_read_preference(user)
+        requested_user = await dependencies.get_db_client().get_user(
+            requested_user_id, read_preference=read_preference
+        )
         boards = await dependencies.get_db_client().get_all_boards(
-            requested_user_id, only_public=True
+            requested_user_id,
+            only_public=True,
+            limit=limit,
+            after=after,
+            read_preference=read_preference,
         )
     except RecommendDBModelNotFound as err:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail={"error": err.message}
         )
 
-    return UserWithBoards(user=requested_user, boards=boards)
+    return UserWithBoards(
+        user=requested_user, boards=boards, next_cursor=get_next_cursor(boards, limit)
+    )
 
 
 @router.put("/{user_id}", status_code=status.HTTP_200_OK)
@@ -84,6 +97,9 @@ async def update_user(
     except RecommendAppDbError as err:
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, detail={"error": err.message})
 
+    # The refresh path must not hand out the old user information
+    auth.invalidate_refresh_user(updated.email_address)
+
     # Since the user information has been updated, we have to regenerate the access token.
     # Access token has information about the user.
     authorised_user = auth.AuthenticatedUser.from_dbuser(updated)
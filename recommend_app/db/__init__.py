@@ -16,6 +16,9 @@ Usage:
     # Connect to the database
     db_client.connect()
 
+The reads can be cached, in-process or in a redis server shared by the
+workers. See `db.cache` for the `DB_CACHE_*` environment variables.
+
 This package ensures a cohesive approach to managing and interacting with the
 application's data, providing a consistent interface for different database
 backends and maintaining a clean architecture for data models and operations.
@@ -28,6 +31,7 @@ from typing import TYPE_CHECKING, Optional
 # Local imports
 from .client import RecommendDbClient
 from .impl.db import RecommendDB
+from .cache import CachedRecommendDB, create_cache_backend
 from . import constants as Key
 
 if TYPE_CHECKING:
@@ -43,9 +47,16 @@ def create_client(db: Optional["AbstractRecommendDB"] = None) -> RecommendDbClie
                                  `AbstractRecommendDB` interface, which
                                   defines the database operations. This is Optional.
 
+    If a cache is configured, the database is wrapped in a `CachedRecommendDB`.
+
     Returns:
         RecommendDbClient: An instance of `RecommendDbClient`
         initialized with the provided database instance.
     """
     db = db or RecommendDB(os.getenv("DB_NAME", Key.DB_NAME))
+
+    cache_backend = create_cache_backend()
+    if cache_backend is not None:
+        db = CachedRecommendDB(db, cache_backend)
+
     return RecommendDbClient(db)
@@ -0,0 +1,114 @@
+"""
+Module: db.abstracts.abstract_cache
+===================================
+
+This module defines the abstract base class `AbstractCacheBackend`, the store
+behind `CachedRecommendDB`. The cache doesn't know where its entries live: in
+the process, or in a server shared by all the workers.
+
+Every entry is stored with a list of tags. Invalidating a tag drops all the
+entries carrying it. Every invalidation also changes the version of the
+backend: a result read before an invalidation is not stored after it.
+"""
+
+# Builtin imports
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+if TYPE_CHECKING:
+    from ...lru import CacheStats
+
+
+class AbstractCacheBackend(ABC):
+    """
+    Abstract base class for the stores of the db cache.
+    """
+
+    ###########################################################################
+    # Abstracts - Properties
+    ###########################################################################
+    @property
+    @abstractmethod
+    def stats(self) -> "CacheStats":
+        """
+        Returns the hit, miss and eviction counters of the backend
+        """
+
+    @property
+    def shared(self) -> bool:
+        """
+        Returns True if the entries are shared with other processes. False by
+        default.
+        """
+        return False
+
+    ###########################################################################
+    # Abstracts - Connections
+    ###########################################################################
+    async def connect(self) -> None:
+        """
+        Connects the backend. Nothing to do by default.
+        """
+
+    async def disconnect(self) -> None:
+        """
+        Disconnects the backend. Nothing to do by default.
+        """
+
+    ###########################################################################
+    # Abstracts - Entries
+    ###########################################################################
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Returns the entry stored against the key
+
+        Args:
+            key (str): Key of the entry
+
+        Returns:
+            The entry. None if there is no such key or if it has expired.
+        """
+
+    @abstractmethod
+    async def version(self) -> int:
+        """
+        Returns the version of the entries. It changes with every
+        invalidation, in any of the processes sharing the backend.
+
+        Returns:
+            int
+        """
+
+    @abstractmethod
+    async def set(
+        self, key: str, value: Any, tags: Iterable[str], version: Optional[int] = None
+    ) -> None:
+        """
+        Stores the entry against the key
+
+        Args:
+            key (str): Key of the entry
+            value (Any): A model, a list of models or a tuple of those.
+            tags (Iterable[str]): Tags the entry is invalidated with.
+            version (int): Version of the backend when the value was read.
+                Optional. The entry is not stored if an invalidation happened
+                since.
+        """
+
+    @abstractmethod
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        """
+        Drops every entry carrying any of the tags. A backend shared by many
+        processes must make sure the entries are dropped in all of them.
+
+        Args:
+            tags (Iterable[str]): Tags to invalidate
+        """
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """
+        Drops every entry held by this process. Entries shared with other
+        processes are left to them.
+        """
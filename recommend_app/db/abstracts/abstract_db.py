@@ -11,11 +11,32 @@ removing models such as users, boards, and cards.
 This abstraction allows the application to remain database-agnostic and makes
 it easier to switch between different database implementations without
 modifying the core logic.
+
+The reads take a `ReadPreference` hint. Reads that can live with slightly
+stale data may be served by a replica. An implementation without replicas
+can ignore the hint.
+
+The db can also keep the cards scrapped from the pages, for a while, so that a
+popular page isn't fetched again and again. Storing them is optional: by
+default nothing is stored.
+
+The cards added without their data are enriched in the background: the db
+holds a queue of enrichment jobs, claimed by the workers with a lease. A db
+without a queue accepts no job, the cards then keep the data they were added
+with.
+
+The pages of the cards are checked again once in a while. The db keeps the
+validators of the last fetch of each card (ETag, Last-Modified) and when it
+happened. A db that doesn't keep them has no card to check.
 """
 
 # Builtin imports
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+# Local imports
+from ..types import ReadPreference
 
 if TYPE_CHECKING:
     from ..models.bases import (
@@ -23,6 +44,10 @@ if TYPE_CHECKING:
         BaseRecommendModel,
         BaseUpdateRecommendModel,
     )
+    from ..models.bulk import BulkAddFailure
+    from ..models.card import NewCard
+    from ..models.job import EnrichmentJob, NewEnrichmentJob
+    from ..models.page import CardPage, ScrapedFields
     from ..types import RecommendModelType
 
 
@@ -92,9 +117,34 @@ class AbstractRecommendDB(ABC):
             method must throw this exception if the model creation failed.
         """
 
+    @abstractmethod
+    async def add_many(
+        self, models: Sequence["BaseNewRecommendModel"]
+    ) -> tuple[list["BaseRecommendModel"], list["BulkAddFailure"]]:
+        """
+        Add a list of new models of the same type to the database.
+
+        The models are independent of each other. A model that cannot be
+        created, for instance a duplicate, doesn't stop the others from being
+        created.
+
+        Args:
+            models (Sequence[BaseNewRecommendModel]): Models to be added.
+
+        Returns:
+            tuple: The newly created model instances and the failures. Every
+                failure points to the index of its model in `models`.
+
+        Raises:
+            `RecommendAppDbError` if the models are not of the same type.
+        """
+
     @abstractmethod
     async def get(
-        self, model_type: "RecommendModelType", attrs_dict: dict[str, str]
+        self,
+        model_type: "RecommendModelType",
+        attrs_dict: dict[str, Any],
+        read_preference: ReadPreference = ReadPreference.PRIMARY,
     ) -> "BaseRecommendModel":
         """
         Retrieve a single model from the database that matches the given
@@ -105,6 +155,8 @@ class AbstractRecommendDB(ABC):
                                              (e.g., User, Board, Card).
             attrs_dict (dict[str, Any]): A dictionary of attributes to filter
                                          the model by.
+            read_preference (ReadPreference): Hint on where the read can be
+                served from. Primary by default.
 
         Returns:
             BaseRecommendModel: The model instance that matches the given criteria.
@@ -117,25 +169,77 @@ class AbstractRecommendDB(ABC):
 
     @abstractmethod
     async def get_all(
-        self, model_type: "RecommendModelType", attrs_dict: dict[str, Any]
+        self,
+        model_type: "RecommendModelType",
+        attrs_dict: dict[str, Any],
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        read_preference: ReadPreference = ReadPreference.PRIMARY,
     ) -> list["BaseRecommendModel"]:
         """
         Retrieve all models from the database that match the given criteria.
 
+        Results are ordered by their id, so that the id of the last model can
+        be used as a cursor to fetch the next page.
+
         Args:
             model_type (RecommendModelType): The type of the models to retrieve
                                              (e.g., User, Board, Card).
             attrs_dict (dict[str, str]): A dictionary of attributes to filter
                                          the models by.
+            limit (int): Maximum number of models to return. Optional, if not
+                         given all the matching models are returned.
+            after (str): Cursor. Only the models whose id comes after this id
+                         are returned. Optional.
+            read_preference (ReadPreference): Hint on where the read can be
+                served from. Primary by default.
 
         Returns:
             list[BaseRecommendModel]: A list of model instances that match the
                                   given criteria.
+
+        Raises:
+            `RecommendAppDbError` if the cursor is not a valid id.
+        """
+
+    @abstractmethod
+    async def get_board_with_cards(
+        self,
+        board_id: str,
+        owner_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        read_preference: ReadPreference = ReadPreference.PRIMARY,
+    ) -> tuple["BaseRecommendModel", list["BaseRecommendModel"]]:
+        """
+        Retrieve a board along with a page of its cards in a single query.
+
+        A private board is only returned to its owner.
+
+        Args:
+            board_id (str): Id of the board
+            owner_id (str): Id of the user requesting the board. Optional.
+            limit (int): Maximum number of cards to return. Optional.
+            after (str): Cursor. Id of the last card of the previous page.
+                Optional.
+            read_preference (ReadPreference): Hint on where the read can be
+                served from. Primary by default.
+
+        Returns:
+            tuple: The board and its cards, ordered by their id.
+
+        Raises:
+            `RecommendDBModelNotFound` if there is no such board visible to
+                the owner_id.
+            `RecommendAppDbError` if the cursor is not a valid id.
         """
 
     @abstractmethod
     async def update(
-        self, obj_id: str, update_model: "BaseUpdateRecommendModel"
+        self,
+        obj_id: str,
+        update_model: "BaseUpdateRecommendModel",
+        attrs_dict: Optional[dict[str, Any]] = None,
     ) -> "BaseRecommendModel":
         """
         Updates the model in the database with the provided data. Only the non
@@ -144,17 +248,25 @@ class AbstractRecommendDB(ABC):
         Args:
             obj_id (str): Id of the object to be updated.
             update_model (BaseUpdateRecommendModel): Data to be updated.
+            attrs_dict (dict[str, Any]): Attributes the model must also match
+                to be updated, e.g. its owner_id. Optional.
 
         Returns:
             BaseRecommendModel: The model instance that matches the given criteria.
 
         Raises:
-            `RecommendDBModelNotFound` if the board is not found
-            `RecommendAppDbError` if there is an issue in updating the model
+            `RecommendDBModelNotFound` if the model is not found
+            `RecommendAppDbError` if the model doesn't match the attrs_dict or
+                if there is an issue in updating the model
         """
 
     @abstractmethod
-    async def remove(self, model_type: "RecommendModelType", obj_id: str) -> bool:
+    async def remove(
+        self,
+        model_type: "RecommendModelType",
+        obj_id: str,
+        attrs_dict: Optional[dict[str, Any]] = None,
+    ) -> bool:
         """
         Remove a model from the database.
 
@@ -162,7 +274,185 @@ class AbstractRecommendDB(ABC):
             model_type (RecommendModelType): The type of the model to delete
                                              (e.g., User, Board, Card).
             obj_id (str): Id of the object to be deleted.
+            attrs_dict (dict[str, Any]): Attributes the model must also match
+                to be removed, e.g. its owner_id. Optional.
 
         Returns:
             bool: True if the model was successfully removed, False otherwise.
+
+        Raises:
+            `RecommendDBModelNotFound` if the model is not found
+            `RecommendAppDbError` if the model doesn't match the attrs_dict
+        """
+
+    ###########################################################################
+    # Scrapes
+    ###########################################################################
+    async def get_scrape(self, key: str) -> Optional["NewCard"]:
+        """
+        Returns the card scrapped from a page. Nothing is stored by default.
+
+        Args:
+            key (str): Normalized url of the page
+
+        Returns:
+            The card. None if there is none or if it has expired.
+
+        Raises:
+            `RecommendAppDbError` if the read fails
+        """
+        return None
+
+    async def set_scrape(self, key: str, card: "NewCard", ttl: float) -> None:
+        """
+        Stores the card scrapped from a page. Nothing is stored by default.
+
+        Args:
+            key (str): Normalized url of the page
+            card (NewCard): Card scrapped from the page
+            ttl (float): Seconds the card stays valid
+
+        Raises:
+            `RecommendAppDbError` if the write fails
+        """
+
+    ###########################################################################
+    # Enrichment jobs
+    ###########################################################################
+    async def add_jobs(self, jobs: Sequence["NewEnrichmentJob"]) -> int:
+        """
+        Queues the jobs, to be run right away. No job is queued by default.
+
+        Args:
+            jobs (Sequence[NewEnrichmentJob]): Jobs to queue
+
+        Returns:
+            int: Number of jobs queued
+
+        Raises:
+            `RecommendAppDbError` if the write fails
+        """
+        return 0
+
+    async def claim_job(
+        self,
+        worker_id: str,
+        lease_seconds: float,
+        max_attempts: Optional[int] = None,
+    ) -> Optional["EnrichmentJob"]:
+        """
+        Leases the next job due to the worker: a pending job whose run_at has
+        passed, or a leased job whose lease expired (its worker died).
+        Claiming a job counts as an attempt. A job whose lease expired after
+        its last attempt is left dead: it killed or hung its worker every
+        time.
+
+        Args:
+            worker_id (str): Id of the worker
+            lease_seconds (float): Seconds the job is leased for
+            max_attempts (int): Attempts before a job is dead. Optional, the
+                jobs whose lease expired are claimed again and again if not
+                given.
+
+        Returns:
+            The job. None if no job is due.
+
+        Raises:
+            `RecommendAppDbError` if the write fails
+        """
+        return None
+
+    async def complete_job(self, job_id: str, worker_id: str) -> bool:
+        """
+        Removes a job that is done.
+
+        Args:
+            job_id (str): Id of the job
+            worker_id (str): Id of the worker. The job is only removed if the
+                worker still holds its lease.
+
+        Returns:
+            bool: False if the worker lost the lease of the job.
+
+        Raises:
+            `RecommendAppDbError` if the write fails
+        """
+        return False
+
+    async def fail_job(
+        self,
+        job_id: str,
+        worker_id: str,
+        error: str,
+        retry_at: Optional[datetime] = None,
+        count_attempt: bool = True,
+    ) -> bool:
+        """
+        Releases a job that failed, to be retried later or to be kept dead.
+
+        Args:
+            job_id (str): Id of the job
+            worker_id (str): Id of the worker. The job is only released if
+                the worker still holds its lease.
+            error (str): Why the job failed
+            retry_at (datetime): When the job is retried. Optional, the job is
+                dead if not given.
+            count_attempt (bool): False if the attempt didn't run (the site
+                of the job was not fetched): it is given back to the job.
+
+        Returns:
+            bool: False if the worker lost the lease of the job.
+
+        Raises:
+            `RecommendAppDbError` if the write fails
+        """
+        return False
+
+    ###########################################################################
+    # Card pages
+    ###########################################################################
+    async def get_stale_pages(self, before: datetime, limit: int) -> list["CardPage"]:
+        """
+        Returns the pages of the cards that were last fetched before the
+        given date, oldest first. The cards never checked count as fetched
+        when they were added. No page is kept by default.
+
+        Args:
+            before (datetime): Date the pages are stale before
+            limit (int): Maximum number of pages to return
+
+        Returns:
+            list[CardPage]
+
+        Raises:
+            `RecommendAppDbError` if the read fails
+        """
+        return []
+
+    async def set_page_validators(
+        self,
+        card_id: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        scraped_at: datetime,
+        scraped: Optional["ScrapedFields"] = None,
+    ) -> bool:
+        """
+        Stores the validators of the last fetch of the page of a card, and
+        the data it had if it was scrapped. Nothing is stored by default.
+
+        Args:
+            card_id (str): Id of the card
+            etag (str): ETag of the page. Optional.
+            last_modified (str): Last-Modified date of the page. Optional.
+            scraped_at (datetime): When the page was fetched
+            scraped (ScrapedFields): Data of the page. Optional, the data of
+                the last scrap is kept if not given.
+
+        Returns:
+            bool: False if the card doesn't exist
+
+        Raises:
+            `RecommendAppDbError` if the write fails
         """
+        return False
@@ -0,0 +1,69 @@
+"""
+Package: db.cache
+=================
+
+Caching of the db reads. See `cached_db.CachedRecommendDB`.
+
+Backends:
+- `memory`: Local to the process. See `memory_backend`.
+- `redis`: Shared by all the workers. See `redis_backend`.
+
+Environment Variables:
+- `DB_CACHE_BACKEND`: (Optional) `memory` or `redis`. Enables the cache.
+- `DB_CACHE_MAX_BYTES`: (Optional) Size limit of the memory cache, or of the
+                        local copies kept by the redis backend. Setting it
+                        alone enables the memory cache.
+- `DB_CACHE_TTL`: (Optional) Seconds a cached read stays valid. Defaults to 60.
+- `DB_CACHE_URL`: Url of the server of the redis backend.
+"""
+
+# Builtin imports
+import os
+from typing import Optional
+
+# Local imports
+from ..abstracts.abstract_cache import AbstractCacheBackend
+from ..exceptions import RecommendDBConnectionError
+from .. import constants as Key
+from .cached_db import CachedRecommendDB
+from .memory_backend import MemoryCacheBackend
+from .redis_backend import RedisCacheBackend
+
+__all__ = [
+    "CachedRecommendDB",
+    "MemoryCacheBackend",
+    "RedisCacheBackend",
+    "create_cache_backend",
+]
+
+
+def create_cache_backend() -> Optional[AbstractCacheBackend]:
+    """
+    Creates the cache backend configured in the environment.
+
+    Returns:
+        AbstractCacheBackend. None if the cache is not enabled.
+
+    Raises:
+        RecommendDBConnectionError if the backend is unknown or if the redis
+            backend has no url.
+    """
+    backend = os.getenv("DB_CACHE_BACKEND")
+    max_bytes = int(os.getenv("DB_CACHE_MAX_BYTES", "0"))
+    ttl = float(os.getenv("DB_CACHE_TTL", Key.DB_CACHE_TTL))
+
+    if backend is None:
+        if max_bytes <= 0:
+            return None
+        backend = Key.DB_CACHE_MEMORY
+
+    if backend == Key.DB_CACHE_MEMORY:
+        return MemoryCacheBackend(max_bytes or Key.DB_CACHE_MAX_BYTES, ttl)
+
+    if backend == Key.DB_CACHE_REDIS:
+        url = os.getenv("DB_CACHE_URL")
+        if not url:
+            raise RecommendDBConnectionError("DB_CACHE_URL is needed by redis cache")
+        return RedisCacheBackend.from_url(url, ttl=ttl, local_max_bytes=max_bytes)
+
+    raise RecommendDBConnectionError(f"Unknown cache backend: {backend}")
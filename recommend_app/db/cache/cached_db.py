@@ -0,0 +1,429 @@
+"""
+Module: db.cache.cached_db
+==========================
+
+A read-through cache in front of any `AbstractRecommendDB`.
+
+`CachedRecommendDB` implements `AbstractRecommendDB` by decorating another
+implementation, so the `RecommendDbClient` doesn't know it is there. Reads
+(`get`, `get_all` and `get_board_with_cards`) are served from a cache
+backend, see `AbstractCacheBackend`. Writes go straight to the wrapped db and
+invalidate what they affect.
+
+Invalidation is tag based. Every cached result is tagged with:
+- `id:<type>:<id>` for every model it holds
+- `list:<type>:<parent>` for the lists, where the parent is the board of the
+  cards and the owner of the boards.
+
+An update or a remove drops every result tagged with the id of the model,
+which also covers the lists the model is in. An add drops the lists of its
+parent. Since the lists are paged on the id, removing a model cannot change a
+page that doesn't hold it.
+
+A read is only cached if the backend was not invalidated while it ran (see
+`AbstractCacheBackend.version`), so a write racing with the read, in this
+process or another one, doesn't leave a stale entry behind.
+
+The read preference is part of the key. A result read from a secondary can be
+behind the primary, it is only served to the reads that accept that.
+
+The users hold the hash of their password: they are only cached by a backend
+local to the process, never by one shared with other processes.
+"""
+
+# Builtin imports
+import json
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Sequence
+
+# Local imports
+from ..abstracts.abstract_db import AbstractRecommendDB
+from ..abstracts.abstract_cache import AbstractCacheBackend
+from ..types import RecommendModelType, ReadPreference
+
+if TYPE_CHECKING:
+    from ...lru import CacheStats
+    from ..models.bases import (
+        BaseNewRecommendModel,
+        BaseRecommendModel,
+        BaseUpdateRecommendModel,
+    )
+    from ..models.bulk import BulkAddFailure
+    from ..models.card import NewCard
+    from ..models.job import EnrichmentJob, NewEnrichmentJob
+    from ..models.page import CardPage, ScrapedFields
+
+# -----------------------------------------------------------------------------#
+# Constants
+# -----------------------------------------------------------------------------#
+
+# Attribute of a model that names the list it belongs to.
+PARENT_KEYS: dict[RecommendModelType, str] = {
+    RecommendModelType.BOARD: "owner_id",
+    RecommendModelType.CARD: "board_id",
+}
+
+# -----------------------------------------------------------------------------#
+# Functions
+# -----------------------------------------------------------------------------#
+
+
+def id_tag(model_type: RecommendModelType, obj_id: Any) -> str:
+    """
+    Tag of the cached results holding the model with this id
+    """
+    return f"id:{model_type.value}:{obj_id}"
+
+
+def list_tag(model_type: RecommendModelType, parent: Any) -> str:
+    """
+    Tag of the cached lists of models belonging to the parent
+    """
+    return f"list:{model_type.value}:{parent}"
+
+
+def parent_tag(model: "BaseRecommendModel") -> Optional[str]:
+    """
+    Tag of the lists the model belongs to. None if the model type has no lists.
+    """
+    key = PARENT_KEYS.get(model.model_type)
+    if key is None:
+        return None
+    return list_tag(model.model_type, getattr(model, key, None))
+
+
+def make_key(*parts: Any) -> str:
+    """
+    Cache key of a read, from its method name and arguments
+    """
+    return json.dumps(parts, sort_keys=True, default=str)
+
+
+# -----------------------------------------------------------------------------#
+# Classes
+# -----------------------------------------------------------------------------#
+
+
+class CachedRecommendDB(AbstractRecommendDB):
+    """
+    Decorates an AbstractRecommendDB with a read-through cache.
+    """
+
+    def __init__(self, db: AbstractRecommendDB, backend: AbstractCacheBackend):
+        """
+        Initialize the cache
+
+        Args:
+            db (AbstractRecommendDB): The db being cached
+            backend (AbstractCacheBackend): Where the cached reads are stored
+        """
+        super().__init__()
+        self.__db = db
+        self.__backend = backend
+
+    ###########################################################################
+    # Properties
+    ###########################################################################
+    @property
+    def db(self) -> AbstractRecommendDB:
+        """
+        Returns the db being cached
+        """
+        return self.__db
+
+    @property
+    def backend(self) -> AbstractCacheBackend:
+        """
+        Returns the backend of the cache
+        """
+        return self.__backend
+
+    @property
+    def stats(self) -> "CacheStats":
+        """
+        Returns the hit, miss and eviction counters of the cache
+        """
+        return self.__backend.stats
+
+    ###########################################################################
+    # Methods: Connection
+    ###########################################################################
+    async def connect(self) -> bool:
+        """
+        Connects the db being cached and the cache backend
+        """
+        status = await self.__db.connect()
+        await self.__backend.connect()
+        return status
+
+    async def ping(self) -> bool:
+        """
+        Pings the db being cached
+        """
+        return await self.__db.ping()
+
+    async def disconnect(self, clear_db: bool = False) -> bool:
+        """
+        Empties and disconnects the cache backend and disconnects the db being
+        cached
+        """
+        await self.__backend.clear()
+        await self.__backend.disconnect()
+        return await self.__db.disconnect(clear_db)
+
+    ###########################################################################
+    # Methods: Reads
+    ###########################################################################
+    async def get(
+        self,
+        model_type: RecommendModelType,
+        attrs_dict: dict[str, Any],
+        read_preference: ReadPreference = ReadPreference.PRIMARY,
+    ) -> "BaseRecommendModel":
+        """
+        Cached `get`. Tagged with the id of the model.
+        """
+        if not self.__is_cached(model_type):
+            return await self.__db.get(model_type, attrs_dict, read_preference)
+
+        key = make_key("get", model_type.value, attrs_dict, read_preference.value)
+        cached = await self.__backend.get(key)
+        if cached is not None:
+            return cached
+
+        version = await self.__backend.version()
+        model = await self.__db.get(model_type, attrs_dict, read_preference)
+        await self.__backend.set(
+            key, model, [id_tag(model_type, model.id)], version=version
+        )
+        return model
+
+    async def get_all(
+        self,
+        model_type: RecommendModelType,
+        attrs_dict: dict[str, Any],
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        read_preference: ReadPreference = ReadPreference.PRIMARY,
+    ) -> list["BaseRecommendModel"]:
+        """
+        Cached `get_all`. Tagged with the list of the parent and the ids of
+        the models.
+        """
+        if not self.__is_cached(model_type):
+            return await self.__db.get_all(
+                model_type, attrs_dict, limit, after, read_preference
+            )
+
+        key = make_key(
+            "get_all", model_type.value, attrs_dict, limit, after, read_preference.value
+        )
+        cached = await self.__backend.get(key)
+        if cached is not None:
+            return list(cached)
+
+        version = await self.__backend.version()
+        models = await self.__db.get_all(
+            model_type, attrs_dict, limit, after, read_preference
+        )
+
+        parent_key = PARENT_KEYS.get(model_type)
+        tags = [
+            list_tag(model_type, attrs_dict.get(parent_key) if parent_key else None)
+        ]
+        tags.extend(id_tag(model_type, model.id) for model in models)
+        await self.__backend.set(key, list(models), tags, version=version)
+        return models
+
+    async def get_board_with_cards(
+        self,
+        board_id: str,
+        owner_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        read_preference: ReadPreference = ReadPreference.PRIMARY,
+    ) -> tuple["BaseRecommendModel", list["BaseRecommendModel"]]:
+        """
+        Cached `get_board_with_cards`. Tagged with the id of the board, its
+        list of cards and the ids of the cards.
+        """
+        key = make_key(
+            "get_board_with_cards",
+            board_id,
+            owner_id,
+            limit,
+            after,
+            read_preference.value,
+        )
+        cached = await self.__backend.get(key)
+        if cached is not None:
+            board, cards = cached
+            return board, list(cards)
+
+        version = await self.__backend.version()
+        board, cards = await self.__db.get_board_with_cards(
+            board_id, owner_id, limit, after, read_preference
+        )
+
+        tags = [
+            id_tag(RecommendModelType.BOARD, board.id),
+            list_tag(RecommendModelType.CARD, board.id),
+        ]
+        tags.extend(id_tag(RecommendModelType.CARD, card.id) for card in cards)
+        await self.__backend.set(key, (board, list(cards)), tags, version=version)
+        return board, cards
+
+    ###########################################################################
+    # Methods: Writes
+    ###########################################################################
+    async def add(self, model: "BaseNewRecommendModel") -> "BaseRecommendModel":
+        """
+        Adds the model and invalidates the lists of its parent
+        """
+        result = await self.__db.add(model)
+        await self.invalidate([parent_tag(result)])
+        return result
+
+    async def add_many(
+        self, models: Sequence["BaseNewRecommendModel"]
+    ) -> tuple[list["BaseRecommendModel"], list["BulkAddFailure"]]:
+        """
+        Adds the models and invalidates the lists of their parents
+        """
+        created, failures = await self.__db.add_many(models)
+        await self.invalidate(parent_tag(model) for model in created)
+        return created, failures
+
+    async def update(
+        self,
+        obj_id: str,
+        update_model: "BaseUpdateRecommendModel",
+        attrs_dict: Optional[dict[str, Any]] = None,
+    ) -> "BaseRecommendModel":
+        """
+        Updates the model and invalidates the results holding it
+        """
+        result = await self.__db.update(obj_id, update_model, attrs_dict)
+        # The lists of the parent too: the update could change what they
+        # filter on (e.g. a board going private).
+        await self.invalidate(
+            [id_tag(update_model.model_type, obj_id), parent_tag(result)]
+        )
+        return result
+
+    async def remove(
+        self,
+        model_type: RecommendModelType,
+        obj_id: str,
+        attrs_dict: Optional[dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Removes the model and invalidates the results holding it
+        """
+        result = await self.__db.remove(model_type, obj_id, attrs_dict)
+        await self.invalidate([id_tag(model_type, obj_id)])
+        return result
+
+    ###########################################################################
+    # Methods: Scrapes
+    ###########################################################################
+    async def get_scrape(self, key: str) -> Optional["NewCard"]:
+        """
+        Returns the scrape stored by the db. The scrapes have their own cache,
+        see `scrapper.cache`.
+        """
+        return await self.__db.get_scrape(key)
+
+    async def set_scrape(self, key: str, card: "NewCard", ttl: float) -> None:
+        """
+        Stores the scrape in the db
+        """
+        await self.__db.set_scrape(key, card, ttl)
+
+    ###########################################################################
+    # Methods: Enrichment jobs
+    ###########################################################################
+    async def add_jobs(self, jobs: Sequence["NewEnrichmentJob"]) -> int:
+        """
+        Queues the jobs in the db. The jobs are never cached.
+        """
+        return await self.__db.add_jobs(jobs)
+
+    async def claim_job(
+        self,
+        worker_id: str,
+        lease_seconds: float,
+        max_attempts: Optional[int] = None,
+    ) -> Optional["EnrichmentJob"]:
+        """
+        Leases the next job due in the db
+        """
+        return await self.__db.claim_job(worker_id, lease_seconds, max_attempts)
+
+    async def complete_job(self, job_id: str, worker_id: str) -> bool:
+        """
+        Removes the job from the db
+        """
+        return await self.__db.complete_job(job_id, worker_id)
+
+    async def fail_job(
+        self,
+        job_id: str,
+        worker_id: str,
+        error: str,
+        retry_at: Optional[datetime] = None,
+        count_attempt: bool = True,
+    ) -> bool:
+        """
+        Releases the job in the db
+        """
+        return await self.__db.fail_job(
+            job_id, worker_id, error, retry_at, count_attempt
+        )
+
+    ###########################################################################
+    # Methods: Card pages
+    ###########################################################################
+    async def get_stale_pages(self, before: datetime, limit: int) -> list["CardPage"]:
+        """
+        Returns the stale pages from the db. They are never cached.
+        """
+        return await self.__db.get_stale_pages(before, limit)
+
+    async def set_page_validators(
+        self,
+        card_id: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        scraped_at: datetime,
+        scraped: Optional["ScrapedFields"] = None,
+    ) -> bool:
+        """
+        Stores the validators in the db. They are not part of the cached
+        cards, nothing is invalidated.
+        """
+        return await self.__db.set_page_validators(
+            card_id, etag, last_modified, scraped_at, scraped
+        )
+
+    ###########################################################################
+    # Methods: Invalidation
+    ###########################################################################
+    async def invalidate(self, tags: Iterable[Optional[str]]) -> None:
+        """
+        Drops every cached result carrying any of the tags
+
+        Args:
+            tags (Iterable[str]): Tags to invalidate. None values are skipped.
+        """
+        await self.__backend.invalidate([tag for tag in tags if tag is not None])
+
+    ###########################################################################
+    # Methods: privates
+    ###########################################################################
+    def __is_cached(self, model_type: RecommendModelType) -> bool:
+        """
+        Returns False for the users if the backend is shared with other
+        processes: they hold the hash of their password.
+        """
+        return not (model_type == RecommendModelType.USER and self.__backend.shared)
@@ -0,0 +1,84 @@
+"""
+Module: db.cache.codec
+======================
+
+Encodes the cached db results to JSON and back, for the backends that store
+them outside of the process. It also measures them for the in-process one.
+
+A result is a model, a list of models or a tuple of those (see
+`get_board_with_cards`). Models are tagged with their model type so that they
+can be read back into the right InDb model. The users are not encoded: they
+hold the hash of their password and must not leave the process.
+"""
+
+# Builtin imports
+from typing import Any
+
+# Local imports
+from ..types import RecommendModelType
+from ..models.bases import BaseRecommendModel
+from ..models.board import BoardInDb
+from ..models.card import CardInDb
+
+# -----------------------------------------------------------------------------#
+# Constants
+# -----------------------------------------------------------------------------#
+MODELS: dict[str, type[BaseRecommendModel]] = {
+    RecommendModelType.BOARD.value: BoardInDb,
+    RecommendModelType.CARD.value: CardInDb,
+}
+
+# -----------------------------------------------------------------------------#
+# Functions
+# -----------------------------------------------------------------------------#
+
+
+def to_jsonable(result: Any) -> Any:
+    """
+    Converts a cached result to a value json can dump
+
+    Args:
+        result (Any): A model, a list of models or a tuple of those.
+
+    Returns:
+        Any
+
+    Raises:
+        TypeError if the result holds a model that can't be encoded
+    """
+    if isinstance(result, BaseRecommendModel):
+        if result.model_type.value not in MODELS:
+            raise TypeError(f"{result.model_type.value} models are not encoded")
+        return {"type": result.model_type.value, "data": result.model_dump()}
+    if isinstance(result, tuple):
+        return {"tuple": [to_jsonable(item) for item in result]}
+    return [to_jsonable(item) for item in result]
+
+
+def from_jsonable(value: Any) -> Any:
+    """
+    Converts a value created by `to_jsonable` back to the cached result.
+
+    The models are not validated again. The values were dumped from models.
+
+    Args:
+        value (Any): Output of `to_jsonable`
+
+    Returns:
+        Any
+    """
+    if isinstance(value, list):
+        return [from_jsonable(item) for item in value]
+    if "tuple" in value:
+        return tuple(from_jsonable(item) for item in value["tuple"])
+    return MODELS[value["type"]].model_construct(**value["data"])
+
+
+def sizeof(result: Any) -> int:
+    """
+    Approximate size of a cached result, in bytes: the json size of the models
+    it holds.
+    """
+    if isinstance(result, BaseRecommendModel):
+        return len(result.model_dump_json())
+    return sum(sizeof(item) for item in result)
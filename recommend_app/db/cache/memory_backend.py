@@ -0,0 +1,125 @@
+"""
+Module: db.cache.memory_backend
+===============================
+
+In-process cache backend: an LRU bounded in bytes, with an optional TTL, and an
+index of the keys against their tags. The entries are kept as python objects,
+so a hit costs no decoding.
+"""
+
+# Builtin imports
+from typing import Any, Callable, Iterable, Optional
+
+# Local imports
+from ...lru import LRUCache, CacheStats
+from ..abstracts.abstract_cache import AbstractCacheBackend
+from . import codec
+
+
+class MemoryCacheBackend(AbstractCacheBackend):
+    """
+    Cache backend local to the process
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl: Optional[float] = None,
+        sizeof: Callable[[Any], int] = codec.sizeof,
+    ):
+        """
+        Initialize the backend
+
+        Args:
+            max_bytes (int): Size limit of the cache, in bytes.
+            ttl (float): Seconds an entry stays valid. Optional.
+            sizeof (Callable): Returns the approximate size of an entry.
+        """
+        self.__cache: LRUCache[str, tuple[Any, tuple[str, ...]]] = LRUCache(
+            max_bytes,
+            ttl=ttl,
+            sizeof=lambda entry: sizeof(entry[0]) + sum(len(t) for t in entry[1]),
+            on_remove=self.__untag,
+        )
+        # Keys of the entries against each of their tags
+        self.__tags: dict[str, set[str]] = {}
+        # Bumped by every invalidation
+        self.__version = 0
+
+    ###########################################################################
+    # Properties
+    ###########################################################################
+    @property
+    def stats(self) -> CacheStats:
+        """
+        Returns the hit, miss and eviction counters of the backend
+        """
+        return self.__cache.stats
+
+    ###########################################################################
+    # Methods
+    ###########################################################################
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Returns the entry stored against the key
+        """
+        entry = self.__cache.get(key)
+        return entry[0] if entry is not None else None
+
+    async def version(self) -> int:
+        """
+        Returns the number of invalidations so far
+        """
+        return self.__version
+
+    async def set(
+        self, key: str, value: Any, tags: Iterable[str], version: Optional[int] = None
+    ) -> None:
+        """
+        Stores the entry against the key, unless the cache was invalidated
+        since the version
+        """
+        if version is not None and version != self.__version:
+            return
+
+        entry = (value, tuple(tags))
+        if self.__cache.set(key, entry):
+            for tag in entry[1]:
+                self.__tags.setdefault(tag, set()).add(key)
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        """
+        Drops every entry carrying any of the tags
+        """
+        self.invalidate_local(tags)
+
+    async def clear(self) -> None:
+        """
+        Drops every entry
+        """
+        self.__cache.clear()
+
+    def invalidate_local(self, tags: Iterable[str]) -> None:
+        """
+        Synchronous invalidation. Used by the shared backends to drop their
+        local copies.
+        """
+        self.__version += 1
+        for tag in tags:
+            for key in list(self.__tags.get(tag, ())):
+                self.__cache.pop(key)
+
+    ###########################################################################
+    # Methods: privates
+    ###########################################################################
+    def __untag(self, key: str, entry: tuple[Any, tuple[str, ...]]) -> None:
+        """
+        Called by the LRU when an entry leaves the cache
+        """
+        for tag in entry[1]:
+            keys = self.__tags.get(tag)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self.__tags[tag]
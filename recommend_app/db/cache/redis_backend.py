@@ -0,0 +1,297 @@
+"""
+Module: db.cache.redis_backend
+==============================
+
+Cache backend shared by all the workers, on a Redis protocol server.
+
+Entries are stored as json (see `codec`) with a TTL. Every tag is a Redis set
+holding the keys of its entries. Invalidating a tag deletes its entries and
+the set.
+
+Each worker also keeps the entries it read in a small local cache, so a hot
+board doesn't cost a Redis round trip either. Invalidations are published on
+a channel every worker listens to, so that they all drop their local copies.
+
+Every invalidation increments a version key on the server. An entry is stored
+in a transaction watching that key, and only if it still holds the version
+read before the db: a read racing with a write in another worker is not
+cached.
+
+The users are never stored here, see `CachedRecommendDB`: they hold the hash
+of their password.
+
+Dependencies:
+- `redis`: Optional. Install the `redis` extra to use this backend.
+"""
+
+# Builtin imports
+import asyncio
+import contextlib
+import json
+import logging
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+# Local imports
+from ...lru import CacheStats
+from ..abstracts.abstract_cache import AbstractCacheBackend
+from ..exceptions import RecommendDBConnectionError
+from .. import constants as Key
+from . import codec
+from .memory_backend import MemoryCacheBackend
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+    from redis.asyncio.client import PubSub
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RedisCacheBackend(AbstractCacheBackend):
+    """
+    Cache backend shared through a Redis protocol server
+    """
+
+    def __init__(
+        self,
+        client: "Redis",
+        ttl: Optional[float] = None,
+        local: Optional[MemoryCacheBackend] = None,
+        prefix: str = Key.DB_CACHE_PREFIX,
+    ):
+        """
+        Initialize the backend
+
+        Args:
+            client (Redis): An asyncio redis client.
+            ttl (float): Seconds an entry stays valid. Optional.
+            local (MemoryCacheBackend): Local copies of the entries. Optional.
+            prefix (str): Prefix of the keys, tags and channel of this cache.
+        """
+        self.__client = client
+        self.__ttl = int(ttl) if ttl else None
+        self.__local = local
+        self.__prefix = prefix
+        self.__channel = f"{prefix}invalidate"
+        self.__version_key = f"{prefix}version"
+
+        self.__pubsub: Optional["PubSub"] = None
+        self.__listener: Optional[asyncio.Task] = None
+
+        self.__hits = 0
+        self.__misses = 0
+
+    @classmethod
+    def from_url(
+        cls, url: str, ttl: Optional[float] = None, local_max_bytes: int = 0
+    ) -> "RedisCacheBackend":
+        """
+        Creates the backend from the url of the server
+
+        Args:
+            url (str): Url of the server, e.g. redis://localhost:6379/0
+            ttl (float): Seconds an entry stays valid. Optional.
+            local_max_bytes (int): Size limit of the local copies. No local
+                copies are kept if it is 0.
+
+        Returns:
+            RedisCacheBackend
+
+        Raises:
+            RecommendDBConnectionError if the redis package is not installed.
+        """
+        try:
+            from redis.asyncio import Redis
+        except ImportError as err:
+            raise RecommendDBConnectionError(
+                "The redis cache backend needs the redis package"
+            ) from err
+
+        local = MemoryCacheBackend(local_max_bytes, ttl) if local_max_bytes else None
+        return cls(Redis.from_url(url), ttl=ttl, local=local)
+
+    ###########################################################################
+    # Properties
+    ###########################################################################
+    @property
+    def stats(self) -> CacheStats:
+        """
+        Returns the hit, miss and eviction counters of the backend. The hits
+        include the ones served from the local copies.
+        """
+        if self.__local is None:
+            return CacheStats(hits=self.__hits, misses=self.__misses)
+
+        local = self.__local.stats
+        return local.model_copy(
+            update={"hits": local.hits + self.__hits, "misses": self.__misses}
+        )
+
+    @property
+    def shared(self) -> bool:
+        """
+        Returns True, the entries are shared by all the workers
+        """
+        return True
+
+    ###########################################################################
+    # Methods: Connection
+    ###########################################################################
+    async def connect(self) -> None:
+        """
+        Checks the server and starts listening to the invalidations.
+
+        Raises:
+            RecommendDBConnectionError if the server can't be reached.
+        """
+        try:
+            await self.__client.ping()
+        except Exception as err:
+            raise RecommendDBConnectionError(
+                "Failed to connect to the cache server"
+            ) from err
+
+        if self.__local is not None:
+            self.__pubsub = self.__client.pubsub()
+            await self.__pubsub.subscribe(self.__channel)
+            self.__listener = asyncio.create_task(self.__listen())
+
+    async def disconnect(self) -> None:
+        """
+        Stops listening and closes the connection
+        """
+        if self.__listener is not None:
+            listener, self.__listener = self.__listener, None
+            listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await listener
+
+        if self.__pubsub is not None:
+            await self.__pubsub.aclose()
+            self.__pubsub = None
+
+        await self.__client.aclose()
+
+    ###########################################################################
+    # Methods: Entries
+    ###########################################################################
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Returns the entry stored against the key, from the local copies first.
+        """
+        local_version = None
+        if self.__local is not None:
+            value = await self.__local.get(key)
+            if value is not None:
+                return value
+            local_version = await self.__local.version()
+
+        data = await self.__client.get(self.__prefix + key)
+        if data is None:
+            self.__misses += 1
+            return None
+
+        self.__hits += 1
+        entry = json.loads(data)
+        value = codec.from_jsonable(entry["value"])
+        if self.__local is not None:
+            # Not kept if the invalidation reached this worker meanwhile
+            await self.__local.set(key, value, entry["tags"], local_version)
+        return value
+
+    async def version(self) -> int:
+        """
+        Returns the number of invalidations made by all the workers
+        """
+        return int(await self.__client.get(self.__version_key) or 0)
+
+    async def set(
+        self, key: str, value: Any, tags: Iterable[str], version: Optional[int] = None
+    ) -> None:
+        """
+        Stores the entry on the server, and locally. With a version, the
+        entry is dropped if any worker invalidated the cache since.
+        """
+        from redis.exceptions import WatchError
+
+        tags = list(tags)
+        data = json.dumps({"value": codec.to_jsonable(value), "tags": tags})
+        async with self.__client.pipeline(transaction=version is not None) as pipe:
+            if version is not None:
+                await pipe.watch(self.__version_key)
+                if int(await pipe.get(self.__version_key) or 0) != version:
+                    return
+                pipe.multi()
+
+            pipe.set(self.__prefix + key, data, ex=self.__ttl)
+            for tag in tags:
+                pipe.sadd(self.__prefix + tag, key)
+                if self.__ttl:
+                    pipe.expire(self.__prefix + tag, self.__ttl)
+            try:
+                await pipe.execute()
+            except WatchError:
+                return
+
+        if self.__local is not None:
+            await self.__local.set(key, value, tags)
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        """
+        Drops the entries carrying the tags from the server and publishes the
+        tags, so that every worker drops its local copies.
+        """
+        tags = list(tags)
+        if not tags:
+            return
+
+        if self.__local is not None:
+            self.__local.invalidate_local(tags)
+
+        tag_keys = [self.__prefix + tag for tag in tags]
+        async with self.__client.pipeline(transaction=False) as pipe:
+            # First, so that the reads in flight are not stored
+            pipe.incr(self.__version_key)
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            _, *members = await pipe.execute()
+
+        keys = {
+            self.__prefix + (key.decode() if isinstance(key, bytes) else key)
+            for keys in members
+            for key in keys
+        }
+        async with self.__client.pipeline(transaction=False) as pipe:
+            pipe.delete(*keys, *tag_keys)
+            pipe.publish(self.__channel, json.dumps(tags))
+            await pipe.execute()
+
+    async def clear(self) -> None:
+        """
+        Drops the local copies. The shared entries are left to the other
+        workers.
+        """
+        if self.__local is not None:
+            await self.__local.clear()
+
+    ###########################################################################
+    # Methods: privates
+    ###########################################################################
+    async def __listen(self) -> None:
+        """
+        Drops the local copies of the entries invalidated by any worker
+        """
+        assert self.__pubsub is not None
+        try:
+            async for message in self.__pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                if self.__local is not None:
+                    self.__local.invalidate_local(json.loads(message["data"]))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Without the invalidations, the local copies could go stale.
+            LOGGER.exception("Lost the cache invalidation channel")
+            local, self.__local = self.__local, None
+            if local is not None:
+                await local.clear()
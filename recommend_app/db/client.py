@@ -8,24 +8,40 @@ recommend_app. It handles operations related to users, boards, and cards,
 including adding, retrieving, and removing entities. The `RecommendDbClient`
 class abstracts away the direct interactions with the database, making it
 easier to manage and extend the application's data storage layer.
+
+The reads take a read preference hint. They go to the primary by default.
+Reads that can live with slightly stale data, e.g. anonymous visitors of the
+public pages, can be routed to the secondaries with
+`ReadPreference.SECONDARY_PREFERRED`. The reads of an owner and the reads
+following a write must stay on the primary to see the writes.
 """
 
 # Builtin imports
-from typing import TYPE_CHECKING, Optional, cast, Any
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Optional, Sequence, cast, Any
 
 # Local imports
-from .exceptions import RecommendDBConnectionError, RecommendAppDbError
-from .types import RecommendModelType
-from .hashing import Hasher
+from .exceptions import (
+    RecommendDBConnectionError,
+    RecommendAppDbError,
+    RecommendDBModelNotFound,
+)
+from .types import RecommendModelType, ReadPreference
+from .hashing import AsyncHasher, get_hasher
+from .models.user import UpdateUser
 from .models.board import NewBoard
 from .models.card import NewCard
+from .models.job import NewEnrichmentJob
 
 
 if TYPE_CHECKING:
     from .abstracts.abstract_db import AbstractRecommendDB
-    from .models.user import NewUser, UserInDb, UpdateUser
+    from .models.user import NewUser, UserInDb
     from .models.board import BoardInDb, UpdateBoard
     from .models.card import CardInDb, UpdateCard
+    from .models.bulk import BulkAddFailure
+    from .models.job import EnrichmentJob
+    from .models.page import CardPage, ScrapedFields
 
 
 class RecommendDbClient:
@@ -41,9 +57,10 @@ class RecommendDbClient:
     Attributes:
         __db (AbstractRecommendDB): The database instance used for storage and
         retrieval of data.
+        __hasher (AsyncHasher): Hashes the passwords off the event loop.
     """
 
-    def __init__(self, db: "AbstractRecommendDB"):
+    def __init__(self, db: "AbstractRecommendDB", hasher: Optional[AsyncHasher] = None):
         """
         Initialize the RecommendDbClient with a specific database
         implementation.
@@ -52,8 +69,21 @@ class RecommendDbClient:
             db (AbstractRecommendDB): An instance of a class implementing the
                                       AbstractRecommendDB interface, which
                                       defines the database operations.
+            hasher (AsyncHasher): Hashes the passwords. Optional, the hasher
+                                  shared by the app is used if not given.
         """
         self.__db = db
+        self.__hasher = hasher or get_hasher()
+
+    ###########################################################################
+    # Properties
+    ###########################################################################
+    @property
+    def hasher(self) -> AsyncHasher:
+        """
+        Returns the hasher of the passwords
+        """
+        return self.__hasher
 
     ###########################################################################
     # Methods: DB
@@ -110,7 +140,7 @@ class RecommendDbClient:
             `RecommendDBModelCreationError` if user creation fails.
         """
         # Hash the password
-        new_user.password = Hasher.hash_password(new_user.password)
+        new_user.password = await self.__hasher.hash_password(new_user.password)
         result = await self.__db.add(new_user)
         return cast(
             "UserInDb", result
@@ -121,6 +151,7 @@ class RecommendDbClient:
         id: Optional[str] = None,
         email_address: Optional[str] = None,
         user_name: Optional[str] = None,
+        read_preference: ReadPreference = ReadPreference.PRIMARY,
     ) -> "UserInDb":
         """
         Retrieve a user from the database by their unique attribute: id, email or username.
@@ -129,6 +160,8 @@ class RecommendDbClient:
             id (str): The unique identifier of the user.
             email_address (str): Email address of the user.
             user_name (str): User name of the user
+            read_preference (ReadPreference): Where the read can be served
+                from. Primary by default.
 
         Returns:
             UserInDb: The User object corresponding to the provided UID.
@@ -149,10 +182,12 @@ class RecommendDbClient:
                 "Please provide an id or email or username of the user."
             )
 
-        result = await self.__db.get(RecommendModelType.USER, attrs_dict)
+        result = await self.__db.get(
+            RecommendModelType.USER, attrs_dict, read_preference
+        )
         return cast("UserInDb", result)
 
-    async def update_user(self, user_id: str, update_data: "UpdateUser") -> "UserInDb":
+    async def update_user(self, user_id: str, update_data: UpdateUser) -> "UserInDb":
         """
         Update user info
 
@@ -170,10 +205,38 @@ class RecommendDbClient:
         """
         # Hash the password
         if update_data.password:
-            update_data.password = Hasher.hash_password(update_data.password)
+            update_data.password = await self.__hasher.hash_password(
+                update_data.password
+            )
         result = await self.__db.update(user_id, update_data)
         return cast("UserInDb", result)
 
+    async def rehash_password(
+        self, user_id: str, password: str, hashed_password: str
+    ) -> "UserInDb":
+        """
+        Hashes the password again with the current settings of the hasher.
+        The user is only updated if its hash is still hashed_password, so
+        that a password changed in the meantime is not overwritten.
+
+        Args:
+            user_id (str): The unique identifier of the user.
+            password (str): The plain password of the user
+            hashed_password (str): Hash of the password currently stored.
+
+        Returns:
+            User: User with the new hash
+
+        Raises:
+            `RecommendDBModelNotFound` if the user is not found
+            `RecommendAppDbError` if the password has changed in the meantime
+        """
+        update_data = UpdateUser(password=await self.__hasher.hash_password(password))
+        result = await self.__db.update(
+            user_id, update_data, {"password": hashed_password}
+        )
+        return cast("UserInDb", result)
+
     ###########################################################################
     # Methods: Board
     ###########################################################################
@@ -196,7 +259,10 @@ class RecommendDbClient:
         return cast("BoardInDb", result)
 
     async def get_board(
-        self, board_id: str, owner_id: Optional[str] = None
+        self,
+        board_id: str,
+        owner_id: Optional[str] = None,
+        read_preference: ReadPreference = ReadPreference.PRIMARY,
     ) -> "BoardInDb":
         """
         Retrieve a board from the database by its unique identifier (UID).
@@ -206,6 +272,8 @@ class RecommendDbClient:
             owner_id (str): If the board is private, then owner_id must be
                 provided. The board will be returned only if it belongs to the
                 owner.
+            read_preference (ReadPreference): Where the read can be served
+                from. Primary by default.
 
         Returns:
             Board: The Board object corresponding to the provided UID.
@@ -216,7 +284,9 @@ class RecommendDbClient:
                 given or if the given owner_id doesn't match the board's owner.
         """
         attrs_dict = {"id": board_id}
-        board = await self.__db.get(RecommendModelType.BOARD, attrs_dict)
+        board = await self.__db.get(
+            RecommendModelType.BOARD, attrs_dict, read_preference
+        )
         board = cast("BoardInDb", board)
         if board.private:
             if not owner_id:
@@ -230,8 +300,61 @@ class RecommendDbClient:
 
         return board
 
+    async def get_board_with_cards(
+        self,
+        board_id: str,
+        owner_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        read_preference: ReadPreference = ReadPreference.PRIMARY,
+    ) -> tuple["BoardInDb", list["CardInDb"]]:
+        """
+        Retrieve a board and a page of its cards in one go. The same rules as
+        `get_board` apply to private boards.
+
+        Args:
+            board_id (str): The unique identifier of the board.
+            owner_id (str): If the board is private, then owner_id must be
+                provided. The board will be returned only if it belongs to the
+                owner.
+            limit (int): Maximum number of cards to return. Optional.
+            after (str): Cursor. Id of the last card of the previous page.
+                Optional.
+            read_preference (ReadPreference): Where the read can be served
+                from. Primary by default.
+
+        Returns:
+            tuple: The board and its cards.
+
+        Raises:
+            `RecommendDBModelNotFound` if the board is not found
+            `RecommendAppDbError` if the board is private and no owner_id is
+                given, if the given owner_id doesn't match the board's owner
+                or if the cursor is invalid.
+        """
+        try:
+            board, cards = await self.__db.get_board_with_cards(
+                board_id,
+                owner_id,
+                limit=limit,
+                after=after,
+                read_preference=read_preference,
+            )
+        except RecommendDBModelNotFound:
+            # Either the board doesn't exist or it is private. get_board
+            # raises the matching error.
+            await self.get_board(board_id, owner_id, read_preference)
+            raise
+
+        return cast("BoardInDb", board), cast(list["CardInDb"], cards)
+
     async def get_all_boards(
-        self, owner_id: str, only_public: bool = False
+        self,
+        owner_id: str,
+        only_public: bool = False,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        read_preference: ReadPreference = ReadPreference.PRIMARY,
     ) -> list["BoardInDb"]:
         """
         Retrieve all boards associated with a specific user.
@@ -239,19 +362,33 @@ class RecommendDbClient:
         Args:
             owner_id (str): The id of the owner whose boards are being queried
             only_public (bool): If set to true, only public boards will be returned.
+            limit (int): Maximum number of boards to return. Optional.
+            after (str): Cursor. Id of the last board of the previous page.
+                Optional.
+            read_preference (ReadPreference): Where the read can be served
+                from. Primary by default.
 
         Returns:
             list[Board]: A list of Board objects belonging to the user.
+
+        Raises:
+            `RecommendAppDbError` if the cursor is invalid.
         """
         attr_dict: dict[str, Any] = {"owner_id": owner_id}
         if only_public:
             attr_dict["private"] = False
 
-        boards = await self.__db.get_all(RecommendModelType.BOARD, attr_dict)
+        boards = await self.__db.get_all(
+            RecommendModelType.BOARD,
+            attr_dict,
+            limit=limit,
+            after=after,
+            read_preference=read_preference,
+        )
         return cast(list["BoardInDb"], boards)
 
     async def update_board(
-        self, board_id: str, update_data: "UpdateBoard"
+        self, board_id: str, update_data: "UpdateBoard", owner_id: Optional[str] = None
     ) -> "BoardInDb":
         """
         Retrieve a board from the database by its unique identifier (UID) and
@@ -261,39 +398,54 @@ class RecommendDbClient:
             board_id (str): The unique identifier of the board.
             update_data (UpdateBoard): If the value is not None, then the board
                 is updated.
+            owner_id (str): If given, the board is only updated if it belongs
+                to this owner.
 
         Returns:
             Board: Board with the updated data
 
         Raises:
             `RecommendDBModelNotFound` if the board is not found
-            `RecommendAppDbError` if there is an issue in updating the model
+            `RecommendAppDbError` if the board doesn't belong to the owner or
+                if there is an issue in updating the model
         """
-        result = await self.__db.update(board_id, update_data)
+        attrs_dict = {"owner_id": owner_id} if owner_id else None
+        result = await self.__db.update(board_id, update_data, attrs_dict)
         return cast("BoardInDb", result)
 
-    async def remove_board(self, board_id: str) -> bool:
+    async def remove_board(self, board_id: str, owner_id: Optional[str] = None) -> bool:
         """
         Remove a board from the database.
 
         Args:
-            board (Board): The Board object to be removed.
+            board_id (str): ID of the board to be removed.
+            owner_id (str): If given, the board is only removed if it belongs
+                to this owner.
 
         Returns:
             bool: True if the board was successfully removed, False otherwise.
+
+        Raises:
+            `RecommendDBModelNotFound` if the board is not found
+            `RecommendAppDbError` if the board doesn't belong to the owner
         """
-        return await self.__db.remove(RecommendModelType.BOARD, board_id)
+        attrs_dict = {"owner_id": owner_id} if owner_id else None
+        return await self.__db.remove(RecommendModelType.BOARD, board_id, attrs_dict)
 
     ###########################################################################
     # Methods: Card
     ###########################################################################
-    async def add_card(self, new_card: NewCard, board_id: str) -> "CardInDb":
+    async def add_card(
+        self, new_card: NewCard, board_id: str, owner_id: Optional[str] = None
+    ) -> "CardInDb":
         """
         Add a new card to the database.
 
         Args:
             new_card (NewCard): Model with all the necessary info to create a new card
             board_id (str): Board to which this card will be added to.
+            owner_id (str): Owner of the board. It is stored with the card, so
+                that the card's writes can be checked against it.
 
         Returns:
             CardInDb: The newly created Card object.
@@ -301,16 +453,52 @@ class RecommendDbClient:
         Raises:
             `RecommendDBModelCreationError` if card creation fails.
         """
-        card_with_boardid = NewCard(**new_card.model_dump(), board_id=board_id)
+        card_with_boardid = NewCard(
+            **{**new_card.model_dump(), "board_id": board_id, "owner_id": owner_id}
+        )
         result = await self.__db.add(card_with_boardid)
         return cast("CardInDb", result)
 
-    async def get_card(self, card_id: str) -> "CardInDb":
+    async def add_cards(
+        self, board_id: str, new_cards: list[NewCard], owner_id: Optional[str] = None
+    ) -> tuple[list["CardInDb"], list["BulkAddFailure"]]:
+        """
+        Add a list of new cards to a board in one go.
+
+        A card that cannot be created (e.g. its url is already on the board)
+        is reported back instead of failing the whole list.
+
+        Args:
+            board_id (str): Board to which the cards will be added to.
+            new_cards (list[NewCard]): Models with all the necessary info to
+                create the new cards
+            owner_id (str): Owner of the board. See `add_card`.
+
+        Returns:
+            tuple: The newly created cards and the failures. Every failure
+                points to the index of its card in `new_cards`.
+        """
+        cards_with_boardid = [
+            NewCard(
+                **{**new_card.model_dump(), "board_id": board_id, "owner_id": owner_id}
+            )
+            for new_card in new_cards
+        ]
+        cards, failures = await self.__db.add_many(cards_with_boardid)
+        return cast(list["CardInDb"], cards), failures
+
+    async def get_card(
+        self,
+        card_id: str,
+        read_preference: ReadPreference = ReadPreference.PRIMARY,
+    ) -> "CardInDb":
         """
         Retrieve a card from the database by its unique identifier (UID).
 
         Args:
             card_id (str): The unique identifier of the card.
+            read_preference (ReadPreference): Where the read can be served
+                from. Primary by default.
 
         Returns:
             Card: The Card object corresponding to the provided UID.
@@ -321,24 +509,46 @@ class RecommendDbClient:
                 given or if the given owner_id doesn't match the board's owner.
         """
         attrs_dict = {"id": card_id}
-        card = await self.__db.get(RecommendModelType.CARD, attrs_dict)
+        card = await self.__db.get(RecommendModelType.CARD, attrs_dict, read_preference)
         return cast("CardInDb", card)
 
-    async def get_all_cards(self, board_id: str) -> list["CardInDb"]:
+    async def get_all_cards(
+        self,
+        board_id: str,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        read_preference: ReadPreference = ReadPreference.PRIMARY,
+    ) -> list["CardInDb"]:
         """
         Retrieve all cards associated with a specific board.
 
         Args:
             board_id (str): Id of the board
+            limit (int): Maximum number of cards to return. Optional.
+            after (str): Cursor. Id of the last card of the previous page.
+                Optional.
+            read_preference (ReadPreference): Where the read can be served
+                from. Primary by default.
 
         Returns:
             list[Card]: A list of Card objects belonging to the board.
+
+        Raises:
+            `RecommendAppDbError` if the cursor is invalid.
         """
         attr_dict: dict[str, Any] = {"board_id": board_id}
-        cards = await self.__db.get_all(RecommendModelType.CARD, attr_dict)
+        cards = await self.__db.get_all(
+            RecommendModelType.CARD,
+            attr_dict,
+            limit=limit,
+            after=after,
+            read_preference=read_preference,
+        )
         return cast(list["CardInDb"], cards)
 
-    async def update_card(self, card_id: str, update_data: "UpdateCard") -> "CardInDb":
+    async def update_card(
+        self, card_id: str, update_data: "UpdateCard", owner_id: Optional[str] = None
+    ) -> "CardInDb":
         """
         Retrieve a card from the database by its unique identifier (UID) and
         update its attributes
@@ -347,25 +557,244 @@ class RecommendDbClient:
             card_id (str): The unique identifier of the card.
             update_data (UpdateCard): If the value is not None, then the card
                 is updated.
+            owner_id (str): If given, the card is only updated if its board
+                belongs to this owner.
 
         Returns:
             Card: Card with the updated data
 
         Raises:
-            `RecommendDBModelNotFound` if the board is not found
-            `RecommendAppDbError` if there is an issue in updating the model
+            `RecommendDBModelNotFound` if the card is not found
+            `RecommendAppDbError` if the card doesn't belong to the owner or
+                if there is an issue in updating the model
         """
-        result = await self.__db.update(card_id, update_data)
+        if not owner_id:
+            result = await self.__db.update(card_id, update_data)
+            return cast("CardInDb", result)
+
+        try:
+            result = await self.__db.update(
+                card_id, update_data, {"owner_id": owner_id}
+            )
+        except RecommendAppDbError:
+            if not await self.__is_legacy_card_owner(card_id, owner_id):
+                raise
+            result = await self.__db.update(card_id, update_data)
+
         return cast("CardInDb", result)
 
-    async def remove_card(self, card_id: str) -> bool:
+    async def remove_card(self, card_id: str, owner_id: Optional[str] = None) -> bool:
         """
         Remove a card from the database.
 
         Args:
             card_id (str): ID of the card to be removed.
+            owner_id (str): If given, the card is only removed if its board
+                belongs to this owner.
 
         Returns:
             bool: True if the card was successfully removed, False otherwise.
+
+        Raises:
+            `RecommendDBModelNotFound` if the card is not found
+            `RecommendAppDbError` if the card doesn't belong to the owner
+        """
+        if not owner_id:
+            return await self.__db.remove(RecommendModelType.CARD, card_id)
+
+        try:
+            return await self.__db.remove(
+                RecommendModelType.CARD, card_id, {"owner_id": owner_id}
+            )
+        except RecommendAppDbError:
+            if not await self.__is_legacy_card_owner(card_id, owner_id):
+                raise
+            return await self.__db.remove(RecommendModelType.CARD, card_id)
+
+    ###########################################################################
+    # Methods: Scrapes
+    ###########################################################################
+    async def get_scrape(self, url: str) -> Optional[NewCard]:
+        """
+        Retrieve the card scrapped from a page, if it is stored and still
+        valid.
+
+        Args:
+            url (str): Normalized url of the page
+
+        Returns:
+            NewCard, None if there is none.
+
+        Raises:
+            `RecommendAppDbError` if the read fails
         """
-        return await self.__db.remove(RecommendModelType.CARD, card_id)
+        return await self.__db.get_scrape(url)
+
+    async def add_scrape(self, url: str, card: NewCard, ttl: float) -> None:
+        """
+        Store the card scrapped from a page for a while.
+
+        Args:
+            url (str): Normalized url of the page
+            card (NewCard): Card scrapped from the page
+            ttl (float): Seconds the card stays valid
+
+        Raises:
+            `RecommendAppDbError` if the write fails
+        """
+        await self.__db.set_scrape(url, card, ttl)
+
+    ###########################################################################
+    # Methods: Enrichment jobs
+    ###########################################################################
+    async def enqueue_enrichment(self, cards: Sequence["CardInDb"]) -> int:
+        """
+        Queues the cards to be enriched with the data scrapped from their url.
+
+        Args:
+            cards (Sequence[CardInDb]): Cards to enrich
+
+        Returns:
+            int: Number of jobs queued. 0 if the db has no queue.
+
+        Raises:
+            `RecommendAppDbError` if the write fails
+        """
+        jobs = [NewEnrichmentJob(card_id=card.id, url=card.url) for card in cards]
+        return await self.__db.add_jobs(jobs)
+
+    async def claim_enrichment_job(
+        self,
+        worker_id: str,
+        lease_seconds: float,
+        max_attempts: Optional[int] = None,
+    ) -> Optional["EnrichmentJob"]:
+        """
+        Leases the next enrichment job due to the worker.
+
+        Args:
+            worker_id (str): Id of the worker
+            lease_seconds (float): Seconds the job is leased for
+            max_attempts (int): Attempts before a job is dead. Optional, see
+                `claim_job`.
+
+        Returns:
+            EnrichmentJob, None if no job is due.
+
+        Raises:
+            `RecommendAppDbError` if the write fails
+        """
+        return await self.__db.claim_job(worker_id, lease_seconds, max_attempts)
+
+    async def complete_enrichment_job(self, job_id: str, worker_id: str) -> bool:
+        """
+        Removes an enrichment job that is done.
+
+        Returns:
+            bool: False if the worker lost the lease of the job.
+
+        Raises:
+            `RecommendAppDbError` if the write fails
+        """
+        return await self.__db.complete_job(job_id, worker_id)
+
+    async def fail_enrichment_job(
+        self,
+        job_id: str,
+        worker_id: str,
+        error: str,
+        retry_at: Optional[datetime] = None,
+        count_attempt: bool = True,
+    ) -> bool:
+        """
+        Releases an enrichment job that failed, to be retried at retry_at. The
+        job is dead if retry_at is not given. The attempt is given back to the
+        job if count_attempt is False, see `fail_job`.
+
+        Returns:
+            bool: False if the worker lost the lease of the job.
+
+        Raises:
+            `RecommendAppDbError` if the write fails
+        """
+        return await self.__db.fail_job(
+            job_id, worker_id, error, retry_at, count_attempt
+        )
+
+    ###########################################################################
+    # Methods: Card pages
+    ###########################################################################
+    async def get_stale_pages(self, before: datetime, limit: int) -> list["CardPage"]:
+        """
+        Returns the pages of the cards last fetched before the given date,
+        oldest first.
+
+        Args:
+            before (datetime): Date the pages are stale before
+            limit (int): Maximum number of pages to return
+
+        Returns:
+            list[CardPage]: Empty if the db doesn't keep the pages.
+
+        Raises:
+            `RecommendAppDbError` if the read fails
+        """
+        return await self.__db.get_stale_pages(before, limit)
+
+    async def set_page_validators(
+        self,
+        card_id: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        scraped_at: Optional[datetime] = None,
+        scraped: Optional["ScrapedFields"] = None,
+    ) -> bool:
+        """
+        Stores the validators of the last fetch of the page of a card, and
+        the data it had if it was scrapped.
+
+        Args:
+            card_id (str): Id of the card
+            etag (str): ETag of the page. Optional.
+            last_modified (str): Last-Modified date of the page. Optional.
+            scraped_at (datetime): When the page was fetched. Now if not given.
+            scraped (ScrapedFields): Data of the page. Optional, the data of
+                the last scrap is kept if not given.
+
+        Returns:
+            bool: False if the card doesn't exist
+
+        Raises:
+            `RecommendAppDbError` if the write fails
+        """
+        scraped_at = scraped_at or datetime.now(timezone.utc)
+        return await self.__db.set_page_validators(
+            card_id, etag, last_modified, scraped_at, scraped
+        )
+
+    ###########################################################################
+    # Methods: privates
+    ###########################################################################
+    async def __is_legacy_card_owner(self, card_id: str, owner_id: str) -> bool:
+        """
+        Cards added before the owner_id was stored with them can't be matched
+        on it. Check the owner of their board instead.
+
+        Args:
+            card_id (str): ID of the card
+            owner_id (str): ID of the user writing the card
+
+        Returns:
+            True if the card has no owner_id and its board belongs to the owner
+        """
+        try:
+            card = await self.__db.get(
+                RecommendModelType.CARD, {"id": card_id, "owner_id": None}
+            )
+            board = await self.__db.get(
+                RecommendModelType.BOARD, {"id": cast("CardInDb", card).board_id}
+            )
+        except RecommendDBModelNotFound:
+            return False
+
+        return cast("BoardInDb", board).owner_id == owner_id
@@ -8,6 +8,26 @@ Literals used in the db module
 # DB
 DB_NAME = "RecommendDB"
 
+# Cache
+DB_CACHE_TTL = "60"
+DB_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DB_CACHE_MEMORY = "memory"
+DB_CACHE_REDIS = "redis"
+DB_CACHE_PREFIX = "recommend:cache:"
+
+# Scrapes
+SCRAPES_COLLECTION = "scrapes"
+
+# Enrichment jobs
+JOBS_COLLECTION = "enrichment_jobs"
+JOB_PENDING = "pending"
+JOB_LEASED = "leased"
+JOB_DEAD = "dead"
+
+# Read preferences
+READ_PRIMARY = "primary"
+READ_SECONDARY_PREFERRED = "secondaryPreferred"
+
 # Models
 RECOMMEND_MODEL_USER = "User"
 RECOMMEND_MODEL_BOARD = "Board"
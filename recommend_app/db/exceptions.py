@@ -38,3 +38,10 @@ class RecommendDBModelNotFound(RecommendAppError):
     This is useful for handling cases where queries for non-existent records
     are made.
     """
+
+
+class RecommendDBQueryPlanError(RecommendAppError):
+    """
+    Raised when a query the application relies on is not backed by an index
+    and the database is configured to refuse collection scans.
+    """
@@ -1,21 +1,143 @@
-""" """
+"""
+Module: db.hashing
+==================
+
+Password hashing.
+
+`Hasher` hashes and verifies the passwords with bcrypt. A bcrypt call takes
+100ms or more of CPU on purpose, so the app must not call it from a coroutine:
+it would stall every other request of the worker for that long.
+`AsyncHasher` runs the calls in a pool of threads (bcrypt releases the GIL
+while it hashes) and caps how many run at once. The calls over the cap wait
+for their turn; how many are waiting is reported in `HashingStats`.
+
+The cost of bcrypt is set by its number of rounds: every extra round doubles
+the time of a hash. When the rounds are set, the hashes made with other
+rounds need an update, see `Hasher.needs_update`. `calibrate` measures the
+hashing time on the host and recommends rounds for a target latency:
+
+    poetry run calibrate-hashing --target-ms 250
+
+Environment Variables:
+- `HASHER_MAX_CONCURRENCY`: (Optional) Maximum number of hashes computed at
+                            once. Defaults to the number of CPUs, up to 4.
+- `HASHER_BCRYPT_ROUNDS`: (Optional) Rounds of the new hashes, 4 to 31.
+                          Defaults to passlib's default.
+"""
 
 # Builtin imports
+import argparse
+import asyncio
 import logging
+import os
+import statistics
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
 
 # Project specific imports
 from passlib.context import CryptContext
+from pydantic import BaseModel, Field
 
 # [ISSUE]: AttributeError: module 'bcrypt' has no attribute '__about__'
 # [LINK]: https://github.com/pyca/bcrypt/issues/684
 logging.getLogger("passlib").setLevel(logging.ERROR)
 
+T = TypeVar("T")
+
+# -----------------------------------------------------------------------------#
+# Constants
+# -----------------------------------------------------------------------------#
+DEFAULT_MAX_CONCURRENCY = 4
+MIN_BCRYPT_ROUNDS = 4
+MAX_BCRYPT_ROUNDS = 31
+
+# -----------------------------------------------------------------------------#
+# Models
+# -----------------------------------------------------------------------------#
+
+
+class HashingStats(BaseModel):
+    """
+    Counters of an AsyncHasher
+
+    Args:
+        max_concurrency (int): Maximum number of hashes computed at once
+        in_flight (int): Number of hashes being computed
+        waiting (int): Number of calls waiting for their turn
+        max_waiting (int): Highest number of calls that waited at once
+        completed (int): Number of calls done
+    """
+
+    max_concurrency: int = 0
+    in_flight: int = 0
+    waiting: int = 0
+    max_waiting: int = 0
+    completed: int = 0
+
+
+class HashCalibration(BaseModel):
+    """
+    Result of `calibrate`
+
+    Args:
+        target_ms (float): Target latency of a hash
+        recommended_rounds (int): Highest rounds whose hash takes at most the
+            target. The lowest measured rounds if none does.
+        timings_ms (dict[int, float]): Median latency of a hash per rounds
+    """
+
+    target_ms: float
+    recommended_rounds: int
+    timings_ms: dict[int, float] = Field(default_factory=dict)
+
+
+# -----------------------------------------------------------------------------#
+# Functions
+# -----------------------------------------------------------------------------#
+
+
+def create_context(rounds: Optional[int] = None) -> CryptContext:
+    """
+    Creates the bcrypt context.
+
+    Args:
+        rounds (int): Rounds of the new hashes. Optional, read from
+            `HASHER_BCRYPT_ROUNDS` if not given. Hashes made with other rounds
+            need an update. If not set at all, passlib's default is used and
+            no hash needs an update because of its rounds.
+
+    Returns:
+        CryptContext
+
+    Raises:
+        ValueError if the rounds are out of bcrypt's range.
+    """
+    if rounds is None and os.getenv("HASHER_BCRYPT_ROUNDS"):
+        rounds = int(os.environ["HASHER_BCRYPT_ROUNDS"])
+
+    if rounds is None:
+        return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+    if not MIN_BCRYPT_ROUNDS <= rounds <= MAX_BCRYPT_ROUNDS:
+        raise ValueError(
+            f"bcrypt rounds must be between {MIN_BCRYPT_ROUNDS} and {MAX_BCRYPT_ROUNDS}"
+        )
+
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
 
 # -----------------------------------------------------------------------------#
 # Class
 # -----------------------------------------------------------------------------#
 class Hasher:
-    CONTEXT = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    CONTEXT = create_context()
 
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -24,3 +146,209 @@ class Hasher:
     @staticmethod
     def hash_password(password: str) -> str:
         return Hasher.CONTEXT.hash(password)
+
+    @staticmethod
+    def needs_update(hashed_password: str) -> bool:
+        return Hasher.CONTEXT.needs_update(hashed_password)
+
+
+class AsyncHasher:
+    """
+    Runs the `Hasher` calls off the event loop, with a cap on how many run at
+    once.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Initialize the hasher
+
+        Args:
+            max_concurrency (int): Maximum number of hashes computed at once.
+                Optional, read from `HASHER_MAX_CONCURRENCY` if not given.
+            executor (Executor): Where the hashes are computed. Optional, a
+                pool of max_concurrency threads is created on first use.
+        """
+        if max_concurrency is None:
+            max_concurrency = int(
+                os.getenv(
+                    "HASHER_MAX_CONCURRENCY",
+                    min(DEFAULT_MAX_CONCURRENCY, os.cpu_count() or 1),
+                )
+            )
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.__max_concurrency = max_concurrency
+        self.__executor = executor
+        # Only the pool created here is shut down by the hasher
+        self.__owns_executor = executor is None
+        self.__semaphore = asyncio.Semaphore(max_concurrency)
+
+        self.__in_flight = 0
+        self.__waiting = 0
+        self.__max_waiting = 0
+        self.__completed = 0
+
+    ###########################################################################
+    # Properties
+    ###########################################################################
+    @property
+    def stats(self) -> HashingStats:
+        """
+        Returns the counters of the hasher
+        """
+        return HashingStats(
+            max_concurrency=self.__max_concurrency,
+            in_flight=self.__in_flight,
+            waiting=self.__waiting,
+            max_waiting=self.__max_waiting,
+            completed=self.__completed,
+        )
+
+    ###########################################################################
+    # Methods
+    ###########################################################################
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Checks the password against the hash. See `Hasher.verify_password`.
+        """
+        return await self.__run(Hasher.verify_password, plain_password, hashed_password)
+
+    async def hash_password(self, password: str) -> str:
+        """
+        Hashes the password. See `Hasher.hash_password`.
+        """
+        return await self.__run(Hasher.hash_password, password)
+
+    def needs_update(self, hashed_password: str) -> bool:
+        """
+        Checks if the hash was made with other settings than the current ones.
+        It only parses the hash, so it is cheap enough for the event loop.
+        """
+        return Hasher.needs_update(hashed_password)
+
+    def shutdown(self) -> None:
+        """
+        Shuts down the pool of threads created by the hasher, waiting for the
+        running calls. It is created again if the hasher is used afterwards.
+        """
+        if self.__owns_executor and self.__executor is not None:
+            executor, self.__executor = self.__executor, None
+            executor.shutdown(wait=True)
+
+    ###########################################################################
+    # Methods: privates
+    ###########################################################################
+    async def __run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Runs the function in the executor once there is room for it
+        """
+        self.__waiting += 1
+        self.__max_waiting = max(self.__max_waiting, self.__waiting)
+        try:
+            await self.__semaphore.acquire()
+        finally:
+            self.__waiting -= 1
+
+        self.__in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.__get_executor(), func, *args)
+        finally:
+            self.__in_flight -= 1
+            self.__completed += 1
+            self.__semaphore.release()
+
+    def __get_executor(self) -> Executor:
+        """
+        Returns the executor, creating the pool of threads if needed
+        """
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(
+                max_workers=self.__max_concurrency, thread_name_prefix="hasher"
+            )
+        return self.__executor
+
+
+# -----------------------------------------------------------------------------#
+# Functions
+# -----------------------------------------------------------------------------#
+__HASHER: Optional[AsyncHasher] = None
+
+
+def get_hasher() -> AsyncHasher:
+    """
+    Returns the hasher shared by the app, creating it on first use
+    """
+    global __HASHER
+    if __HASHER is None:
+        __HASHER = AsyncHasher()
+    return __HASHER
+
+
+def calibrate(
+    target_ms: float,
+    samples: int = 3,
+    min_rounds: int = MIN_BCRYPT_ROUNDS,
+    max_rounds: int = 16,
+) -> HashCalibration:
+    """
+    Measures the latency of a bcrypt hash on this host for increasing rounds
+    and recommends the rounds for the target latency. The measure stops at
+    the first rounds over the target.
+
+    Args:
+        target_ms (float): Target latency of a hash, in milliseconds
+        samples (int): Number of hashes measured per rounds. The median is kept.
+        min_rounds (int): First rounds measured
+        max_rounds (int): Last rounds measured
+
+    Returns:
+        HashCalibration
+    """
+    timings: dict[int, float] = {}
+    recommended = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        context = create_context(rounds)
+        durations = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            context.hash("calibration-password")
+            durations.append((time.perf_counter() - start) * 1000)
+
+        timings[rounds] = round(statistics.median(durations), 2)
+        if timings[rounds] > target_ms:
+            break
+        recommended = rounds
+
+    return HashCalibration(
+        target_ms=target_ms, recommended_rounds=recommended, timings_ms=timings
+    )
+
+
+def main() -> None:
+    """
+    Prints the hashing latency per rounds and the recommended rounds
+    """
+    parser = argparse.ArgumentParser(
+        description="Recommends bcrypt rounds for a target hashing latency"
+    )
+    parser.add_argument(
+        "--target-ms", type=float, default=250, help="Target latency of a hash"
+    )
+    parser.add_argument(
+        "--samples", type=int, default=3, help="Hashes measured per rounds"
+    )
+    parser.add_argument(
+        "--max-rounds", type=int, default=16, help="Last rounds measured"
+    )
+    args = parser.parse_args()
+
+    result = calibrate(args.target_ms, samples=args.samples, max_rounds=args.max_rounds)
+    for rounds, duration in result.timings_ms.items():
+        print(f"rounds={rounds:>2}  {duration:>9.2f} ms")
+    print(f"HASHER_BCRYPT_ROUNDS={result.recommended_rounds}")
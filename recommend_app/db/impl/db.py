@@ -13,38 +13,63 @@ Environment Variables:
 - `DB_URL`: MongoDB connection URI with placeholders for user credentials.
 - `DB_USER_ID`: MongoDB username for authentication.
 - `DB_PASSWORD`: MongoDB password for authentication.
-- `DB_SERVERSELECTIONTIMEOUT`: (Optional) Timeout for MongoDB server selection
-                               in milliseconds.
+- `DB_SERVERSELECTIONTIMEOUT`, `DB_MAX_POOL_SIZE`, `DB_MIN_POOL_SIZE`...:
+  (Optional) Settings of the client. See `db.impl.settings`
+- `DB_READ_MAX_STALENESS_SECONDS`: (Optional) Max staleness of the reads
+  routed to the secondaries. See `db.impl.settings`
+- `DB_QUERY_PLAN_CHECK`: (Optional) `off`, `warn` or `strict`. See `db.impl.indexes`
 
 Dependencies:
 - `motor`: Async client for MongoDB
 """
 
 # Builtin imports
+import asyncio
 import os
-from typing import TYPE_CHECKING, Optional, Any
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Optional, Any, Sequence, NoReturn
 
 # Project specific imports
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo.errors import OperationFailure, DuplicateKeyError, InvalidOperation
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.read_preferences import SecondaryPreferred, _ServerMode
+from pymongo.errors import (
+    OperationFailure,
+    DuplicateKeyError,
+    InvalidOperation,
+    BulkWriteError,
+    PyMongoError,
+)
 from pydantic import ValidationError
 import beanie
 
 # Local imports
 from ..abstracts.abstract_db import AbstractRecommendDB
+from ..constants import JOBS_COLLECTION, SCRAPES_COLLECTION
 from ..exceptions import (
     RecommendDBConnectionError,
     RecommendDBModelCreationError,
     RecommendAppDbError,
     RecommendDBModelNotFound,
 )
-from ..types import RecommendModelType
+from ..types import JobStatus, RecommendModelType, ReadPreference
 from .documents.user import UserDocument
 from .documents.board import BoardDocument
 from .documents.card import CardDocument
+from .documents.base import get_projection, model_from_raw
+from .indexes import verify_query_plans
+from .settings import MotorClientSettings
+from ..models.user import UserInDb
+from ..models.board import BoardInDb
+from ..models.card import CardInDb, NewCard
+from ..models.bulk import BulkAddFailure
+from ..models.job import EnrichmentJob, NewEnrichmentJob
+from ..models.page import CardPage, ScrapedFields
 
 if TYPE_CHECKING:
-    from motor.motor_asyncio import AsyncIOMotorDatabase
+    from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorCollection
     from .documents.base import AbstractRecommendDocument
     from ..models.bases import (
         BaseNewRecommendModel,
@@ -58,21 +83,32 @@ class RecommendDB(AbstractRecommendDB):
     An asyncronous recommendDB using MongoDB and Motor client
     """
 
-    def __init__(self, dbname: str):
+    def __init__(self, dbname: str, settings: Optional[MotorClientSettings] = None):
         """
         Initialize the RecommendDB with MongoDB implementation.
 
         Args:
             dbname (str): Name of the database to be created/queried.
+            settings (MotorClientSettings): Settings of the client. Optional,
+                loaded from the environment when the db connects if not given.
         """
         super().__init__()
         self.__dbname = dbname
+        self.__settings = settings
 
         self.__db: Optional["AsyncIOMotorDatabase"] = None
         # Beanie Documents
         self.__documents: dict[
             RecommendModelType, type["AbstractRecommendDocument"]
         ] = {}
+        # Models the documents are read into
+        self.__models: dict[RecommendModelType, type["BaseRecommendModel"]] = {}
+        # Mode of the reads routed to the secondaries
+        self.__secondary_preferred: _ServerMode = SecondaryPreferred()
+        # Cards scrapped from the pages, see `get_scrape`
+        self.__scrapes: Optional["AsyncIOMotorCollection"] = None
+        # Queue of the enrichment jobs, see `claim_job`
+        self.__jobs: Optional["AsyncIOMotorCollection"] = None
 
     ###########################################################################
     # Properties
@@ -103,6 +139,8 @@ class RecommendDB(AbstractRecommendDB):
 
         Raises:
             RecommendDBConnectionError: If the connection to the database fails.
+            RecommendDBQueryPlanError: If a canonical query does a collection
+                scan and the check is set to strict.
         """
         try:
             db_url = os.environ["DB_URL"]
@@ -114,21 +152,25 @@ class RecommendDB(AbstractRecommendDB):
         url = db_url.format(USER=db_user_id, PWD=db_pwd)
 
         # Create a new client and connect to the server
-        # Check if custom timeout is set.
-        serverSelectionTimeoutMS = os.getenv("DB_SERVERSELECTIONTIMEOUT")
-        if serverSelectionTimeoutMS is not None:
-            client: AsyncIOMotorClient = AsyncIOMotorClient(
-                url, serverSelectionTimeoutMS=int(serverSelectionTimeoutMS)
-            )
-        else:
-            client = AsyncIOMotorClient(url)
+        settings = self.__settings or MotorClientSettings.from_env()
+        client: AsyncIOMotorClient = AsyncIOMotorClient(
+            url, **settings.to_client_kwargs()
+        )
 
         self.__db = client.get_database(self.__dbname)
+        if settings.max_staleness_seconds:
+            self.__secondary_preferred = SecondaryPreferred(
+                max_staleness=settings.max_staleness_seconds
+            )
 
         self.__documents[RecommendModelType.USER] = UserDocument
         self.__documents[RecommendModelType.BOARD] = BoardDocument
         self.__documents[RecommendModelType.CARD] = CardDocument
 
+        self.__models[RecommendModelType.USER] = UserInDb
+        self.__models[RecommendModelType.BOARD] = BoardInDb
+        self.__models[RecommendModelType.CARD] = CardInDb
+
         # Init beanie
         await beanie.init_beanie(
             database=self.__db, document_models=list(self.__documents.values())
@@ -137,6 +179,25 @@ class RecommendDB(AbstractRecommendDB):
         # Check the connection
         await self.ping()
 
+        # The scrapes are dropped by the server once they expire
+        self.__scrapes = self.__db.get_collection(SCRAPES_COLLECTION)
+        await self.__scrapes.create_index("expires_at", expireAfterSeconds=0)
+
+        # claim_job: the pending jobs due and the leases expired
+        self.__jobs = self.__db.get_collection(JOBS_COLLECTION)
+        await self.__jobs.create_index([("status", ASCENDING), ("run_at", ASCENDING)])
+        await self.__jobs.create_index(
+            [("status", ASCENDING), ("lease_until", ASCENDING)]
+        )
+
+        # Open the minimum number of connections now, rather than on the first
+        # requests.
+        if settings.min_pool_size:
+            await self.prewarm(settings.min_pool_size)
+
+        # Make sure the queries we issue are backed by the indexes
+        await verify_query_plans(self.__documents)
+
         return True
 
     async def ping(self) -> bool:
@@ -156,6 +217,27 @@ class RecommendDB(AbstractRecommendDB):
 
         return True
 
+    async def prewarm(self, connections: int) -> None:
+        """
+        Opens connections in the pool by running that many pings concurrently.
+        Each ping in flight needs its own connection, so the pool grows to the
+        given size and the handshakes are done before the app serves requests.
+
+        Args:
+            connections (int): Number of connections to open
+
+        Raises:
+            RecommendDBConnectionError
+        """
+        if self.__db is None:
+            return
+
+        admin = self.__db.client.admin
+        try:
+            await asyncio.gather(*(admin.command("ping") for _ in range(connections)))
+        except (OperationFailure, InvalidOperation) as err:
+            raise RecommendDBConnectionError("Failed to connect to the DB") from err
+
     async def disconnect(self, clear_db: bool = False) -> bool:
         """
         Removes the connection to the database.
@@ -205,8 +287,83 @@ class RecommendDB(AbstractRecommendDB):
 
         return document.to_model()
 
+    async def add_many(
+        self, models: Sequence["BaseNewRecommendModel"]
+    ) -> tuple[list["BaseRecommendModel"], list[BulkAddFailure]]:
+        """
+        Add a list of new models of the same type to the database.
+
+        All the documents are written with one unordered `insert_many`, so a
+        document rejected by the server (e.g. a duplicate key) doesn't stop
+        the rest of the batch. The ids are generated here, which lets us build
+        the created models without reading them back.
+
+        Args:
+            models (Sequence[BaseNewRecommendModel]): Models to be added.
+
+        Returns:
+            tuple: The newly created models and the failures. Every failure
+                points to the index of its model in `models`.
+
+        Raises:
+            `RecommendAppDbError` if the models are not of the same type.
+        """
+        if not models:
+            return [], []
+
+        model_type = models[0].model_type
+        if any(model.model_type != model_type for model in models):
+            raise RecommendAppDbError("Models of a bulk add must be of the same type")
+
+        doc_inst = self.__get_doc_inst(model_type)
+        model_cls = self.__models[model_type]
+
+        failures: list[BulkAddFailure] = []
+        raws: list[dict[str, Any]] = []
+        # Index of each raw document in the models list
+        positions: list[int] = []
+        for index, model in enumerate(models):
+            try:
+                document = doc_inst.from_model(model)
+            except ValidationError as err:
+                failures.append(BulkAddFailure(index=index, error=str(err)))
+                continue
+
+            raw = document.model_dump(exclude={"id", "revision_id"})
+            raw["_id"] = ObjectId()
+            raws.append(raw)
+            positions.append(index)
+
+        rejected: set[int] = set()
+        if raws:
+            try:
+                await doc_inst.get_motor_collection().insert_many(raws, ordered=False)
+            except BulkWriteError as err:
+                for write_error in err.details.get("writeErrors", []):
+                    rejected.add(write_error["index"])
+                    if write_error.get("code") == 11000:
+                        error = f"{model_type.value} already exists"
+                    else:
+                        error = write_error.get("errmsg", "Failed to add")
+                    failures.append(
+                        BulkAddFailure(
+                            index=positions[write_error["index"]], error=error
+                        )
+                    )
+
+        created = [
+            model_from_raw(model_cls, raw)
+            for i, raw in enumerate(raws)
+            if i not in rejected
+        ]
+        failures.sort(key=lambda failure: failure.index)
+        return created, failures
+
     async def get(
-        self, model_type: "RecommendModelType", attrs_dict: dict[str, str]
+        self,
+        model_type: "RecommendModelType",
+        attrs_dict: dict[str, Any],
+        read_preference: ReadPreference = ReadPreference.PRIMARY,
     ) -> "BaseRecommendModel":
         """
         Retrieve a single model from the database that matches the given
@@ -217,6 +374,8 @@ class RecommendDB(AbstractRecommendDB):
                                              (e.g., User, Board, Card).
             attrs_dict (dict[str, Any]): A dictionary of attributes to filter
                                          the model by.
+            read_preference (ReadPreference): Members of the replica set the
+                read can be served by. Primary by default.
 
         Returns:
             BaseRecommendModel: The model instance that matches the given criteria.
@@ -226,52 +385,191 @@ class RecommendDB(AbstractRecommendDB):
             `RecommendDBModelNotFound` - The class that implements this
             method must throw this exception if the model is not found.
         """
-        result = await self.__get_document(model_type, attrs_dict)
-        return result.to_model()
+        doc_inst = self.__get_doc_inst(model_type)
+        model_cls = self.__models[model_type]
+
+        query: dict[str, Any] = dict(attrs_dict)
+        if "id" in query:
+            try:
+                query["_id"] = ObjectId(query.pop("id"))
+            except (InvalidId, TypeError):
+                raise RecommendDBModelNotFound(
+                    f"No {model_type.value} found for {attrs_dict}"
+                )
+
+        collection = self.__get_collection(doc_inst, read_preference)
+        raw = await collection.find_one(query, get_projection(model_cls))
+        if not raw:
+            raise RecommendDBModelNotFound(
+                f"No {model_type.value} found for {attrs_dict}"
+            )
+
+        return model_from_raw(model_cls, raw)
 
     async def get_all(
-        self, model_type: "RecommendModelType", attrs_dict: dict[str, Any]
+        self,
+        model_type: "RecommendModelType",
+        attrs_dict: dict[str, Any],
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        read_preference: ReadPreference = ReadPreference.PRIMARY,
     ) -> list["BaseRecommendModel"]:
         """
         Retrieves all documents matching criteria from the specified MongoDB
         collection.
 
         This method fetches multiple documents from the appropriate collection
-        based on the model type and the provided criteria.
+        based on the model type and the provided criteria. The raw documents
+        are read straight into the models, see `model_from_raw`. Documents are
+        sorted by `_id`, which makes `after` a keyset cursor: the next page
+        starts right after the last id of the previous one, without skipping
+        over the earlier documents.
 
         Args:
             model_type (RecommendModelType): The type of model to retrieve.
             attrs_dict (dict[str, str]): A dictionary of attributes to match
                 the documents.
+            limit (int): Maximum number of documents to return. Optional.
+            after (str): Id of the last document of the previous page. Optional.
+            read_preference (ReadPreference): Members of the replica set the
+                read can be served by. Primary by default.
 
         Returns:
             list[BaseRecommendModel]: A list of retrieved model instances.
+
+        Raises:
+            `RecommendAppDbError` if the cursor is not a valid id.
         """
         doc_inst = self.__get_doc_inst(model_type)
+        model_cls = self.__models[model_type]
+
+        query = dict(attrs_dict)
+        if after is not None:
+            query["_id"] = {"$gt": self.__to_object_id(after)}
+
+        cursor = (
+            self.__get_collection(doc_inst, read_preference)
+            .find(query, get_projection(model_cls))
+            .sort([("_id", ASCENDING)])
+        )
+        if limit is not None:
+            cursor = cursor.limit(limit)
+
+        return [model_from_raw(model_cls, raw) async for raw in cursor]
+
+    async def get_board_with_cards(
+        self,
+        board_id: str,
+        owner_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        read_preference: ReadPreference = ReadPreference.PRIMARY,
+    ) -> tuple["BaseRecommendModel", list["BaseRecommendModel"]]:
+        """
+        Retrieve a board along with a page of its cards in a single query.
 
-        # TODO: Do Pagination (MongoDb Aggregation)
-        docs = await doc_inst.find(attrs_dict).to_list()
-        return [doc_inst.to_model(doc) for doc in docs]
+        Runs one aggregation on the boards: a `$match` that also enforces the
+        privacy rule (public, or private and owned by owner_id), followed by a
+        `$lookup` of the cards. The paging of the cards happens inside the
+        lookup, on the (board_id, _id) index, same as `get_all`.
+
+        Args:
+            board_id (str): Id of the board
+            owner_id (str): Id of the user requesting the board. Optional.
+            limit (int): Maximum number of cards to return. Optional.
+            after (str): Cursor. Id of the last card of the previous page.
+                Optional.
+            read_preference (ReadPreference): Members of the replica set the
+                read can be served by. The cards are read from the same
+                member as the board. Primary by default.
+
+        Returns:
+            tuple: The board and its cards, ordered by their id.
+
+        Raises:
+            `RecommendDBModelNotFound` if there is no such board visible to
+                the owner_id.
+            `RecommendAppDbError` if the cursor is not a valid id.
+        """
+        board_doc = self.__get_doc_inst(RecommendModelType.BOARD)
+        card_doc = self.__get_doc_inst(RecommendModelType.CARD)
+        board_cls = self.__models[RecommendModelType.BOARD]
+        card_cls = self.__models[RecommendModelType.CARD]
+
+        try:
+            board_oid = ObjectId(board_id)
+        except (InvalidId, TypeError):
+            raise RecommendDBModelNotFound(f"No board found for {board_id}")
+
+        visible_to: list[dict[str, Any]] = [{"private": False}]
+        if owner_id:
+            visible_to.append({"owner_id": owner_id})
+
+        cards_pipeline: list[dict[str, Any]] = []
+        if after is not None:
+            after_oid = self.__to_object_id(after)
+            cards_pipeline.append({"$match": {"_id": {"$gt": after_oid}}})
+        cards_pipeline.append({"$sort": {"_id": ASCENDING}})
+        if limit is not None:
+            cards_pipeline.append({"$limit": limit})
+        cards_pipeline.append({"$project": get_projection(card_cls)})
+
+        pipeline: list[dict[str, Any]] = [
+            {"$match": {"_id": board_oid, "$or": visible_to}},
+            {"$project": get_projection(board_cls)},
+            # Cards refer to their board with the string form of its id
+            {"$addFields": {"_board_id": {"$toString": "$_id"}}},
+            {
+                "$lookup": {
+                    "from": card_doc.get_motor_collection().name,
+                    "localField": "_board_id",
+                    "foreignField": "board_id",
+                    "pipeline": cards_pipeline,
+                    "as": "_cards",
+                }
+            },
+        ]
+
+        collection = self.__get_collection(board_doc, read_preference)
+        raws = await collection.aggregate(pipeline).to_list(1)
+        if not raws:
+            raise RecommendDBModelNotFound(f"No board found for {board_id}")
+
+        raw = raws[0]
+        cards = [model_from_raw(card_cls, card) for card in raw.pop("_cards")]
+        return model_from_raw(board_cls, raw), cards
 
     async def update(
-        self, obj_id: str, update_model: "BaseUpdateRecommendModel"
+        self,
+        obj_id: str,
+        update_model: "BaseUpdateRecommendModel",
+        attrs_dict: Optional[dict[str, Any]] = None,
     ) -> "BaseRecommendModel":
         """
         Updates the model in the database with the provided data. Only the non
         None data is updated.
 
+        The model is matched and updated with a single `find_one_and_update`.
+        The extra attributes (e.g. the owner_id) are part of the filter, so
+        that the check and the write happen in the same round trip.
+
         Args:
             obj_id (str): Id of the object to be updated.
             update_model (BaseUpdateRecommendModel): Data to be updated.
+            attrs_dict (dict[str, Any]): Attributes the model must also match
+                to be updated. Optional.
 
         Returns:
             BaseRecommendModel: The model instance that matches the given criteria.
 
         Raises:
-            `RecommendDBModelNotFound` if the board is not found
-            `RecommendAppDbError` if there is an issue in updating the model
+            `RecommendDBModelNotFound` if the model is not found
+            `RecommendAppDbError` if the model doesn't match the attrs_dict
         """
-        doc = await self.__get_document(update_model.model_type, {"id": obj_id})
+        model_type = update_model.model_type
+        doc_inst = self.__get_doc_inst(model_type)
+        model_cls = self.__models[model_type]
+        query = self.__get_write_query(model_type, obj_id, attrs_dict)
 
         # Filter out non-None values
         update_data = {
@@ -279,67 +577,516 @@ class RecommendDB(AbstractRecommendDB):
             for key, value in update_model.model_dump().items()
             if value is not None
         }
-        result = await doc.set(update_data)
-        return result.to_model()
 
-    async def remove(self, model_type: "RecommendModelType", obj_id: str) -> bool:
+        collection = doc_inst.get_motor_collection()
+        if update_data:
+            raw = await collection.find_one_and_update(
+                query,
+                {"$set": update_data},
+                projection=get_projection(model_cls),
+                return_document=ReturnDocument.AFTER,
+            )
+        else:
+            raw = await collection.find_one(query, get_projection(model_cls))
+
+        if not raw:
+            await self.__raise_write_error(model_type, query, attrs_dict)
+
+        return model_from_raw(model_cls, raw)
+
+    async def remove(
+        self,
+        model_type: "RecommendModelType",
+        obj_id: str,
+        attrs_dict: Optional[dict[str, Any]] = None,
+    ) -> bool:
         """
-        Remove a document from the database.
+        Remove a document from the database with a single `delete_one`.
 
         Args:
             model_type (RecommendModelType): The type of the model to delete
                                              (e.g., User, Board, Card).
             obj_id (str): Id of the object to be deleted.
+            attrs_dict (dict[str, Any]): Attributes the model must also match
+                to be removed. Optional.
 
         Returns:
-            bool: True if the document was successfully removed, False otherwise.
+            bool: True if the document was successfully removed.
+
+        Raises:
+            `RecommendDBModelNotFound` if the model is not found
+            `RecommendAppDbError` if the model doesn't match the attrs_dict
         """
-        doc = await self.__get_document(model_type, {"id": obj_id})
-        result = await doc.delete()
-        return result.deleted_count == 1 if result else False
+        doc_inst = self.__get_doc_inst(model_type)
+        query = self.__get_write_query(model_type, obj_id, attrs_dict)
+
+        result = await doc_inst.get_motor_collection().delete_one(query)
+        if result.deleted_count != 1:
+            await self.__raise_write_error(model_type, query, attrs_dict)
+
+        return True
 
     ###########################################################################
-    # Methods: privates
+    # Methods: Scrapes
     ###########################################################################
-    async def __get_document(
-        self, model_type: "RecommendModelType", attrs_dict: dict[str, str]
-    ) -> "AbstractRecommendDocument":
+    async def get_scrape(self, key: str) -> Optional[NewCard]:
         """
-        Retrieve a single document from the database that matches the given
-        criteria.
+        Returns the card scrapped from a page.
+
+        The TTL monitor of the server only runs once a minute, so the expired
+        scrapes are filtered out here too.
 
         Args:
-            model_type (RecommendModelType): The type of the model to retrieve
-                                             (e.g., User, Board, Card).
-            attrs_dict (dict[str, Any]): A dictionary of attributes to filter
-                                         the model by.
+            key (str): Normalized url of the page
 
         Returns:
-            AbstractRecommendDocument
+            The card. None if there is none or if it has expired.
 
         Raises:
-            `RecommendAppDbError` - General db error
-            `RecommendDBModelNotFound` - The class that implements this
-            method must throw this exception if the model is not found.
+            `RecommendAppDbError` if the read fails
         """
-        doc_inst = self.__get_doc_inst(model_type)
+        if self.__scrapes is None:
+            return None
+
+        query = {"_id": key, "expires_at": {"$gt": datetime.now(timezone.utc)}}
+        try:
+            raw = await self.__scrapes.find_one(query, {"card": 1})
+        except PyMongoError as err:
+            raise RecommendAppDbError(f"Failed to read the scrape of {key}") from err
+
+        if not raw:
+            return None
+        return NewCard.model_validate(raw["card"])
+
+    async def set_scrape(self, key: str, card: NewCard, ttl: float) -> None:
+        """
+        Stores the card scrapped from a page, replacing the previous one.
+
+        Args:
+            key (str): Normalized url of the page
+            card (NewCard): Card scrapped from the page
+            ttl (float): Seconds the card stays valid
+
+        Raises:
+            `RecommendAppDbError` if the write fails
+        """
+        if self.__scrapes is None:
+            return
+
+        now = datetime.now(timezone.utc)
+        scrape = {
+            "card": card.model_dump(),
+            "scraped_at": now,
+            "expires_at": now + timedelta(seconds=ttl),
+        }
+        try:
+            await self.__scrapes.replace_one({"_id": key}, scrape, upsert=True)
+        except PyMongoError as err:
+            raise RecommendAppDbError(f"Failed to store the scrape of {key}") from err
+
+    ###########################################################################
+    # Methods: Enrichment jobs
+    ###########################################################################
+    async def add_jobs(self, jobs: Sequence[NewEnrichmentJob]) -> int:
+        """
+        Queues the jobs, to be run right away, with a single `insert_many`.
+
+        Args:
+            jobs (Sequence[NewEnrichmentJob]): Jobs to queue
+
+        Returns:
+            int: Number of jobs queued
+
+        Raises:
+            `RecommendAppDbError` if the write fails
+        """
+        if self.__jobs is None or not jobs:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        raws = [
+            {
+                **job.model_dump(),
+                "status": JobStatus.PENDING.value,
+                "attempts": 0,
+                "run_at": now,
+            }
+            for job in jobs
+        ]
+        try:
+            result = await self.__jobs.insert_many(raws)
+        except PyMongoError as err:
+            raise RecommendAppDbError("Failed to queue the enrichment jobs") from err
+
+        return len(result.inserted_ids)
+
+    async def claim_job(
+        self,
+        worker_id: str,
+        lease_seconds: float,
+        max_attempts: Optional[int] = None,
+    ) -> Optional[EnrichmentJob]:
+        """
+        Leases the next job due to the worker, oldest first. The job is
+        matched and leased with a single `find_one_and_update`, so two workers
+        can't claim the same job. The jobs whose lease expired after their
+        last attempt are left dead first.
+
+        Args:
+            worker_id (str): Id of the worker
+            lease_seconds (float): Seconds the job is leased for
+            max_attempts (int): Attempts before a job is dead. Optional.
+
+        Returns:
+            The job. None if no job is due.
+
+        Raises:
+            `RecommendAppDbError` if the write fails
+        """
+        if self.__jobs is None:
+            return None
 
-        if "id" in attrs_dict.keys():
+        now = datetime.now(timezone.utc)
+        expired: dict[str, Any] = {
+            "status": JobStatus.LEASED.value,
+            "lease_until": {"$lte": now},
+        }
+        if max_attempts is not None:
             try:
-                result = await doc_inst.get(attrs_dict["id"])
-            except ValidationError:
-                raise RecommendDBModelNotFound(
-                    f"No {model_type.value} found for {attrs_dict}"
+                await self.__jobs.update_many(
+                    {**expired, "attempts": {"$gte": max_attempts}},
+                    {
+                        "$set": {
+                            "status": JobStatus.DEAD.value,
+                            "lease_until": None,
+                            "worker_id": None,
+                            "last_error": "The lease of the last attempt expired",
+                        }
+                    },
                 )
-        else:
-            result = await doc_inst.find_one(attrs_dict)
+            except PyMongoError as err:
+                raise RecommendAppDbError(
+                    "Failed to give up on the abandoned enrichment jobs"
+                ) from err
+            expired["attempts"] = {"$lt": max_attempts}
+
+        query = {
+            "$or": [
+                {"status": JobStatus.PENDING.value, "run_at": {"$lte": now}},
+                expired,
+            ]
+        }
+        lease = {
+            "$set": {
+                "status": JobStatus.LEASED.value,
+                "lease_until": now + timedelta(seconds=lease_seconds),
+                "worker_id": worker_id,
+            },
+            "$inc": {"attempts": 1},
+        }
+        try:
+            raw = await self.__jobs.find_one_and_update(
+                query,
+                lease,
+                sort=[("run_at", ASCENDING)],
+                return_document=ReturnDocument.AFTER,
+            )
+        except PyMongoError as err:
+            raise RecommendAppDbError("Failed to claim an enrichment job") from err
 
-        if not result:
-            raise RecommendDBModelNotFound(
-                f"No {model_type.value} found for {attrs_dict}"
+        if not raw:
+            return None
+        raw["id"] = str(raw.pop("_id"))
+        return EnrichmentJob.model_validate(raw)
+
+    async def complete_job(self, job_id: str, worker_id: str) -> bool:
+        """
+        Removes a job that is done, if the worker still holds its lease.
+
+        Args:
+            job_id (str): Id of the job
+            worker_id (str): Id of the worker
+
+        Returns:
+            bool: False if the worker lost the lease of the job.
+
+        Raises:
+            `RecommendAppDbError` if the write fails
+        """
+        if self.__jobs is None:
+            return False
+
+        try:
+            result = await self.__jobs.delete_one(
+                self.__get_lease_query(job_id, worker_id)
+            )
+        except PyMongoError as err:
+            raise RecommendAppDbError(f"Failed to complete the job {job_id}") from err
+
+        return result.deleted_count == 1
+
+    async def fail_job(
+        self,
+        job_id: str,
+        worker_id: str,
+        error: str,
+        retry_at: Optional[datetime] = None,
+        count_attempt: bool = True,
+    ) -> bool:
+        """
+        Releases a job that failed, if the worker still holds its lease.
+
+        Args:
+            job_id (str): Id of the job
+            worker_id (str): Id of the worker
+            error (str): Why the job failed
+            retry_at (datetime): When the job is retried. Optional, the job is
+                dead if not given.
+            count_attempt (bool): False to give the attempt back to the job.
+
+        Returns:
+            bool: False if the worker lost the lease of the job.
+
+        Raises:
+            `RecommendAppDbError` if the write fails
+        """
+        if self.__jobs is None:
+            return False
+
+        update: dict[str, Any] = {
+            "status": JobStatus.DEAD.value,
+            "lease_until": None,
+            "worker_id": None,
+            "last_error": error,
+        }
+        if retry_at is not None:
+            update["status"] = JobStatus.PENDING.value
+            update["run_at"] = retry_at
+
+        operations: dict[str, Any] = {"$set": update}
+        if not count_attempt:
+            operations["$inc"] = {"attempts": -1}
+        try:
+            result = await self.__jobs.update_one(
+                self.__get_lease_query(job_id, worker_id), operations
+            )
+        except PyMongoError as err:
+            raise RecommendAppDbError(f"Failed to release the job {job_id}") from err
+
+        return result.modified_count == 1
+
+    ###########################################################################
+    # Methods: Card pages
+    ###########################################################################
+    async def get_stale_pages(self, before: datetime, limit: int) -> list[CardPage]:
+        """
+        Returns the pages of the cards last fetched before the given date,
+        oldest first. The validators are kept in the `page` field of the
+        cards, the cards never checked have none and are matched on the date
+        of their id.
+
+        Args:
+            before (datetime): Date the pages are stale before
+            limit (int): Maximum number of pages to return
+
+        Returns:
+            list[CardPage]
+
+        Raises:
+            `RecommendAppDbError` if the read fails
+        """
+        query = {
+            "$or": [
+                {"page.scraped_at": {"$lt": before}},
+                {
+                    "page.scraped_at": None,
+                    "_id": {"$lt": ObjectId.from_datetime(before)},
+                },
+            ]
+        }
+        projection = {"url": 1, "title": 1, "description": 1, "thumbnail": 1, "page": 1}
+        doc_inst = self.__get_doc_inst(RecommendModelType.CARD)
+        try:
+            raws = (
+                await doc_inst.get_motor_collection()
+                .find(query, projection)
+                .sort([("page.scraped_at", ASCENDING), ("_id", ASCENDING)])
+                .limit(limit)
+                .to_list(limit)
             )
+        except PyMongoError as err:
+            raise RecommendAppDbError("Failed to read the stale pages") from err
+
+        return [
+            CardPage(
+                card_id=str(raw["_id"]),
+                url=raw["url"],
+                title=raw.get("title"),
+                description=raw.get("description"),
+                thumbnail=raw.get("thumbnail"),
+                **(raw.get("page") or {}),
+            )
+            for raw in raws
+        ]
+
+    async def set_page_validators(
+        self,
+        card_id: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        scraped_at: datetime,
+        scraped: Optional[ScrapedFields] = None,
+    ) -> bool:
+        """
+        Stores the validators in the `page` field of the card, and the data
+        of the page in its `scraped` field.
+
+        Args:
+            card_id (str): Id of the card
+            etag (str): ETag of the page. Optional.
+            last_modified (str): Last-Modified date of the page. Optional.
+            scraped_at (datetime): When the page was fetched
+            scraped (ScrapedFields): Data of the page. Optional, the data of
+                the last scrap is kept if not given.
+
+        Returns:
+            bool: False if the card doesn't exist
 
-        return result
+        Raises:
+            `RecommendAppDbError` if the write fails
+        """
+        doc_inst = self.__get_doc_inst(RecommendModelType.CARD)
+        page: dict[str, Any] = {
+            "page.etag": etag,
+            "page.last_modified": last_modified,
+            "page.scraped_at": scraped_at,
+        }
+        if scraped is not None:
+            page["page.scraped"] = scraped.model_dump()
+        try:
+            result = await doc_inst.get_motor_collection().update_one(
+                {"_id": self.__to_object_id(card_id)}, {"$set": page}
+            )
+        except PyMongoError as err:
+            raise RecommendAppDbError(
+                f"Failed to store the page of the card {card_id}"
+            ) from err
+
+        return result.matched_count == 1
+
+    ###########################################################################
+    # Methods: privates
+    ###########################################################################
+    def __get_lease_query(self, job_id: str, worker_id: str) -> dict[str, Any]:
+        """
+        Filter of a job leased by the worker
+        """
+        return {
+            "_id": self.__to_object_id(job_id),
+            "status": JobStatus.LEASED.value,
+            "worker_id": worker_id,
+        }
+
+    @staticmethod
+    def __get_write_query(
+        model_type: "RecommendModelType",
+        obj_id: str,
+        attrs_dict: Optional[dict[str, Any]],
+    ) -> dict[str, Any]:
+        """
+        Filter of a single document write.
+
+        Args:
+            model_type (RecommendModelType): The type of the model to write
+            obj_id (str): Id of the object to be written.
+            attrs_dict (dict[str, Any]): Attributes the model must also match.
+
+        Returns:
+            dict: Query matching the id and the attributes
+
+        Raises:
+            `RecommendDBModelNotFound` if the id is not a valid ObjectId
+        """
+        try:
+            query: dict[str, Any] = {"_id": ObjectId(obj_id)}
+        except (InvalidId, TypeError):
+            raise RecommendDBModelNotFound(f"No {model_type.value} found for {obj_id}")
+
+        if attrs_dict:
+            query.update(attrs_dict)
+        return query
+
+    async def __raise_write_error(
+        self,
+        model_type: "RecommendModelType",
+        query: dict[str, Any],
+        attrs_dict: Optional[dict[str, Any]],
+    ) -> NoReturn:
+        """
+        Called when a write matched no document. Finds out if the document
+        doesn't exist or if it didn't match the attrs_dict. The lookup is only
+        done on this failure path.
+
+        Raises:
+            `RecommendDBModelNotFound` if the model is not found
+            `RecommendAppDbError` if the model doesn't match the attrs_dict
+        """
+        obj_id = query["_id"]
+        if attrs_dict:
+            doc_inst = self.__get_doc_inst(model_type)
+            if await doc_inst.get_motor_collection().find_one(
+                {"_id": obj_id}, {"_id": 1}
+            ):
+                raise RecommendAppDbError(
+                    f"{model_type.value} {obj_id} doesn't match {attrs_dict}"
+                )
+
+        raise RecommendDBModelNotFound(f"No {model_type.value} found for {obj_id}")
+
+    def __get_collection(
+        self,
+        doc_inst: type["AbstractRecommendDocument"],
+        read_preference: ReadPreference,
+    ) -> "AsyncIOMotorCollection":
+        """
+        Collection of the document, reading from the members matching the read
+        preference.
+
+        Args:
+            doc_inst (AbstractRecommendDocument): Document of the collection
+            read_preference (ReadPreference): Members the reads can be served
+                by.
+
+        Returns:
+            AsyncIOMotorCollection
+        """
+        collection = doc_inst.get_motor_collection()
+        if read_preference == ReadPreference.SECONDARY_PREFERRED:
+            # The stub of motor types the mode as pymongo's ReadPreference
+            # constants instead of a _ServerMode
+            return collection.with_options(
+                read_preference=self.__secondary_preferred  # type: ignore[arg-type]
+            )
+        return collection
+
+    @staticmethod
+    def __to_object_id(obj_id: str) -> ObjectId:
+        """
+        Convert the string id to a bson ObjectId
+
+        Args:
+            obj_id (str): Id of the object
+
+        Returns:
+            ObjectId
+
+        Raises:
+            `RecommendAppDbError` if the id is not a valid ObjectId
+        """
+        try:
+            return ObjectId(obj_id)
+        except (InvalidId, TypeError) as err:
+            raise RecommendAppDbError(f"{obj_id} is not a valid id") from err
 
     def __get_doc_inst(
         self, model_type: "RecommendModelType"
@@ -3,7 +3,7 @@ Base Document
 """
 
 # Builtin imports
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, Mapping, cast
 from abc import ABC, abstractmethod
 
 # Project specific imports
@@ -58,3 +58,44 @@ class AbstractRecommendDocument(ABC, Document):
                 return_dict[key] = value
 
         return cast("BaseRecommendModel", self.recommend_inDb_model_type(**return_dict))
+
+
+# -----------------------------------------------------------------------------#
+# Functions: Trusted read path
+# -----------------------------------------------------------------------------#
+
+
+def get_projection(model_cls: type["BaseRecommendModel"]) -> dict[str, int]:
+    """
+    Mongo projection that fetches only the fields of the given model.
+
+    Args:
+        model_cls (type[BaseRecommendModel]): Model the documents are read into
+
+    Returns:
+        dict[str, int]: Projection to be passed to find
+    """
+    return {key: 1 for key in model_cls.model_fields if key != "id"}
+
+
+def model_from_raw(
+    model_cls: type["BaseRecommendModel"], raw: Mapping[str, Any]
+) -> "BaseRecommendModel":
+    """
+    Raw mongo document to RecommendModel, without validation.
+
+    Only documents read back from our own collections must be passed in. They
+    were validated by their beanie document when they were written, so
+    validating them again on every read only costs CPU. `to_model` goes
+    through a beanie document, a model_dump and a full validation instead.
+
+    Args:
+        model_cls (type[BaseRecommendModel]): Model to create
+        raw (dict): Document as returned by motor
+
+    Returns:
+        BaseRecommendModel
+    """
+    fields = {key: raw[key] for key in model_cls.model_fields if key in raw}
+    fields["id"] = str(raw["_id"])
+    return model_cls.model_construct(**fields)
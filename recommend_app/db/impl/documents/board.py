@@ -1,5 +1,8 @@
 """ """
 
+# Project specific imports
+from pymongo import IndexModel, ASCENDING
+
 # Local imports
 from .base import AbstractRecommendDocument
 from ...models.board import ExtendedBoardAttributes, BoardInDb
@@ -15,6 +18,12 @@ class BoardDocument(ExtendedBoardAttributes, AbstractRecommendDocument):
     # -------------------------------------------------------------------------#
     class Settings:
         name = "boards"
+        indexes = [
+            # get_all_boards: filter on owner_id (and private), paginated on _id
+            IndexModel(
+                [("owner_id", ASCENDING), ("private", ASCENDING), ("_id", ASCENDING)]
+            ),
+        ]
 
     # -------------------------------------------------------------------------#
     # Properties
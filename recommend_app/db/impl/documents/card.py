@@ -1,7 +1,10 @@
 """ """
 
+# Builtin imports
+from typing import Optional
+
 # Project specific imports
-from pymongo import IndexModel
+from pymongo import IndexModel, ASCENDING
 
 # Local imports
 from .base import AbstractRecommendDocument
@@ -13,14 +16,31 @@ class CardDocument(FullCardAttributes, AbstractRecommendDocument):
     Beanie ODM for users
 
     [ISSUE]: https://github.com/BeanieODM/beanie/issues/1036
+
+    Args:
+        owner_id (str): Owner of the board the card belongs to. Stored with the
+            card so that its writes can be filtered on the owner. Cards added
+            before it was introduced don't have it.
+
+    The validators of the last fetch of the page of the card, and the data
+    the page had, are kept in a `page` field, written by
+    `RecommendDB.set_page_validators` only.
     """
 
+    owner_id: Optional[str] = None
+
     # -------------------------------------------------------------------------#
     # Settings
     # -------------------------------------------------------------------------#
     class Settings:
         name = "cards"
-        indexes = [IndexModel(["url", "board_id"], unique=True)]
+        indexes = [
+            IndexModel(["url", "board_id"], unique=True),
+            # get_all_cards: filter on board_id, paginated on _id
+            IndexModel([("board_id", ASCENDING), ("_id", ASCENDING)]),
+            # get_stale_pages: the pages fetched the longest ago first
+            IndexModel([("page.scraped_at", ASCENDING), ("_id", ASCENDING)]),
+        ]
 
     # -------------------------------------------------------------------------#
     # Properties
@@ -0,0 +1,190 @@
+"""
+Module: db.impl.indexes
+=======================
+
+Canonical queries issued by `RecommendDbClient` and the check that makes sure
+each of them is served by an index.
+
+The indexes themselves are declared on the beanie documents (`Settings.indexes`
+and `Indexed` fields) and created by `beanie.init_beanie`. This module runs
+`explain()` on every canonical query and reports the ones whose winning plan
+is a collection scan, so that a missing or dropped index shows up at startup
+rather than as a slow endpoint.
+
+Environment Variables:
+- `DB_QUERY_PLAN_CHECK`: (Optional) `off`, `warn` or `strict`. Defaults to
+                         `warn`, which logs the offending queries. `strict`
+                         refuses to connect.
+"""
+
+# Builtin imports
+import logging
+import os
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional
+
+# Project specific imports
+from pymongo import ASCENDING
+from pymongo.errors import OperationFailure
+
+# Local imports
+from ..exceptions import RecommendDBQueryPlanError
+from ..types import RecommendModelType
+
+if TYPE_CHECKING:
+    from .documents.base import AbstractRecommendDocument
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Modes
+CHECK_OFF = "off"
+CHECK_WARN = "warn"
+CHECK_STRICT = "strict"
+
+# -----------------------------------------------------------------------------#
+# Canonical queries
+# -----------------------------------------------------------------------------#
+
+
+class CanonicalQuery(NamedTuple):
+    """
+    Shape of a query issued by the client. The values in the filter are
+    placeholders, only the keys matter to the query planner.
+    """
+
+    model_type: RecommendModelType
+    filter: dict[str, Any]
+    sort: Optional[list[tuple[str, int]]] = None
+
+
+CANONICAL_QUERIES: list[CanonicalQuery] = [
+    # RecommendDbClient.get_user
+    CanonicalQuery(RecommendModelType.USER, {"email_address": ""}),
+    CanonicalQuery(RecommendModelType.USER, {"user_name": ""}),
+    # RecommendDbClient.get_all_boards
+    CanonicalQuery(RecommendModelType.BOARD, {"owner_id": ""}, [("_id", ASCENDING)]),
+    CanonicalQuery(
+        RecommendModelType.BOARD,
+        {"owner_id": "", "private": False},
+        [("_id", ASCENDING)],
+    ),
+    # RecommendDbClient.get_all_cards
+    CanonicalQuery(RecommendModelType.CARD, {"board_id": ""}, [("_id", ASCENDING)]),
+    # RecommendDbClient.get_stale_pages
+    CanonicalQuery(
+        RecommendModelType.CARD,
+        {"$or": [{"page.scraped_at": {"$lt": 0}}, {"page.scraped_at": None}]},
+        [("page.scraped_at", ASCENDING), ("_id", ASCENDING)],
+    ),
+]
+
+# -----------------------------------------------------------------------------#
+# Functions
+# -----------------------------------------------------------------------------#
+
+
+def get_check_mode() -> str:
+    """
+    Returns the query plan check mode set in the environment.
+    """
+    mode = os.getenv("DB_QUERY_PLAN_CHECK", CHECK_WARN).lower()
+    if mode not in (CHECK_OFF, CHECK_WARN, CHECK_STRICT):
+        LOGGER.warning("Unknown DB_QUERY_PLAN_CHECK value '%s', using 'warn'", mode)
+        return CHECK_WARN
+    return mode
+
+
+def has_collection_scan(plan: Any) -> bool:
+    """
+    Walks the plan returned by explain and checks if any of its stages is a
+    COLLSCAN. Works with both the classic and the slot based query engine
+    plans, as it doesn't rely on the exact nesting of the stages.
+
+    Args:
+        plan (Any): Winning plan (or a part of it)
+
+    Returns:
+        True if the plan scans the whole collection.
+    """
+    if isinstance(plan, dict):
+        if plan.get("stage") == "COLLSCAN":
+            return True
+        return any(has_collection_scan(value) for value in plan.values())
+    if isinstance(plan, list):
+        return any(has_collection_scan(value) for value in plan)
+    return False
+
+
+async def find_collection_scans(
+    documents: dict[RecommendModelType, type["AbstractRecommendDocument"]],
+    queries: Optional[list[CanonicalQuery]] = None,
+) -> list[CanonicalQuery]:
+    """
+    Explain every canonical query and collect the ones that are answered with
+    a collection scan.
+
+    Args:
+        documents (dict): Beanie documents, mapped by the model type.
+        queries (list[CanonicalQuery]): Queries to check. Defaults to
+            `CANONICAL_QUERIES`
+
+    Returns:
+        list[CanonicalQuery]: Queries that are not backed by an index.
+    """
+    scans = []
+    for query in queries or CANONICAL_QUERIES:
+        collection = documents[query.model_type].get_motor_collection()
+        cursor = collection.find(query.filter)
+        if query.sort:
+            cursor = cursor.sort(query.sort)
+
+        explained = await cursor.limit(1).explain()
+        if has_collection_scan(explained.get("queryPlanner", {}).get("winningPlan")):
+            scans.append(query)
+
+    return scans
+
+
+async def verify_query_plans(
+    documents: dict[RecommendModelType, type["AbstractRecommendDocument"]],
+    mode: Optional[str] = None,
+) -> list[CanonicalQuery]:
+    """
+    Check that the canonical queries are backed by indexes.
+
+    Args:
+        documents (dict): Beanie documents, mapped by the model type.
+        mode (str): `off`, `warn` or `strict`. Defaults to the mode set in the
+            environment.
+
+    Returns:
+        list[CanonicalQuery]: Queries that are not backed by an index.
+
+    Raises:
+        `RecommendDBQueryPlanError` in strict mode, if any of the queries does
+        a collection scan.
+    """
+    mode = mode or get_check_mode()
+    if mode == CHECK_OFF:
+        return []
+
+    try:
+        scans = await find_collection_scans(documents)
+    except OperationFailure as err:
+        # Explain needs privileges that a restricted user might not have.
+        LOGGER.warning("Failed to verify the query plans: %s", err)
+        return []
+
+    for query in scans:
+        LOGGER.warning(
+            "COLLSCAN: %s query %s is not backed by an index",
+            query.model_type.value,
+            list(query.filter.keys()),
+        )
+
+    if scans and mode == CHECK_STRICT:
+        raise RecommendDBQueryPlanError(
+            f"{len(scans)} queries are not backed by an index"
+        )
+
+    return scans
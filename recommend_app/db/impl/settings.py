@@ -0,0 +1,140 @@
+"""
+Module: db.impl.settings
+========================
+
+Settings of the Motor client created by `RecommendDB.connect`.
+
+The settings can be given explicitly or loaded from the environment. Only the
+settings that are set are passed on to the client, the others keep the
+driver's defaults.
+
+Environment Variables:
+- `DB_SERVERSELECTIONTIMEOUT`: Timeout for server selection, in milliseconds.
+- `DB_MAX_POOL_SIZE`: Maximum number of connections per server.
+- `DB_MIN_POOL_SIZE`: Connections kept open per server. They are opened
+                      when the db connects.
+- `DB_MAX_IDLE_TIME_MS`: Idle connections are closed after this long.
+- `DB_WAIT_QUEUE_TIMEOUT_MS`: How long an operation waits for a free
+                              connection before failing.
+- `DB_COMPRESSORS`: Comma separated wire compressors, e.g. `zstd,snappy`.
+- `DB_APP_NAME`: Name of the app, shown in the server logs.
+- `DB_READ_MAX_STALENESS_SECONDS`: How far behind the primary a secondary can
+                                   be to serve the reads routed to the
+                                   secondaries. At least 90 seconds.
+"""
+
+# Builtin imports
+import os
+from typing import Any, Optional
+
+# Project specific imports
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# -----------------------------------------------------------------------------#
+# Constants
+# -----------------------------------------------------------------------------#
+
+# Env variable of each setting
+ENV_VARS: dict[str, str] = {
+    "server_selection_timeout_ms": "DB_SERVERSELECTIONTIMEOUT",
+    "max_pool_size": "DB_MAX_POOL_SIZE",
+    "min_pool_size": "DB_MIN_POOL_SIZE",
+    "max_idle_time_ms": "DB_MAX_IDLE_TIME_MS",
+    "wait_queue_timeout_ms": "DB_WAIT_QUEUE_TIMEOUT_MS",
+    "compressors": "DB_COMPRESSORS",
+    "app_name": "DB_APP_NAME",
+    "max_staleness_seconds": "DB_READ_MAX_STALENESS_SECONDS",
+}
+
+# -----------------------------------------------------------------------------#
+# Models
+# -----------------------------------------------------------------------------#
+
+
+class MotorClientSettings(BaseModel):
+    """
+    Connection pool and wire settings of the Motor client. The aliases are the
+    names of the options of the client.
+
+    Args:
+        server_selection_timeout_ms (int): Timeout for server selection.
+        max_pool_size (int): Maximum number of connections per server.
+        min_pool_size (int): Connections kept open per server.
+        max_idle_time_ms (int): Idle connections are closed after this long.
+        wait_queue_timeout_ms (int): How long an operation waits for a free
+            connection.
+        compressors (list[str]): Wire compressors, in order of preference.
+        app_name (str): Name of the app, shown in the server logs.
+        max_staleness_seconds (int): How far behind the primary a secondary
+            can be to serve the reads routed to the secondaries. It only
+            applies to those reads, so it is not a setting of the client.
+    """
+
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
+
+    server_selection_timeout_ms: Optional[int] = Field(
+        default=None, alias="serverSelectionTimeoutMS", ge=0
+    )
+    max_pool_size: Optional[int] = Field(default=None, alias="maxPoolSize", ge=0)
+    min_pool_size: Optional[int] = Field(default=None, alias="minPoolSize", ge=0)
+    max_idle_time_ms: Optional[int] = Field(default=None, alias="maxIdleTimeMS", ge=0)
+    wait_queue_timeout_ms: Optional[int] = Field(
+        default=None, alias="waitQueueTimeoutMS", ge=0
+    )
+    compressors: Optional[list[str]] = Field(default=None, alias="compressors")
+    app_name: Optional[str] = Field(default=None, alias="appname")
+    # The server rejects a max staleness below 90 seconds
+    max_staleness_seconds: Optional[int] = Field(
+        default=None, alias="maxStalenessSeconds", ge=90, exclude=True
+    )
+
+    # -------------------------------------------------------------------------#
+    # Validators
+    # -------------------------------------------------------------------------#
+    @field_validator("compressors", mode="before")
+    @classmethod
+    def split_compressors(cls, value: Any) -> Any:
+        """
+        Accepts the compressors as a comma separated string too
+        """
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(",") if item.strip()]
+        return value
+
+    # -------------------------------------------------------------------------#
+    # Class Methods
+    # -------------------------------------------------------------------------#
+    @classmethod
+    def from_env(cls, **overrides: Any) -> "MotorClientSettings":
+        """
+        Loads the settings from the environment.
+
+        Args:
+            overrides: Settings that take precedence over the environment.
+
+        Returns:
+            MotorClientSettings
+
+        Raises:
+            pydantic.ValidationError if a value is not valid.
+        """
+        values: dict[str, Any] = {}
+        for name, env_var in ENV_VARS.items():
+            value = os.getenv(env_var)
+            if value:
+                values[name] = value
+
+        values.update(overrides)
+        return cls(**values)
+
+    # -------------------------------------------------------------------------#
+    # Methods
+    # -------------------------------------------------------------------------#
+    def to_client_kwargs(self) -> dict[str, Any]:
+        """
+        Returns the settings that are set, as keyword arguments of the client.
+        """
+        kwargs = self.model_dump(by_alias=True, exclude_none=True)
+        if "compressors" in kwargs:
+            kwargs["compressors"] = ",".join(kwargs["compressors"])
+        return kwargs
@@ -0,0 +1,26 @@
+"""
+Module: db.models.bulk
+======================
+
+Models to report the outcome of the bulk operations.
+"""
+
+# Project specific imports
+from pydantic import BaseModel
+
+# -----------------------------------------------------------------------------#
+# Models
+# -----------------------------------------------------------------------------#
+
+
+class BulkAddFailure(BaseModel):
+    """
+    An item of a bulk add that could not be created.
+
+    Args:
+        index (int): Position of the item in the list that was sent.
+        error (str): Why the item was not created.
+    """
+
+    index: int
+    error: str
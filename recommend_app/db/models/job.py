@@ -0,0 +1,57 @@
+"""
+Module: db.models.job
+=====================
+
+Models of the enrichment jobs: the cards added without their title,
+description or thumbnail, waiting for a worker to scrap their url.
+"""
+
+# Builtin imports
+from datetime import datetime
+from typing import Optional
+
+# Project specific imports
+from pydantic import BaseModel
+
+# Local imports
+from ..types import JobStatus
+
+# -----------------------------------------------------------------------------#
+# Models
+# -----------------------------------------------------------------------------#
+
+
+class NewEnrichmentJob(BaseModel):
+    """
+    A card to be enriched
+
+    Args:
+        card_id (str): Id of the card
+        url (str): Url the data of the card is scrapped from
+    """
+
+    card_id: str
+    url: str
+
+
+class EnrichmentJob(NewEnrichmentJob):
+    """
+    An enrichment job in the queue
+
+    Args:
+        id (str): Id of the job
+        status (JobStatus): State of the job
+        attempts (int): Number of times the job was claimed
+        run_at (datetime): When the job can be claimed
+        lease_until (datetime): When the lease of the worker ends. Optional.
+        worker_id (str): Worker holding the lease. Optional.
+        last_error (str): Why the last attempt failed. Optional.
+    """
+
+    id: str
+    status: JobStatus = JobStatus.PENDING
+    attempts: int = 0
+    run_at: datetime
+    lease_until: Optional[datetime] = None
+    worker_id: Optional[str] = None
+    last_error: Optional[str] = None
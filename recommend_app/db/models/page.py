@@ -0,0 +1,65 @@
+"""
+Module: db.models.page
+======================
+
+Model of the page a card was scrapped from: the data of the card the page
+fills in, the data the page had when it was last scrapped, and the
+validators of its last fetch, to fetch it again only if it has changed.
+"""
+
+# Builtin imports
+from datetime import datetime
+from typing import Optional
+
+# Project specific imports
+from pydantic import BaseModel
+
+# -----------------------------------------------------------------------------#
+# Models
+# -----------------------------------------------------------------------------#
+
+
+class ScrapedFields(BaseModel):
+    """
+    Data of the card the page had when it was last scrapped. A field of the
+    card that differs from it was set by the user.
+
+    Args:
+        title (str): Title of the page. Optional.
+        description (str): Description of the page. Optional.
+        thumbnail (str): Thumbnail of the page. Optional.
+    """
+
+    title: Optional[str] = None
+    description: Optional[str] = None
+    thumbnail: Optional[str] = None
+
+
+class CardPage(BaseModel):
+    """
+    The page of a card
+
+    Args:
+        card_id (str): Id of the card
+        url (str): Url of the page
+        title (str): Title of the card. Optional.
+        description (str): Description of the card. Optional.
+        thumbnail (str): Thumbnail of the card. Optional.
+        scraped (ScrapedFields): Data of the page when it was last scrapped.
+            None if the card was never scrapped.
+        etag (str): ETag of the last fetch of the page. Optional.
+        last_modified (str): Last-Modified date of the last fetch of the
+            page. Optional.
+        scraped_at (datetime): When the page was last fetched. None if it
+            was never checked since the card was added.
+    """
+
+    card_id: str
+    url: str
+    title: Optional[str] = None
+    description: Optional[str] = None
+    thumbnail: Optional[str] = None
+    scraped: Optional[ScrapedFields] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    scraped_at: Optional[datetime] = None
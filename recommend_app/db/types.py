@@ -2,7 +2,7 @@
 Module: db.types
 =================
 
-Defines the enums: crud_type and model_type
+Defines the enums: crud_type, model_type, read_preference and job_status
 """
 
 # Builtin imports
@@ -43,3 +43,33 @@ class CrudType(Enum):
     CREATE = Key.RECOMMEND_MODEL_USER
     READ = Key.RECOMMEND_MODEL_BOARD
     UPDATE = Key.RECOMMEND_MODEL_CARD
+
+
+class ReadPreference(Enum):
+    """
+    Enumeration for the members of the replica set a read can be served by.
+
+    Attributes:
+        PRIMARY: The read is served by the primary. It sees every write.
+        SECONDARY_PREFERRED: The read is served by a secondary if one is
+            available. It can miss the latest writes.
+    """
+
+    PRIMARY = Key.READ_PRIMARY
+    SECONDARY_PREFERRED = Key.READ_SECONDARY_PREFERRED
+
+
+class JobStatus(Enum):
+    """
+    Enumeration for the states of an enrichment job.
+
+    Attributes:
+        PENDING: Waiting to be claimed by a worker, at its run_at.
+        LEASED: Claimed by a worker until its lease_until. A job whose lease
+            expired can be claimed again.
+        DEAD: Failed too many times. Kept for inspection, never retried.
+    """
+
+    PENDING = Key.JOB_PENDING
+    LEASED = Key.JOB_LEASED
+    DEAD = Key.JOB_DEAD
@@ -0,0 +1,433 @@
+"""
+Enriches the cards added without their title, description or thumbnail.
+
+Adding a card doesn't wait for its page to be scrapped: a card added with a
+bare url is stored as is and an enrichment job is queued in the db. Workers
+lease the jobs, scrap the url of the card and fill in the fields that are
+still missing. The data and the validators of the page are kept with the
+card, for its refresh (see `refresh`). A job whose scrap fails is retried with an exponential
+backoff, and is left dead once it has failed `ENRICHMENT_MAX_ATTEMPTS` times.
+A job whose site was not fetched, because the circuit of its host is open
+(see `scrapper.guard`), is postponed until the circuit lets it through,
+without using up an attempt.
+A job whose worker died is taken over once its lease is over.
+
+The workers run in the app, or in a process of their own with
+`python -m recommend_app worker`.
+
+Environment Variables:
+- `ENRICHMENT_WORKERS`: Workers run by the app. 1 by default, 0 leaves the
+                        jobs to the worker processes.
+- `ENRICHMENT_LEASE_SECONDS`: Seconds a worker holds a job.
+- `ENRICHMENT_MAX_ATTEMPTS`: Attempts before a job is dead.
+- `ENRICHMENT_BACKOFF_SECONDS`: Delay before the first retry, doubled on each
+                                attempt.
+- `ENRICHMENT_MAX_BACKOFF_SECONDS`: Longest delay between two attempts.
+- `ENRICHMENT_POLL_SECONDS`: Seconds an idle worker waits before looking for
+                             jobs again.
+"""
+
+# Builtin imports
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional, TYPE_CHECKING
+
+# Project specific imports
+from pydantic import BaseModel, ConfigDict, Field
+
+# Local imports
+from . import scrapper
+from .db.exceptions import RecommendAppDbError, RecommendDBModelNotFound
+from .db.models.card import UpdateCard
+from .db.models.page import ScrapedFields
+from .exceptions import RecommendAppError
+from .scrapper.exceptions import RecommendScrapperHostUnavailable
+
+if TYPE_CHECKING:
+    from .db.client import RecommendDbClient
+    from .db.models.card import BaseCardAttributes, CardInDb, NewCard
+    from .db.models.job import EnrichmentJob
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Fields of the card filled in from its page
+ENRICHED_FIELDS = ("title", "description", "thumbnail")
+
+# Env variable of each setting
+ENV_VARS: dict[str, str] = {
+    "workers": "ENRICHMENT_WORKERS",
+    "lease_seconds": "ENRICHMENT_LEASE_SECONDS",
+    "max_attempts": "ENRICHMENT_MAX_ATTEMPTS",
+    "backoff_seconds": "ENRICHMENT_BACKOFF_SECONDS",
+    "max_backoff_seconds": "ENRICHMENT_MAX_BACKOFF_SECONDS",
+    "poll_seconds": "ENRICHMENT_POLL_SECONDS",
+}
+
+Scrap = Callable[[str], Awaitable[scrapper.Revalidation]]
+
+# -----------------------------------------------------------------------------#
+# Models
+# -----------------------------------------------------------------------------#
+
+
+class EnrichmentSettings(BaseModel):
+    """
+    Settings of the enrichment workers
+
+    Args:
+        workers (int): Workers run by the app. 0 leaves the jobs to the worker
+            processes.
+        lease_seconds (float): Seconds a worker holds a job
+        max_attempts (int): Attempts before a job is dead
+        backoff_seconds (float): Delay before the first retry
+        max_backoff_seconds (float): Longest delay between two attempts
+        poll_seconds (float): Seconds an idle worker waits before looking for
+            jobs again
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    workers: int = Field(default=1, ge=0)
+    lease_seconds: float = Field(default=60.0, gt=0)
+    max_attempts: int = Field(default=5, ge=1)
+    backoff_seconds: float = Field(default=30.0, ge=0)
+    max_backoff_seconds: float = Field(default=60 * 60, ge=0)
+    poll_seconds: float = Field(default=1.0, gt=0)
+
+    # -------------------------------------------------------------------------#
+    # Class Methods
+    # -------------------------------------------------------------------------#
+    @classmethod
+    def from_env(cls, **overrides: Any) -> "EnrichmentSettings":
+        """
+        Loads the settings from the environment.
+
+        Args:
+            overrides: Settings that take precedence over the environment.
+
+        Returns:
+            EnrichmentSettings
+
+        Raises:
+            pydantic.ValidationError if a value is not valid.
+        """
+        values: dict[str, Any] = {}
+        for name, env_var in ENV_VARS.items():
+            value = os.getenv(env_var)
+            if value:
+                values[name] = value
+
+        values.update(overrides)
+        return cls(**values)
+
+
+# -----------------------------------------------------------------------------#
+# Functions
+# -----------------------------------------------------------------------------#
+
+
+def needs_enrichment(card: "BaseCardAttributes") -> bool:
+    """
+    Returns True if the card was added with none of the fields of its page.
+    Takes the new cards as well as the cards in the database.
+    """
+    return not any(getattr(card, field) for field in ENRICHED_FIELDS)
+
+
+def get_backoff(settings: EnrichmentSettings, attempts: int) -> float:
+    """
+    Seconds before the next attempt of a job that failed `attempts` times
+    """
+    backoff = settings.backoff_seconds * 2 ** max(attempts - 1, 0)
+    return min(backoff, settings.max_backoff_seconds)
+
+
+def get_cached_scrap(cache: scrapper.ScrapeCache) -> Scrap:
+    """
+    Scraps the urls through the cache, so that the cards added from the same
+    page share its scrap. The validators of the page are only known to the
+    scrap that fetched it.
+    """
+
+    async def scrap(url: str) -> scrapper.Revalidation:
+        fetched = scrapper.Revalidation()
+
+        async def fetch(url: str) -> "NewCard":
+            nonlocal fetched
+            # Fetched without validators: the page is always parsed
+            fetched = await scrapper.revalidate(url)
+            if fetched.card is None:
+                raise RecommendAppError(f"Failed to scrap {url}")
+            return fetched.card
+
+        card = await cache.get(url, fetch)
+        return fetched.model_copy(update={"card": card})
+
+    return scrap
+
+
+# -----------------------------------------------------------------------------#
+# Class
+# -----------------------------------------------------------------------------#
+
+
+class EnrichmentWorker:
+    """
+    Leases the enrichment jobs one at a time and fills in their cards
+    """
+
+    def __init__(
+        self,
+        client: "RecommendDbClient",
+        scrap: Scrap,
+        settings: Optional[EnrichmentSettings] = None,
+        worker_id: Optional[str] = None,
+    ):
+        """
+        Initialize the worker
+
+        Args:
+            client (RecommendDbClient): Client of the db holding the jobs
+            scrap (Callable): Scraps the card of a url
+            settings (EnrichmentSettings): Optional, loaded from the
+                environment if not given.
+            worker_id (str): Optional, unique to the worker if not given.
+        """
+        self.__client = client
+        self.__scrap = scrap
+        self.__settings = settings or EnrichmentSettings.from_env()
+        self.__worker_id = worker_id or (
+            f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        )
+
+    ###########################################################################
+    # Properties
+    ###########################################################################
+    @property
+    def worker_id(self) -> str:
+        """
+        Returns the id the worker leases the jobs with
+        """
+        return self.__worker_id
+
+    ###########################################################################
+    # Methods
+    ###########################################################################
+    async def run_once(self) -> bool:
+        """
+        Leases the next job that is due and processes it.
+
+        Returns:
+            bool: False if no job was due
+        """
+        try:
+            job = await self.__client.claim_enrichment_job(
+                self.__worker_id,
+                self.__settings.lease_seconds,
+                self.__settings.max_attempts,
+            )
+        except RecommendAppDbError as err:
+            LOGGER.warning("Failed to claim an enrichment job: %s", err.message)
+            return False
+
+        if job is None:
+            return False
+
+        try:
+            await self.__process(job)
+        except RecommendScrapperHostUnavailable as err:
+            await self.__postpone(job, err)
+        except RecommendAppError as err:
+            # The scrap or the db failed
+            await self.__fail(job, err.message)
+        except Exception:
+            LOGGER.exception("Failed to enrich the card %s", job.card_id)
+            await self.__fail(job, f"Failed to enrich the card {job.card_id}")
+
+        return True
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """
+        Processes the jobs until `stop` is set, waiting for new ones when the
+        queue is empty.
+
+        Args:
+            stop (asyncio.Event): Set to stop the worker
+        """
+        while not stop.is_set():
+            if await self.run_once():
+                continue
+
+            try:
+                await asyncio.wait_for(stop.wait(), self.__settings.poll_seconds)
+            except TimeoutError:
+                pass
+
+    ###########################################################################
+    # Methods: privates
+    ###########################################################################
+    async def __process(self, job: "EnrichmentJob") -> None:
+        """
+        Scraps the url of the job and fills in the missing fields of its card
+        """
+        try:
+            card = await self.__client.get_card(job.card_id)
+        except RecommendDBModelNotFound:
+            # Removed in the meantime, nothing to do
+            await self.__complete(job)
+            return
+
+        result = await self.__scrap(job.url)
+        scrapped = result.card
+        if scrapped is None:
+            raise RecommendAppError(f"Failed to scrap {job.url}")
+        update = self.__get_update(card, scrapped)
+        try:
+            if update is not None:
+                await self.__client.update_card(card.id, update)
+            await self.__client.set_page_validators(
+                card.id,
+                result.etag,
+                result.last_modified,
+                scraped=ScrapedFields(
+                    **{field: getattr(scrapped, field) for field in ENRICHED_FIELDS}
+                ),
+            )
+        except RecommendDBModelNotFound:
+            pass
+
+        await self.__complete(job)
+
+    @staticmethod
+    def __get_update(card: "CardInDb", scrapped: "NewCard") -> Optional[UpdateCard]:
+        """
+        The fields the page has and the card misses. The fields set on the
+        card since it was added are left as they are.
+        """
+        values = {
+            field: getattr(scrapped, field)
+            for field in ENRICHED_FIELDS
+            if getattr(card, field) is None and getattr(scrapped, field)
+        }
+        return UpdateCard(**values) if values else None
+
+    async def __complete(self, job: "EnrichmentJob") -> None:
+        """
+        Removes the job from the queue
+        """
+        if not await self.__client.complete_enrichment_job(job.id, self.__worker_id):
+            LOGGER.warning("Lost the lease of the enrichment job %s", job.id)
+
+    async def __postpone(
+        self, job: "EnrichmentJob", err: RecommendScrapperHostUnavailable
+    ) -> None:
+        """
+        Releases the job whose site was not fetched until the circuit of its
+        host lets it through. The attempt is given back to the job.
+        """
+        delay = err.retry_after or self.__settings.backoff_seconds
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        try:
+            await self.__client.fail_enrichment_job(
+                job.id, self.__worker_id, err.message, retry_at, count_attempt=False
+            )
+        except RecommendAppDbError as db_err:
+            LOGGER.warning("Failed to release the job %s: %s", job.id, db_err.message)
+
+    async def __fail(self, job: "EnrichmentJob", error: str) -> None:
+        """
+        Schedules the next attempt of the job, or leaves it dead once it has
+        no attempts left. If the db fails, the job is retried once its lease
+        is over.
+        """
+        retry_at: Optional[datetime] = None
+        if job.attempts < self.__settings.max_attempts:
+            backoff = get_backoff(self.__settings, job.attempts)
+            retry_at = datetime.now(timezone.utc) + timedelta(seconds=backoff)
+        else:
+            LOGGER.warning(
+                "Giving up on the card %s after %s attempts: %s",
+                job.card_id,
+                job.attempts,
+                error,
+            )
+
+        try:
+            await self.__client.fail_enrichment_job(
+                job.id, self.__worker_id, error, retry_at
+            )
+        except RecommendAppDbError as err:
+            LOGGER.warning("Failed to release the job %s: %s", job.id, err.message)
+
+
+class EnrichmentWorkers:
+    """
+    Runs enrichment workers as tasks of the event loop
+    """
+
+    def __init__(
+        self,
+        client: "RecommendDbClient",
+        scrap: Scrap,
+        settings: Optional[EnrichmentSettings] = None,
+    ):
+        """
+        Initialize the workers
+
+        Args:
+            client (RecommendDbClient): Client of the db holding the jobs
+            scrap (Callable): Scraps the card of a url
+            settings (EnrichmentSettings): Optional, loaded from the
+                environment if not given.
+        """
+        self.__settings = settings or EnrichmentSettings.from_env()
+        self.__workers = [
+            EnrichmentWorker(client, scrap, self.__settings)
+            for _ in range(self.__settings.workers)
+        ]
+        self.__stop = asyncio.Event()
+        self.__tasks: list[asyncio.Task[None]] = []
+
+    ###########################################################################
+    # Methods
+    ###########################################################################
+    def start(self) -> None:
+        """
+        Starts the workers
+        """
+        self.__stop.clear()
+        self.__tasks = [
+            asyncio.create_task(worker.run(self.__stop)) for worker in self.__workers
+        ]
+
+    async def wait(self) -> None:
+        """
+        Waits for the workers to stop
+        """
+        if self.__tasks:
+            await asyncio.gather(*self.__tasks, return_exceptions=True)
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the workers once their current job is over. The workers still
+        busy after `timeout` seconds are cancelled: their jobs are retried
+        once their lease is over.
+
+        Args:
+            timeout (float): Optional, the lease of the jobs if not given.
+        """
+        self.__stop.set()
+        if not self.__tasks:
+            return
+
+        timeout = self.__settings.lease_seconds if timeout is None else timeout
+        _, pending = await asyncio.wait(self.__tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await self.wait()
+        self.__tasks = []
@@ -0,0 +1,230 @@
+"""
+Module: lru
+===========
+
+A bounded, in-process LRU cache with an optional time to live.
+
+The cache is bounded by the approximate size of its values in bytes. The size
+of a value is computed once, when it is stored, by the `sizeof` function the
+cache is created with. When a new value doesn't fit, the least recently used
+values are evicted until it does.
+"""
+
+# Builtin imports
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, NamedTuple, Optional, TypeVar
+
+# Project specific imports
+from pydantic import BaseModel
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# -----------------------------------------------------------------------------#
+# Models
+# -----------------------------------------------------------------------------#
+
+
+class CacheStats(BaseModel):
+    """
+    Counters of a cache
+
+    Args:
+        hits (int): Number of lookups that found a live value
+        misses (int): Number of lookups that found nothing or an expired value
+        evictions (int): Number of values dropped to make room for new ones
+        items (int): Number of values in the cache
+        size_bytes (int): Approximate size of the values in the cache
+        max_bytes (int): Size limit of the cache
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    items: int = 0
+    size_bytes: int = 0
+    max_bytes: int = 0
+
+
+class _Entry(NamedTuple):
+    value: Any
+    size: int
+    expires_at: Optional[float]
+
+
+# -----------------------------------------------------------------------------#
+# Cache
+# -----------------------------------------------------------------------------#
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Least recently used cache, bounded in bytes, with an optional TTL.
+
+    Not thread safe. It is meant to be used from the event loop.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl: Optional[float] = None,
+        sizeof: Callable[[V], int] = sys.getsizeof,
+        on_remove: Optional[Callable[[K, V], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes (int): Size limit of the cache, in bytes.
+            ttl (float): Seconds a value stays valid. Optional, the values
+                never expire if it is not given.
+            sizeof (Callable): Returns the approximate size of a value in bytes.
+            on_remove (Callable): Called with the key and the value whenever a
+                value leaves the cache, whatever the reason. Optional.
+            clock (Callable): Returns the current time in seconds.
+        """
+        self.__max_bytes = max_bytes
+        self.__ttl = ttl
+        self.__sizeof = sizeof
+        self.__on_remove = on_remove
+        self.__clock = clock
+
+        self.__entries: OrderedDict[K, _Entry] = OrderedDict()
+        self.__size_bytes = 0
+
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    ###########################################################################
+    # Dunder methods
+    ###########################################################################
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: K) -> bool:
+        entry = self.__entries.get(key)
+        return entry is not None and not self.__is_expired(entry)
+
+    ###########################################################################
+    # Properties
+    ###########################################################################
+    @property
+    def size_bytes(self) -> int:
+        """
+        Returns the approximate size of the values in the cache
+        """
+        return self.__size_bytes
+
+    @property
+    def stats(self) -> CacheStats:
+        """
+        Returns the counters of the cache
+        """
+        return CacheStats(
+            hits=self.__hits,
+            misses=self.__misses,
+            evictions=self.__evictions,
+            items=len(self.__entries),
+            size_bytes=self.__size_bytes,
+            max_bytes=self.__max_bytes,
+        )
+
+    ###########################################################################
+    # Methods
+    ###########################################################################
+    def get(self, key: K) -> Optional[V]:
+        """
+        Returns the value stored against the key and marks it as the most
+        recently used.
+
+        Args:
+            key (Hashable): Key of the value
+
+        Returns:
+            The value. None if there is no such key or if it has expired.
+        """
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.__misses += 1
+            return None
+
+        if self.__is_expired(entry):
+            self.__remove(key)
+            self.__misses += 1
+            return None
+
+        self.__entries.move_to_end(key)
+        self.__hits += 1
+        return entry.value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> bool:
+        """
+        Stores the value against the key. Evicts the least recently used values
+        if the cache would go over its size limit.
+
+        Args:
+            key (Hashable): Key of the value
+            value (Any): Value to be stored
+            ttl (float): Seconds this value stays valid. Optional, the ttl of
+                the cache is used if not given.
+
+        Returns:
+            False if the value alone is bigger than the cache and was not
+            stored. True otherwise.
+        """
+        size = self.__sizeof(value)
+        if key in self.__entries:
+            self.__remove(key)
+
+        if size > self.__max_bytes:
+            return False
+
+        while self.__size_bytes + size > self.__max_bytes:
+            oldest = next(iter(self.__entries))
+            self.__remove(oldest)
+            self.__evictions += 1
+
+        if ttl is None:
+            ttl = self.__ttl
+        expires_at = self.__clock() + ttl if ttl is not None else None
+        self.__entries[key] = _Entry(value, size, expires_at)
+        self.__size_bytes += size
+        return True
+
+    def pop(self, key: K) -> Optional[V]:
+        """
+        Removes the key from the cache
+
+        Args:
+            key (Hashable): Key of the value
+
+        Returns:
+            The value that was stored against the key, None if there was none.
+        """
+        if key not in self.__entries:
+            return None
+        return self.__remove(key)
+
+    def clear(self) -> None:
+        """
+        Removes all the values. The counters are kept.
+        """
+        for key in list(self.__entries):
+            self.__remove(key)
+
+    ###########################################################################
+    # Methods: privates
+    ###########################################################################
+    def __is_expired(self, entry: _Entry) -> bool:
+        return entry.expires_at is not None and entry.expires_at <= self.__clock()
+
+    def __remove(self, key: K) -> V:
+        entry = self.__entries.pop(key)
+        self.__size_bytes -= entry.size
+        if self.__on_remove:
+            self.__on_remove(key, entry.value)
+        return entry.value
@@ -0,0 +1,326 @@
+"""
+Refreshes the data of the cards whose page may have changed.
+
+Every `REFRESH_INTERVAL_SECONDS`, the pages of the cards last fetched more
+than `REFRESH_MAX_AGE_SECONDS` ago are fetched again, oldest first, with the
+validators of their last fetch (`If-None-Match`, `If-Modified-Since`). A page
+that has not changed is answered with a 304 and is not parsed. A page that
+has changed updates the title, description and thumbnail of its cards,
+except the ones the user changed: a field is only replaced if it still holds
+the data of the last scrap of the page.
+
+The pages shared by several cards are fetched once. The fetches of the
+scheduler stay within `REFRESH_RATE` requests per second. The pages of a host
+whose circuit is open (see `scrapper.guard`) are not fetched, and are left
+for the next pass.
+
+The scheduler runs with the enrichment workers, in a process of their own
+(`python -m recommend_app worker`), so that the budget holds for the whole
+deployment. `python -m recommend_app refresh` runs a single pass.
+
+Environment Variables:
+- `REFRESH_INTERVAL_SECONDS`: Seconds between two passes. 0 disables the
+                              scheduler.
+- `REFRESH_MAX_AGE_SECONDS`: Age of a page before it is checked again.
+- `REFRESH_BATCH_SIZE`: Cards checked at most in a pass.
+- `REFRESH_RATE`: Fetches per second, all the pages together.
+- `REFRESH_CONCURRENCY`: Fetches running at once.
+"""
+
+# Builtin imports
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional, TYPE_CHECKING
+
+# Project specific imports
+from pydantic import BaseModel, ConfigDict, Field
+
+# Local imports
+from . import scrapper
+from .db.exceptions import RecommendAppDbError, RecommendDBModelNotFound
+from .db.models.card import NewCard, UpdateCard
+from .db.models.page import ScrapedFields
+from .exceptions import RecommendAppError
+from .scrapper.exceptions import RecommendScrapperHostUnavailable
+from .scrapper.limits import TokenBucket
+
+if TYPE_CHECKING:
+    from .db.client import RecommendDbClient
+    from .db.models.page import CardPage
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Fields of the card refreshed from its page
+REFRESHED_FIELDS = ("title", "description", "thumbnail")
+
+# Env variable of each setting
+ENV_VARS: dict[str, str] = {
+    "interval_seconds": "REFRESH_INTERVAL_SECONDS",
+    "max_age_seconds": "REFRESH_MAX_AGE_SECONDS",
+    "batch_size": "REFRESH_BATCH_SIZE",
+    "rate": "REFRESH_RATE",
+    "concurrency": "REFRESH_CONCURRENCY",
+}
+
+Revalidate = Callable[
+    [str, Optional[str], Optional[str]], Awaitable[scrapper.Revalidation]
+]
+
+# -----------------------------------------------------------------------------#
+# Models
+# -----------------------------------------------------------------------------#
+
+
+class RefreshSettings(BaseModel):
+    """
+    Settings of the refresh of the cards
+
+    Args:
+        interval_seconds (float): Seconds between two passes. 0 disables the
+            scheduler.
+        max_age_seconds (float): Age of a page before it is checked again
+        batch_size (int): Cards checked at most in a pass
+        rate (float): Fetches per second
+        concurrency (int): Fetches running at once
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    interval_seconds: float = Field(default=60 * 60, ge=0)
+    max_age_seconds: float = Field(default=7 * 24 * 60 * 60, ge=0)
+    batch_size: int = Field(default=500, ge=1)
+    rate: float = Field(default=1.0, gt=0)
+    concurrency: int = Field(default=4, ge=1)
+
+    # -------------------------------------------------------------------------#
+    # Class Methods
+    # -------------------------------------------------------------------------#
+    @classmethod
+    def from_env(cls, **overrides: Any) -> "RefreshSettings":
+        """
+        Loads the settings from the environment.
+
+        Args:
+            overrides: Settings that take precedence over the environment.
+
+        Returns:
+            RefreshSettings
+
+        Raises:
+            pydantic.ValidationError if a value is not valid.
+        """
+        values: dict[str, Any] = {}
+        for name, env_var in ENV_VARS.items():
+            value = os.getenv(env_var)
+            if value:
+                values[name] = value
+
+        values.update(overrides)
+        return cls(**values)
+
+
+class RefreshStats(BaseModel):
+    """
+    Counters of a pass of the scheduler
+
+    Args:
+        pages (int): Pages checked
+        not_modified (int): Pages that have not changed
+        modified (int): Pages that have changed
+        failed (int): Pages that couldn't be fetched
+        unavailable (int): Pages not fetched, the circuit of their host was
+            open
+        updated (int): Cards updated
+    """
+
+    pages: int = 0
+    not_modified: int = 0
+    modified: int = 0
+    failed: int = 0
+    unavailable: int = 0
+    updated: int = 0
+
+
+# -----------------------------------------------------------------------------#
+# Class
+# -----------------------------------------------------------------------------#
+
+
+class RefreshScheduler:
+    """
+    Checks the stale pages of the cards, in passes
+    """
+
+    def __init__(
+        self,
+        client: "RecommendDbClient",
+        revalidate: Revalidate = scrapper.revalidate,
+        settings: Optional[RefreshSettings] = None,
+    ):
+        """
+        Initialize the scheduler
+
+        Args:
+            client (RecommendDbClient): Client of the db holding the cards
+            revalidate (Callable): Fetches a page again if it has changed.
+                Optional, `scrapper.revalidate` if not given.
+            settings (RefreshSettings): Optional, loaded from the environment
+                if not given.
+        """
+        self.__client = client
+        self.__revalidate = revalidate
+        self.__settings = settings or RefreshSettings.from_env()
+        self.__bucket = TokenBucket(self.__settings.rate, capacity=1)
+        self.__semaphore = asyncio.Semaphore(self.__settings.concurrency)
+
+    ###########################################################################
+    # Methods
+    ###########################################################################
+    async def run_once(self, stop: Optional[asyncio.Event] = None) -> RefreshStats:
+        """
+        Checks the pages of the cards that are stale
+
+        Args:
+            stop (asyncio.Event): Set to stop the pass. The pages not fetched
+                yet are left for the next pass. Optional.
+
+        Returns:
+            RefreshStats
+        """
+        stats = RefreshStats()
+        before = datetime.now(timezone.utc) - timedelta(
+            seconds=self.__settings.max_age_seconds
+        )
+        try:
+            pages = await self.__client.get_stale_pages(
+                before, self.__settings.batch_size
+            )
+        except RecommendAppDbError as err:
+            LOGGER.warning("Failed to read the stale pages: %s", err.message)
+            return stats
+
+        # The cards of the same page share its fetch
+        cards: dict[str, list["CardPage"]] = {}
+        for page in pages:
+            cards.setdefault(scrapper.normalize_url(page.url), []).append(page)
+
+        await asyncio.gather(
+            *(self.__refresh(same_page, stats, stop) for same_page in cards.values())
+        )
+        return stats
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """
+        Runs a pass every `interval_seconds`, until `stop` is set
+
+        Args:
+            stop (asyncio.Event): Set to stop the scheduler
+        """
+        while not stop.is_set():
+            stats = await self.run_once(stop)
+            if stats.pages:
+                LOGGER.info("Refreshed the stale pages: %s", stats)
+
+            try:
+                await asyncio.wait_for(stop.wait(), self.__settings.interval_seconds)
+            except TimeoutError:
+                pass
+
+    ###########################################################################
+    # Methods: privates
+    ###########################################################################
+    async def __refresh(
+        self,
+        cards: list["CardPage"],
+        stats: RefreshStats,
+        stop: Optional[asyncio.Event] = None,
+    ) -> None:
+        """
+        Fetches the page of the cards again and updates them if it changed
+        """
+        page = cards[0]
+        try:
+            async with self.__semaphore:
+                await self.__bucket.acquire()
+                if stop is not None and stop.is_set():
+                    return
+                stats.pages += 1
+                result = await self.__revalidate(
+                    page.url, page.etag, page.last_modified
+                )
+        except RecommendScrapperHostUnavailable:
+            # Not fetched: still stale, checked on the next pass
+            stats.unavailable += 1
+            return
+        except RecommendAppError as err:
+            # Checked again once it is stale again, not on the next pass
+            LOGGER.info("Failed to refresh %s: %s", page.url, err.message)
+            stats.failed += 1
+            result = scrapper.Revalidation(
+                etag=page.etag, last_modified=page.last_modified
+            )
+        else:
+            if result.modified:
+                stats.modified += 1
+            else:
+                stats.not_modified += 1
+
+        for card in cards:
+            scraped: Optional[ScrapedFields] = None
+            try:
+                if result.card is not None:
+                    scraped = self.__get_scraped(card, result.card)
+                    if await self.__update(card, result.card):
+                        stats.updated += 1
+                await self.__client.set_page_validators(
+                    card.card_id, result.etag, result.last_modified, scraped=scraped
+                )
+            except RecommendDBModelNotFound:
+                # Removed in the meantime
+                pass
+            except RecommendAppDbError as err:
+                LOGGER.warning("Failed to refresh the card %s: %s", card.card_id, err)
+
+    async def __update(self, card: "CardPage", scrapped: NewCard) -> bool:
+        """
+        Updates the fields of the card the page changed. The fields the page
+        doesn't have anymore are left as they are, so are the fields that
+        differ from the last scrap of the page: the user set them. The card
+        never scrapped has no field to update.
+
+        Returns:
+            bool: False if nothing changed
+        """
+        if card.scraped is None:
+            return False
+
+        values = {
+            field: getattr(scrapped, field)
+            for field in REFRESHED_FIELDS
+            if getattr(scrapped, field)
+            and getattr(scrapped, field) != getattr(card, field)
+            and getattr(card.scraped, field) == getattr(card, field)
+        }
+        if not values:
+            return False
+
+        await self.__client.update_card(card.card_id, UpdateCard(**values))
+        return True
+
+    @staticmethod
+    def __get_scraped(card: "CardPage", scrapped: NewCard) -> ScrapedFields:
+        """
+        Data of the page to compare the card with on the next refresh. A
+        field the page doesn't have anymore keeps the data of the last scrap,
+        like the card does.
+        """
+        values = {}
+        for field in REFRESHED_FIELDS:
+            value = getattr(scrapped, field)
+            if not value and card.scraped is not None:
+                value = getattr(card.scraped, field)
+            values[field] = value
+        return ScrapedFields(**values)
@@ -1,10 +1,77 @@
 """
 Get the card information from the URL
+
+Two backends fetch the pages:
+- `httpx`: Async, with a shared pool of connections. Used by `from_url_async`
+  by default.
+- `requests`: Blocking. Used by `from_url`, and by `from_url_async` (in a
+  thread) if `SCRAPPER_BACKEND` is `requests`.
+
+See `settings` for the timeouts and the limits of the fetches. The scrapped
+cards are cached, see `cache`. `scrap_many` scraps a batch of pages
+concurrently, see `batch`. The pages can be parsed in a pool of processes,
+see `parsing`. `revalidate` scraps a page again only if it has changed.
+
+The async fetches are rate limited per host, and fail fast while the circuit
+of their host is open, see `guard`. `from_url` is not.
 """
 
+# Builtin imports
+import asyncio
+from typing import Optional
+
+# Project specific imports
+from pydantic import BaseModel
+
 # Local imports
 from ..db.models.card import NewCard
-from . import using_requests
+from . import parsing, using_requests, using_httpx
+from .settings import BACKEND_REQUESTS, get_settings
+from .cache import ScrapeCache, normalize_url
+from .batch import ScrapResult, scrap_many
+from .guard import GuardStats, get_guard
+from .streaming import get_conditional_headers
+
+__all__ = [
+    "GuardStats",
+    "Revalidation",
+    "ScrapResult",
+    "ScrapeCache",
+    "close",
+    "from_url",
+    "from_url_async",
+    "get_guard",
+    "normalize_url",
+    "revalidate",
+    "scrap_many",
+]
+
+# -----------------------------------------------------------------------------#
+# Models
+# -----------------------------------------------------------------------------#
+
+
+class Revalidation(BaseModel):
+    """
+    Outcome of the conditional scrap of a page
+
+    Args:
+        card (NewCard): Card of the page. None if the page has not changed.
+        etag (str): ETag of the page. Optional.
+        last_modified (str): Last-Modified date of the page. Optional.
+    """
+
+    card: Optional[NewCard] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def modified(self) -> bool:
+        """
+        Returns True if the page has changed
+        """
+        return self.card is not None
+
 
 # -----------------------------------------------------------------------------#
 # Function
@@ -25,6 +92,88 @@ def from_url(url: str) -> NewCard:
         RecommendAppError
     """
     data = using_requests.scrap(url)
+    return _to_card(url, data)
+
+
+async def from_url_async(url: str) -> NewCard:
+    """
+    Awaitable counterpart of `from_url`. The page is fetched with the backend
+    of the settings, without blocking the event loop. It is parsed once the
+    slot of its host is released.
+
+    Args:
+        url (str): Url to be parsed
+
+    Returns:
+        NewCard
+
+    Raises:
+        RecommendScrapperHostUnavailable if the circuit of the host is open
+        RecommendAppError
+    """
+    async with get_guard().slot(url):
+        if get_settings().backend == BACKEND_REQUESTS:
+            page = await asyncio.to_thread(using_requests.fetch, url)
+        else:
+            page = await using_httpx.fetch(url)
+
+    data = await parsing.get_pool().parse(page, url)
+    return _to_card(url, data)
+
+
+async def revalidate(
+    url: str, etag: Optional[str] = None, last_modified: Optional[str] = None
+) -> Revalidation:
+    """
+    Conditional counterpart of `from_url_async`: the page is fetched with the
+    validators of its last fetch, and only parsed if the server says it has
+    changed. Not cached.
+
+    Args:
+        url (str): Url to be parsed
+        etag (str): ETag of the last fetch. Optional.
+        last_modified (str): Last-Modified date of the last fetch. Optional.
+
+    Returns:
+        Revalidation
+
+    Raises:
+        RecommendScrapperHostUnavailable if the circuit of the host is open
+        RecommendAppError
+    """
+    headers = get_conditional_headers(etag, last_modified)
+    async with get_guard().slot(url):
+        if get_settings().backend == BACKEND_REQUESTS:
+            page = await asyncio.to_thread(using_requests.fetch, url, headers)
+        else:
+            page = await using_httpx.fetch(url, headers)
+
+    if page.not_modified:
+        # The server may only send the validators that changed
+        return Revalidation(
+            etag=page.etag or etag, last_modified=page.last_modified or last_modified
+        )
+
+    data = await parsing.get_pool().parse(page, url)
+    return Revalidation(
+        card=_to_card(url, data), etag=page.etag, last_modified=page.last_modified
+    )
+
+
+async def close() -> None:
+    """
+    Closes the connections of the async backend and shuts the parse pool down.
+    The processes of the pool are waited for in a thread, not in the event
+    loop.
+    """
+    await using_httpx.close()
+    await asyncio.to_thread(parsing.shutdown)
+
+
+def _to_card(url: str, data: dict[str, Optional[str]]) -> NewCard:
+    """
+    Card of the scrapped data. The url defaults to the url that was scrapped.
+    """
     if not data.get("url"):
         data["url"] = url
 
@@ -0,0 +1,137 @@
+"""
+Scraps a batch of pages concurrently.
+
+The pages are fetched at once, at most `SCRAPPER_BATCH_CONCURRENCY` of them
+for all the batches of the process. The fetches of each host are limited by
+the guard of the hosts, see `guard`, so that a long list of links to the same
+site doesn't hammer it. The results are yielded as soon as each page
+is scrapped, not in the order of the urls.
+"""
+
+# Builtin imports
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+# Project specific imports
+from pydantic import BaseModel
+
+# Local imports
+from ..db.models.card import NewCard
+from ..exceptions import RecommendAppError
+from .settings import get_settings
+
+LOGGER = logging.getLogger(__name__)
+
+# -----------------------------------------------------------------------------#
+# Models
+# -----------------------------------------------------------------------------#
+
+
+class ScrapResult(BaseModel):
+    """
+    Outcome of the scrap of a page of a batch
+
+    Args:
+        index (int): Position of the url in the batch
+        url (str): Url of the page
+        card (NewCard): Card of the page. None if the scrap failed.
+        error (str): Why the scrap failed. None if it succeeded.
+    """
+
+    index: int
+    url: str
+    card: Optional[NewCard] = None
+    error: Optional[str] = None
+
+
+# -----------------------------------------------------------------------------#
+# Class
+# -----------------------------------------------------------------------------#
+
+
+class BatchLimiter:
+    """
+    Caps the fetches of the batches running at once
+    """
+
+    def __init__(self, max_concurrency: int):
+        """
+        Initialize the limiter
+
+        Args:
+            max_concurrency (int): Fetches running at once
+        """
+        self.__semaphore = asyncio.Semaphore(max_concurrency)
+
+    ###########################################################################
+    # Methods
+    ###########################################################################
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Waits for room for a fetch
+        """
+        async with self.__semaphore:
+            yield
+
+
+# -----------------------------------------------------------------------------#
+# Functions
+# -----------------------------------------------------------------------------#
+__LIMITER: Optional[BatchLimiter] = None
+
+
+def get_limiter() -> BatchLimiter:
+    """
+    Returns the limiter shared by the batches, creating it on first use
+    """
+    global __LIMITER
+    if __LIMITER is None:
+        __LIMITER = BatchLimiter(get_settings().batch_concurrency)
+    return __LIMITER
+
+
+async def scrap_many(
+    urls: list[str],
+    scrap: Callable[[str], Awaitable[NewCard]],
+    limiter: Optional[BatchLimiter] = None,
+) -> AsyncIterator[ScrapResult]:
+    """
+    Scraps the pages concurrently and yields their results as they complete.
+    A failing page is reported in its result, it doesn't stop the batch.
+    The scraps still running are cancelled if the iteration stops early.
+
+    Args:
+        urls (list[str]): Urls of the pages
+        scrap (Callable): Scraps the card of a page
+        limiter (BatchLimiter): Optional, the limiter shared by the batches is
+            used if not given.
+
+    Yields:
+        ScrapResult
+    """
+    limiter = limiter or get_limiter()
+
+    async def scrap_one(index: int, url: str) -> ScrapResult:
+        try:
+            async with limiter.slot():
+                card = await scrap(url)
+        except RecommendAppError as err:
+            return ScrapResult(index=index, url=url, error=err.message)
+        except Exception:
+            LOGGER.exception("Failed to scrap %s", url)
+            return ScrapResult(index=index, url=url, error=f"Failed to scrap {url}")
+
+        return ScrapResult(index=index, url=url, card=card)
+
+    tasks = [
+        asyncio.create_task(scrap_one(index, url)) for index, url in enumerate(urls)
+    ]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,254 @@
+"""
+Cache of the scrapped cards.
+
+The same popular pages are scrapped over and over. The cards scrapped from
+them are kept for `SCRAPPER_CACHE_TTL` seconds, keyed by the normalized url of
+the page:
+- in memory, in an LRU bounded by `SCRAPPER_CACHE_MAX_BYTES`,
+- in the db (a collection with a TTL index), shared by the workers and kept
+  across restarts.
+
+The concurrent scraps of the same page share a single fetch: the first one
+fetches the page, the others wait for its result.
+"""
+
+# Builtin imports
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Local imports
+from ..db.exceptions import RecommendAppDbError
+from ..db.models.card import NewCard
+from ..lru import CacheStats, LRUCache
+from .settings import ScrapperSettings, get_settings
+
+if TYPE_CHECKING:
+    from ..db.client import RecommendDbClient
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Query parameters that don't change the page
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_eid", "ref_")
+
+# -----------------------------------------------------------------------------#
+# Models
+# -----------------------------------------------------------------------------#
+
+
+class ScrapeCacheStats(CacheStats):
+    """
+    Counters of a ScrapeCache
+
+    Args:
+        in_flight (int): Number of pages being fetched
+        coalesced (int): Number of scraps that waited for the fetch of another
+        stored (int): Number of scraps served by the db
+    """
+
+    in_flight: int = 0
+    coalesced: int = 0
+    stored: int = 0
+
+
+# -----------------------------------------------------------------------------#
+# Functions
+# -----------------------------------------------------------------------------#
+
+
+def normalize_url(url: str) -> str:
+    """
+    Key of the page in the cache. The scheme and the host are lower cased, the
+    default port, the fragment and the tracking parameters are dropped and the
+    remaining parameters are sorted.
+
+    Args:
+        url (str): Url of the page
+
+    Returns:
+        str: The normalized url. The url as is if it can't be parsed.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url
+
+    if not parts.scheme or not parts.hostname:
+        return url
+
+    scheme = parts.scheme.lower()
+    netloc = parts.hostname
+    if port and (scheme, port) not in (("http", 80), ("https", 443)):
+        netloc = f"{netloc}:{port}"
+
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith(TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, netloc, parts.path or "/", urlencode(query), ""))
+
+
+def _sizeof_card(card: NewCard) -> int:
+    return len(card.model_dump_json())
+
+
+# -----------------------------------------------------------------------------#
+# Class
+# -----------------------------------------------------------------------------#
+
+
+class ScrapeCache:
+    """
+    Serves the scraps from memory, then from the db, and fetches the pages
+    that are in neither, one fetch per page at a time.
+    """
+
+    def __init__(
+        self,
+        store: Optional["RecommendDbClient"] = None,
+        settings: Optional[ScrapperSettings] = None,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            store (RecommendDbClient): Where the cards are stored. Optional,
+                they are only kept in memory if not given.
+            settings (ScrapperSettings): Optional, the settings of the
+                scrapper are used if not given.
+        """
+        settings = settings or get_settings()
+        self.__store = store
+        self.__ttl = settings.cache_ttl
+        self.__lru: LRUCache[str, NewCard] = LRUCache(
+            max_bytes=settings.cache_max_bytes,
+            ttl=settings.cache_ttl,
+            sizeof=_sizeof_card,
+        )
+
+        # Fetch in flight for each page
+        self.__in_flight: dict[str, asyncio.Task[NewCard]] = {}
+        self.__coalesced = 0
+        self.__stored = 0
+
+    ###########################################################################
+    # Properties
+    ###########################################################################
+    @property
+    def stats(self) -> ScrapeCacheStats:
+        """
+        Returns the counters of the cache
+        """
+        return ScrapeCacheStats(
+            **self.__lru.stats.model_dump(),
+            in_flight=len(self.__in_flight),
+            coalesced=self.__coalesced,
+            stored=self.__stored,
+        )
+
+    ###########################################################################
+    # Methods
+    ###########################################################################
+    async def get(
+        self, url: str, fetch: Callable[[str], Awaitable[NewCard]]
+    ) -> NewCard:
+        """
+        Returns the card of the page
+
+        Args:
+            url (str): Url of the page
+            fetch (Callable): Scraps the card of the page. Only called if the
+                card is not cached and nobody is fetching it already.
+
+        Returns:
+            NewCard
+
+        Raises:
+            Whatever `fetch` raises. The failures are not cached.
+        """
+        key = normalize_url(url)
+        if self.__ttl:
+            card = self.__lru.get(key)
+            if card is not None:
+                return card.model_copy()
+
+        task = self.__in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self.__load(key, url, fetch))
+            self.__in_flight[key] = task
+            task.add_done_callback(lambda done: self.__done(key, done))
+        else:
+            self.__coalesced += 1
+
+        # A scrap that is cancelled doesn't cancel the fetch the others wait for
+        card = await asyncio.shield(task)
+        return card.model_copy()
+
+    def clear(self) -> None:
+        """
+        Drops the cards kept in memory
+        """
+        self.__lru.clear()
+
+    ###########################################################################
+    # Methods: privates
+    ###########################################################################
+    async def __load(
+        self, key: str, url: str, fetch: Callable[[str], Awaitable[NewCard]]
+    ) -> NewCard:
+        """
+        Reads the card from the db, or fetches it and stores it
+        """
+        if not self.__ttl:
+            return await fetch(url)
+
+        card = await self.__read(key)
+        if card is not None:
+            self.__stored += 1
+        else:
+            card = await fetch(url)
+            await self.__write(key, card)
+
+        self.__lru.set(key, card)
+        return card
+
+    async def __read(self, key: str) -> Optional[NewCard]:
+        """
+        Card stored in the db. A failing db only costs a fetch.
+        """
+        if self.__store is None:
+            return None
+
+        try:
+            return await self.__store.get_scrape(key)
+        except RecommendAppDbError as err:
+            LOGGER.warning("Failed to read the scrape of %s: %s", key, err)
+            return None
+
+    async def __write(self, key: str, card: NewCard) -> None:
+        """
+        Stores the card in the db. A failing db only costs a fetch later.
+        """
+        if self.__store is None:
+            return
+
+        try:
+            await self.__store.add_scrape(key, card, self.__ttl)
+        except RecommendAppDbError as err:
+            LOGGER.warning("Failed to store the scrape of %s: %s", key, err)
+
+    def __done(self, key: str, task: "asyncio.Task[NewCard]") -> None:
+        """
+        The fetch of the page is over, the next scrap starts a new one
+        """
+        if self.__in_flight.get(key) is task:
+            del self.__in_flight[key]
+
+        # The failure is raised to the waiters. Retrieve it in case they were
+        # all cancelled, so that it isn't reported as never retrieved.
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,44 @@
+"""
+Module: exceptions
+==================
+
+This module defines the exceptions of the fetch of the pages that tell the
+failures of the site apart from the failures of the page. They inherit from
+the base `RecommendAppError` class, like the other errors of the scrapper.
+"""
+
+# Builtin imports
+from typing import Optional
+
+# Local imports
+from ..exceptions import RecommendAppError
+
+
+class RecommendScrapperHostError(RecommendAppError):
+    """
+    Raised when the site of the page fails the fetch: it couldn't be reached,
+    it timed out, it answered with a 5xx or it asked to slow down with a 429.
+    These failures count against the circuit of the host, see `guard`.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class RecommendScrapperHostUnavailable(RecommendAppError):
+    """
+    Raised without fetching the page when the circuit of its host is open:
+    the host failed too many of the last fetches, or asked to slow down.
+    Nothing was fetched, the failure is not the page's.
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,302 @@
+"""
+Extractors of the sites most of the cards come from.
+
+The generic `Scrapper` builds a tree of the title, meta and script tags of
+the page and looks for the data in the ld+json, og, meta and title tags, in
+that order. The pages of a known site carry their data in the same tags every
+time: the extractor of the site scans the text of the page for these tags
+only, without building a tree.
+
+The extractor is picked by the hostname of the url, a site registered as
+`netflix.com` also matches `www.netflix.com`. When the page misses one of the
+fields the extractor expects from the site, the generic `Scrapper` fills in
+the missing ones.
+"""
+
+# Builtin imports
+import html
+import json
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Union
+from urllib.parse import urlsplit
+
+# Local imports
+from .scrapper import LDJSON_TYPE, Scrapper
+from .streaming import detect_encoding
+
+ScrappedData = dict[str, Optional[str]]
+
+# -----------------------------------------------------------------------------#
+# Constants
+# -----------------------------------------------------------------------------#
+LDJSON_PATTERN = re.compile(
+    r"<script\b[^>]*\btype\s*=\s*[\"']?"
+    + re.escape(LDJSON_TYPE)
+    + r"[^>]*>(.*?)</script",
+    re.IGNORECASE | re.DOTALL,
+)
+META_PATTERN = re.compile(r"<meta\b([^>]*)>", re.IGNORECASE)
+ATTR_PATTERN = re.compile(
+    r"""([^\s=/>]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""", re.DOTALL
+)
+TITLE_PATTERN = re.compile(r"<title\b[^>]*>(.*?)</title", re.IGNORECASE | re.DOTALL)
+
+# Ld+json key of each field
+LDJSON_KEYS = {
+    "url": "url",
+    "title": "name",
+    "description": "description",
+    "thumbnail": "image",
+}
+# Og property of each field
+OG_PROPERTIES = {
+    "url": "og:url",
+    "title": "og:title",
+    "description": "og:description",
+    "thumbnail": "og:image",
+}
+
+# -----------------------------------------------------------------------------#
+# Class
+# -----------------------------------------------------------------------------#
+
+
+class SiteExtractor(ABC):
+    """
+    Extracts the card data from the pages of a site
+
+    Attributes:
+        hosts (tuple[str]): Hostnames of the site, their subdomains included
+        fields (tuple[str]): Fields the pages of the site carry. The generic
+            scrapper fills in the ones a page misses.
+    """
+
+    hosts: tuple[str, ...] = ()
+    fields: tuple[str, ...] = ("url", "title", "description", "thumbnail")
+
+    @abstractmethod
+    def extract(self, text: str) -> ScrappedData:
+        """
+        Extract the data of the page. Only the fields found are returned.
+
+        Args:
+            text (str): Content of the page
+
+        Returns:
+            dict
+        """
+
+
+class NetflixExtractor(SiteExtractor):
+    """
+    The title pages of Netflix describe the title in an ld+json script, some
+    of them only in og tags
+    """
+
+    hosts = ("netflix.com",)
+
+    def extract(self, text: str) -> ScrappedData:
+        schema = find_ldjson(text)
+        data: ScrappedData = {
+            key: schema[name] for key, name in LDJSON_KEYS.items() if name in schema
+        }
+        if len(data) < len(LDJSON_KEYS):
+            _, props = find_metas(text)
+            for key, prop in OG_PROPERTIES.items():
+                if key not in data and prop in props:
+                    data[key] = props[prop]
+        return data
+
+
+class PrimeVideoExtractor(SiteExtractor):
+    """
+    The detail pages of Prime Video carry a `title` and a `description` meta
+    tag, and sometimes the og tags. Each field is looked for in the ld+json,
+    og and meta tags, in the order of the generic `Scrapper`.
+    """
+
+    hosts = ("primevideo.com",)
+    fields = ("title", "description")
+
+    def extract(self, text: str) -> ScrappedData:
+        schema = find_ldjson(text)
+        names, props = find_metas(text)
+        data: ScrappedData = {}
+        for key, name in LDJSON_KEYS.items():
+            if name in schema:
+                data[key] = schema[name]
+            elif OG_PROPERTIES[key] in props:
+                data[key] = props[OG_PROPERTIES[key]]
+            elif key in ("title", "description") and key in names:
+                data[key] = names[key]
+        return data
+
+
+class OpenGraphExtractor(SiteExtractor):
+    """
+    The sites rendering their og tags, falling back to the title of the page
+    """
+
+    fields = ("title",)
+
+    def __init__(self, *hosts: str):
+        self.hosts = hosts
+
+    def extract(self, text: str) -> ScrappedData:
+        _, props = find_metas(text)
+        data: ScrappedData = {
+            key: props[prop] for key, prop in OG_PROPERTIES.items() if prop in props
+        }
+        if "title" not in data:
+            title = find_title(text)
+            if title is not None:
+                data["title"] = title
+        return data
+
+
+# -----------------------------------------------------------------------------#
+# Functions: Registry
+# -----------------------------------------------------------------------------#
+__EXTRACTORS: dict[str, SiteExtractor] = {}
+
+
+def register(extractor: SiteExtractor) -> None:
+    """
+    Registers the extractor for its hosts. Replaces the extractor a host
+    already has.
+
+    Args:
+        extractor (SiteExtractor): Extractor of a site
+    """
+    for host in extractor.hosts:
+        __EXTRACTORS[host.lower()] = extractor
+
+
+def get_extractor(url: Optional[str]) -> Optional[SiteExtractor]:
+    """
+    Returns the extractor of the site of the url, None if the site has none.
+    The hostname is matched, then its parent domains.
+
+    Args:
+        url (str): Url of the page. Optional.
+    """
+    if not url or not __EXTRACTORS:
+        return None
+
+    try:
+        hostname = urlsplit(url).hostname
+    except ValueError:
+        return None
+
+    labels = (hostname or "").split(".")
+    for index in range(len(labels) - 1):
+        extractor = __EXTRACTORS.get(".".join(labels[index:]))
+        if extractor is not None:
+            return extractor
+    return None
+
+
+def extract(
+    content: Union[str, bytes],
+    encoding: Optional[str] = None,
+    url: Optional[str] = None,
+) -> ScrappedData:
+    """
+    Extracts the data of the page with the extractor of its site, completed
+    by the generic `Scrapper` if the page misses some of the fields of the
+    site. Sites with no extractor go through the generic `Scrapper`.
+
+    Args:
+        content (str | bytes): Content of the page
+        encoding (str): Encoding of the content if it is bytes. Optional.
+        url (str): Url of the page. Optional.
+
+    Returns:
+        dict
+    """
+    extractor = get_extractor(url)
+    if extractor is None:
+        return Scrapper(content, encoding=encoding).scrap()
+
+    text = decode(content, encoding)
+    data: ScrappedData = {
+        key: value for key, value in extractor.extract(text).items() if value
+    }
+    if all(field in data for field in extractor.fields):
+        return data
+
+    generic = Scrapper(content, encoding=encoding).scrap()
+    return {**generic, **data}
+
+
+# -----------------------------------------------------------------------------#
+# Functions: Helpers
+# -----------------------------------------------------------------------------#
+
+
+def decode(content: Union[str, bytes], encoding: Optional[str] = None) -> str:
+    """
+    Text of the page, see `detect_encoding` for its encoding. The bytes that
+    are not valid in the encoding are replaced.
+    """
+    if isinstance(content, str):
+        return content
+    return content.decode(detect_encoding(content, encoding), errors="replace")
+
+
+def find_ldjson(text: str) -> dict[str, Any]:
+    """
+    First ld+json object of the page. Empty if it has none, or if it isn't a
+    valid json object.
+    """
+    match = LDJSON_PATTERN.search(text)
+    if match is None:
+        return {}
+
+    try:
+        schema = json.loads(match.group(1))
+    except ValueError:
+        return {}
+    return schema if isinstance(schema, dict) else {}
+
+
+def find_metas(text: str) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Content of the meta tags of the page, by name and by property. The first
+    tag of a name or a property wins.
+    """
+    names: dict[str, str] = {}
+    props: dict[str, str] = {}
+    for match in META_PATTERN.finditer(text):
+        attrs = {
+            name.lower(): html.unescape(first or second or third)
+            for name, first, second, third in ATTR_PATTERN.findall(match.group(1))
+        }
+        content = attrs.get("content")
+        if content is None:
+            continue
+
+        if "property" in attrs:
+            props.setdefault(attrs["property"], content)
+        if "name" in attrs:
+            names.setdefault(attrs["name"], content)
+
+    return names, props
+
+
+def find_title(text: str) -> Optional[str]:
+    """
+    Title of the page. None if it has none.
+    """
+    match = TITLE_PATTERN.search(text)
+    return html.unescape(match.group(1)) if match else None
+
+
+# -----------------------------------------------------------------------------#
+# Registered sites
+# -----------------------------------------------------------------------------#
+register(NetflixExtractor())
+register(PrimeVideoExtractor())
+register(OpenGraphExtractor("disneyplus.com"))
+register(OpenGraphExtractor("discoveryplus.com"))
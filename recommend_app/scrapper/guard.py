@@ -0,0 +1,266 @@
+"""
+Guards the fetches of each host, so that a site that misbehaves can't hold up
+the scraps of the others.
+
+Every fetch of `from_url_async` and `revalidate` takes a slot of its host
+first. The slots of a host are bounded by `SCRAPPER_HOST_CONCURRENCY`
+fetches at once and `SCRAPPER_HOST_RATE` fetches a second, a fetch that waits
+longer than `SCRAPPER_TOTAL_TIMEOUT` for its slot fails. Each host has a
+circuit breaker (see `limits.CircuitBreaker`): the fetches that time out, that
+can't reach the site, that are answered with a 5xx or that take longer than
+`SCRAPPER_BREAKER_SLOW_SECONDS` count as failed, and once the circuit is open
+the fetches of the host fail fast. A 429, or a 5xx with a Retry-After, opens
+the circuit right away for as long as the site asked.
+
+The state of the circuits is reported on the health page, see `stats`.
+"""
+
+# Builtin imports
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from urllib.parse import urlsplit
+
+# Project specific imports
+from pydantic import BaseModel
+
+# Local imports
+from ..exceptions import RecommendAppError
+from .exceptions import RecommendScrapperHostError, RecommendScrapperHostUnavailable
+from .limits import CLOSED, CircuitBreaker, TokenBucket
+from .settings import ScrapperSettings, get_settings
+
+# -----------------------------------------------------------------------------#
+# Constants
+# -----------------------------------------------------------------------------#
+# Hosts tracked at most. The least recently fetched ones that are idle are
+# forgotten first.
+MAX_HOSTS = 1024
+
+# -----------------------------------------------------------------------------#
+# Models
+# -----------------------------------------------------------------------------#
+
+
+class GuardStats(BaseModel):
+    """
+    Counters of the guard of the hosts
+
+    Args:
+        hosts (int): Hosts tracked
+        open (list[str]): Hosts whose circuit is open, or half-open
+        rejected (int): Fetches that failed fast because their circuit was
+            open
+        throttled (int): Responses that asked to slow down (429)
+    """
+
+    hosts: int = 0
+    open: list[str] = []
+    rejected: int = 0
+    throttled: int = 0
+
+
+class _Host:
+    """
+    Limits of the fetches of a host
+    """
+
+    def __init__(self, settings: ScrapperSettings):
+        self.semaphore = asyncio.Semaphore(settings.host_concurrency)
+        self.bucket = TokenBucket(settings.host_rate)
+        self.breaker = CircuitBreaker(
+            settings.breaker_window,
+            settings.breaker_min_fetches,
+            settings.breaker_error_ratio,
+            settings.breaker_cooldown_seconds,
+        )
+        # Fetches holding or waiting for a slot
+        self.users = 0
+
+
+# -----------------------------------------------------------------------------#
+# Class
+# -----------------------------------------------------------------------------#
+
+
+class HostGuard:
+    """
+    Rate limits, concurrency caps and circuit breakers of the hosts
+    """
+
+    def __init__(self, settings: ScrapperSettings):
+        """
+        Initialize the guard
+
+        Args:
+            settings (ScrapperSettings): Settings of the scrapper
+        """
+        self.__settings = settings
+        self.__hosts: OrderedDict[str, _Host] = OrderedDict()
+        self.__rejected = 0
+        self.__throttled = 0
+
+    ###########################################################################
+    # Properties
+    ###########################################################################
+    @property
+    def stats(self) -> GuardStats:
+        """
+        Returns the counters of the guard
+        """
+        return GuardStats(
+            hosts=len(self.__hosts),
+            open=sorted(
+                name
+                for name, host in self.__hosts.items()
+                if host.breaker.state != CLOSED
+            ),
+            rejected=self.__rejected,
+            throttled=self.__throttled,
+        )
+
+    ###########################################################################
+    # Methods
+    ###########################################################################
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """
+        Waits for room for a fetch of the url, and records its outcome.
+
+        A `RecommendScrapperHostError` raised in the block counts as a failed
+        fetch, so does a block that takes longer than the slow threshold. The
+        other `RecommendAppError` are failures of the page, not of the site.
+
+        Args:
+            url (str): Url to be fetched
+
+        Raises:
+            RecommendScrapperHostUnavailable if the circuit of the host is open
+            RecommendAppError if no slot was free within the total timeout
+        """
+        name = get_host(url)
+        host = self.__get(name)
+        breaker = host.breaker
+        probe = breaker.state != CLOSED
+        if not breaker.allow():
+            self.__rejected += 1
+            # A probe running: retry once it has had its time
+            retry_after = breaker.retry_after or self.__settings.total_timeout
+            raise RecommendScrapperHostUnavailable(
+                f"{name} is failing, try again later", retry_after=retry_after
+            )
+
+        host.users += 1
+        try:
+            await self.__acquire(host, name)
+            try:
+                started = time.monotonic()
+                yield
+            except RecommendScrapperHostError as err:
+                self.__failed(breaker, err)
+                raise
+            except RecommendAppError:
+                # The site answered
+                breaker.success()
+                raise
+            else:
+                if time.monotonic() - started > self.__settings.breaker_slow_seconds:
+                    breaker.failure()
+                else:
+                    breaker.success()
+            finally:
+                host.semaphore.release()
+        finally:
+            if probe:
+                # A probe that ended without an outcome leaves the next fetch
+                # probe the site
+                breaker.cancel()
+            host.users -= 1
+
+    ###########################################################################
+    # Methods: privates
+    ###########################################################################
+    def __get(self, name: str) -> _Host:
+        """
+        Limits of the host, created on its first fetch
+        """
+        host = self.__hosts.get(name)
+        if host is not None:
+            self.__hosts.move_to_end(name)
+            return host
+
+        if len(self.__hosts) >= MAX_HOSTS:
+            idle = [key for key, value in self.__hosts.items() if not value.users]
+            for key in idle[: len(self.__hosts) - MAX_HOSTS + 1]:
+                del self.__hosts[key]
+
+        host = self.__hosts[name] = _Host(self.__settings)
+        return host
+
+    async def __acquire(self, host: _Host, name: str) -> None:
+        """
+        Takes a slot of the host and a token of its bucket
+        """
+        acquired = False
+        try:
+            async with asyncio.timeout(self.__settings.total_timeout):
+                await host.semaphore.acquire()
+                acquired = True
+                await host.bucket.acquire()
+        except TimeoutError as err:
+            if acquired:
+                host.semaphore.release()
+            raise RecommendAppError(
+                f"Too many fetches of {name}, try again later"
+            ) from err
+        except BaseException:
+            if acquired:
+                host.semaphore.release()
+            raise
+
+    def __failed(
+        self, breaker: CircuitBreaker, err: RecommendScrapperHostError
+    ) -> None:
+        """
+        Records a failure of the site. A site that asked to slow down opens
+        its circuit for as long as it asked.
+        """
+        if err.status_code == 429:
+            self.__throttled += 1
+        if err.status_code == 429 or err.retry_after is not None:
+            seconds = err.retry_after
+            if seconds is None:
+                seconds = self.__settings.breaker_cooldown_seconds
+            breaker.trip(min(seconds, self.__settings.breaker_max_cooldown_seconds))
+        else:
+            breaker.failure()
+
+
+# -----------------------------------------------------------------------------#
+# Functions
+# -----------------------------------------------------------------------------#
+__GUARD: Optional[HostGuard] = None
+
+
+def get_guard() -> HostGuard:
+    """
+    Returns the guard shared by the fetches, creating it on first use
+    """
+    global __GUARD
+    if __GUARD is None:
+        __GUARD = HostGuard(get_settings())
+    return __GUARD
+
+
+def get_host(url: str) -> str:
+    """
+    Host of the url. The url as is if it has none.
+    """
+    if not isinstance(url, str):
+        return str(url)
+    try:
+        return urlsplit(url).hostname or url
+    except ValueError:
+        return url
@@ -0,0 +1,254 @@
+"""
+Limits of the rate of the fetches.
+
+A `TokenBucket` lets `rate` fetches a second through, with bursts of up to
+`capacity` fetches after a quiet period. The fetches beyond the budget wait
+for their turn, in the order they arrived.
+
+A `CircuitBreaker` stops the fetches of a site that keeps failing. It opens
+once `error_ratio` of the last `window` fetches failed (at least
+`min_fetches` of them), and lets no fetch through for `cooldown` seconds.
+The next fetch then probes the site, alone: the circuit closes if it
+succeeds and opens again if it fails.
+"""
+
+# Builtin imports
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Optional
+
+# -----------------------------------------------------------------------------#
+# Constants
+# -----------------------------------------------------------------------------#
+# States of a circuit
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+# -----------------------------------------------------------------------------#
+# Class
+# -----------------------------------------------------------------------------#
+
+
+class TokenBucket:
+    """
+    Token bucket of an event loop
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the bucket, full
+
+        Args:
+            rate (float): Tokens added per second
+            capacity (float): Tokens the bucket holds at most. Optional, one
+                second of tokens (at least one token) if not given.
+        """
+        self.__rate = rate
+        self.__capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.__tokens = self.__capacity
+        self.__updated_at = time.monotonic()
+        # The waiters take their token in turn
+        self.__lock = asyncio.Lock()
+
+    ###########################################################################
+    # Properties
+    ###########################################################################
+    @property
+    def rate(self) -> float:
+        """
+        Returns the tokens added per second
+        """
+        return self.__rate
+
+    @property
+    def tokens(self) -> float:
+        """
+        Returns the tokens available now
+        """
+        self.__refill()
+        return self.__tokens
+
+    ###########################################################################
+    # Methods
+    ###########################################################################
+    def try_acquire(self) -> bool:
+        """
+        Takes a token if one is available
+
+        Returns:
+            bool: False if the bucket is empty
+        """
+        if self.__lock.locked():
+            return False
+
+        self.__refill()
+        if self.__tokens < 1:
+            return False
+
+        self.__tokens -= 1
+        return True
+
+    async def acquire(self) -> None:
+        """
+        Takes a token, waiting for one if the bucket is empty
+        """
+        async with self.__lock:
+            self.__refill()
+            if self.__tokens < 1:
+                await asyncio.sleep((1 - self.__tokens) / self.__rate)
+                self.__refill()
+            self.__tokens -= 1
+
+    ###########################################################################
+    # Methods: privates
+    ###########################################################################
+    def __refill(self) -> None:
+        """
+        Adds the tokens earned since the last update
+        """
+        now = time.monotonic()
+        elapsed, self.__updated_at = now - self.__updated_at, now
+        self.__tokens = min(self.__capacity, self.__tokens + elapsed * self.__rate)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of a site. Not thread safe, it is meant to be used from
+    the event loop.
+    """
+
+    def __init__(
+        self,
+        window: int,
+        min_fetches: int,
+        error_ratio: float,
+        cooldown: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the breaker, closed
+
+        Args:
+            window (int): Last fetches the ratio of failures is computed on
+            min_fetches (int): Fetches of the window before the circuit can
+                open
+            error_ratio (float): Ratio of failed fetches that opens the
+                circuit
+            cooldown (float): Seconds the circuit stays open
+            clock (Callable): Returns the current time in seconds. Optional,
+                `time.monotonic` if not given.
+        """
+        self.__min_fetches = min_fetches
+        self.__error_ratio = error_ratio
+        self.__cooldown = cooldown
+        self.__clock = clock
+        # True for each failed fetch of the window
+        self.__outcomes: deque[bool] = deque(maxlen=window)
+        self.__open_until: Optional[float] = None
+        self.__probing = False
+
+    ###########################################################################
+    # Properties
+    ###########################################################################
+    @property
+    def state(self) -> str:
+        """
+        Returns the state of the circuit: `closed`, `open` or `half-open`
+        once the cooldown is over
+        """
+        if self.__open_until is None:
+            return CLOSED
+        if self.__probing or self.__clock() >= self.__open_until:
+            return HALF_OPEN
+        return OPEN
+
+    @property
+    def retry_after(self) -> float:
+        """
+        Returns the seconds before the circuit lets a fetch through again. 0
+        if it is closed, or if the cooldown is over.
+        """
+        if self.__open_until is None:
+            return 0.0
+        return max(self.__open_until - self.__clock(), 0.0)
+
+    ###########################################################################
+    # Methods
+    ###########################################################################
+    def allow(self) -> bool:
+        """
+        Tells if a fetch can go through. Once the cooldown is over, the first
+        fetch is let through as the probe: it must be followed by `success`,
+        `failure` or `cancel`.
+
+        Returns:
+            bool: False if the fetch must fail fast
+        """
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == OPEN or self.__probing:
+            return False
+
+        self.__probing = True
+        return True
+
+    def success(self) -> None:
+        """
+        Records a fetch that succeeded. Closes the circuit after a probe.
+        """
+        if self.__probing:
+            self.__close()
+        elif self.__open_until is None:
+            self.__outcomes.append(False)
+
+    def failure(self) -> None:
+        """
+        Records a fetch that failed. Opens the circuit after a probe, or if
+        too many of the last fetches failed.
+        """
+        if self.__probing:
+            self.trip()
+            return
+        if self.__open_until is not None:
+            return
+
+        self.__outcomes.append(True)
+        failed = sum(self.__outcomes)
+        if len(
+            self.__outcomes
+        ) >= self.__min_fetches and failed >= self.__error_ratio * len(self.__outcomes):
+            self.trip()
+
+    def trip(self, seconds: Optional[float] = None) -> None:
+        """
+        Opens the circuit
+
+        Args:
+            seconds (float): Seconds it stays open. Optional, the cooldown if
+                not given.
+        """
+        seconds = self.__cooldown if seconds is None else seconds
+        self.__open_until = self.__clock() + seconds
+        self.__outcomes.clear()
+        self.__probing = False
+
+    def cancel(self) -> None:
+        """
+        Drops the probe that was let through without recording its outcome:
+        the next fetch probes the site instead
+        """
+        self.__probing = False
+
+    ###########################################################################
+    # Methods: privates
+    ###########################################################################
+    def __close(self) -> None:
+        """
+        Closes the circuit, with a fresh window
+        """
+        self.__open_until = None
+        self.__outcomes.clear()
+        self.__probing = False
@@ -0,0 +1,205 @@
+"""
+Parses the fetched pages, optionally in a pool of processes.
+
+Parsing a page and extracting its data is CPU bound: tens of milliseconds on
+a large page, all of it holding the GIL of the worker serving the request.
+With `SCRAPPER_PARSE_WORKERS` set, the bytes of the page are sent to a pool of
+processes that return the extracted data. A parse taking longer than
+`SCRAPPER_PARSE_TIMEOUT` is given up on, and a parse that hasn't started yet
+when its request is cancelled is dropped from the pool.
+
+The processes are spawned, not forked, as the app runs threads (the db
+driver, the hasher) that a fork would copy in an unknown state.
+"""
+
+# Builtin imports
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+# Local imports
+from ..exceptions import RecommendAppError
+from .extractors import extract
+from .settings import get_settings
+from .streaming import Page
+
+LOGGER = logging.getLogger(__name__)
+
+ScrappedData = dict[str, Optional[str]]
+
+# -----------------------------------------------------------------------------#
+# Functions
+# -----------------------------------------------------------------------------#
+
+
+def parse_page(
+    content: bytes, encoding: Optional[str] = None, url: Optional[str] = None
+) -> ScrappedData:
+    """
+    Extracts the data of the page, with the extractor of its site if it has
+    one (see `extractors`). Runs in the processes of the pool, so it only
+    takes and returns picklable values.
+
+    Args:
+        content (bytes): Content of the page
+        encoding (str): Encoding of the content. Optional.
+        url (str): Url of the page. Optional.
+
+    Returns:
+        dict
+    """
+    return extract(content, encoding, url)
+
+
+# -----------------------------------------------------------------------------#
+# Class
+# -----------------------------------------------------------------------------#
+
+
+class ParsePool:
+    """
+    Parses the pages in a pool of processes, or inline if it has no workers
+    """
+
+    def __init__(self, max_workers: int, timeout: float):
+        """
+        Initialize the pool
+
+        Args:
+            max_workers (int): Processes of the pool. 0 parses the pages in
+                the calling process.
+            timeout (float): Seconds a parse in the pool can take
+        """
+        self.__max_workers = max_workers
+        self.__timeout = timeout
+        self.__executor: Optional[ProcessPoolExecutor] = None
+        # The blocking backend parses from threads
+        self.__lock = threading.Lock()
+
+    ###########################################################################
+    # Properties
+    ###########################################################################
+    @property
+    def max_workers(self) -> int:
+        """
+        Returns the number of processes of the pool
+        """
+        return self.__max_workers
+
+    ###########################################################################
+    # Methods
+    ###########################################################################
+    async def parse(self, page: Page, url: str) -> ScrappedData:
+        """
+        Extracts the data of the page without blocking the event loop.
+        Cancelling the call drops the parse if it hasn't started yet.
+
+        Args:
+            page (Page): Page that was fetched
+            url (str): Url of the page, for the errors
+
+        Returns:
+            dict
+
+        Raises:
+            RecommendAppError if the parse times out or if the pool is broken
+        """
+        if not self.__max_workers:
+            return parse_page(page.content, page.encoding, url)
+
+        future = self.__submit(page, url)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.__timeout)
+        except TimeoutError as err:
+            raise RecommendAppError(f"Parsing {url} timed out") from err
+        except BrokenProcessPool as err:
+            self.__reset()
+            raise RecommendAppError(f"Failed to parse {url}") from err
+
+    def parse_blocking(self, page: Page, url: str) -> ScrappedData:
+        """
+        Extracts the data of the page, waiting for the result. See `parse`.
+        """
+        if not self.__max_workers:
+            return parse_page(page.content, page.encoding, url)
+
+        future = self.__submit(page, url)
+        try:
+            return future.result(timeout=self.__timeout)
+        except TimeoutError as err:
+            future.cancel()
+            raise RecommendAppError(f"Parsing {url} timed out") from err
+        except BrokenProcessPool as err:
+            self.__reset()
+            raise RecommendAppError(f"Failed to parse {url}") from err
+
+    def shutdown(self) -> None:
+        """
+        Shuts the processes down. The parses that haven't started are dropped.
+        The pool is created again if it is used afterwards.
+        """
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    ###########################################################################
+    # Methods: privates
+    ###########################################################################
+    def __submit(self, page: Page, url: str) -> "Future[ScrappedData]":
+        """
+        Sends the page to the pool, creating the pool if needed
+        """
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ProcessPoolExecutor(
+                    max_workers=self.__max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            executor = self.__executor
+
+        try:
+            return executor.submit(parse_page, page.content, page.encoding, url)
+        except (BrokenProcessPool, RuntimeError) as err:
+            # RuntimeError: shut down in the meantime
+            self.__reset()
+            raise RecommendAppError(f"Failed to parse {url}") from err
+
+    def __reset(self) -> None:
+        """
+        Drops a broken pool, the next parse creates a new one
+        """
+        LOGGER.warning("The parse pool is broken, it will be created again")
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# -----------------------------------------------------------------------------#
+# Functions
+# -----------------------------------------------------------------------------#
+__POOL: Optional[ParsePool] = None
+
+
+def get_pool() -> ParsePool:
+    """
+    Returns the pool shared by the scraps, creating it on first use
+    """
+    global __POOL
+    if __POOL is None:
+        settings = get_settings()
+        __POOL = ParsePool(settings.parse_workers, settings.parse_timeout)
+    return __POOL
+
+
+def shutdown() -> None:
+    """
+    Shuts the processes of the shared pool down
+    """
+    if __POOL is not None:
+        __POOL.shutdown()
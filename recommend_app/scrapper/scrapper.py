@@ -4,10 +4,21 @@ Scraps the information from a webpage using beautifulsoup
 
 # Builtin imports
 import json
-from typing import Optional
+from typing import Optional, Union
 
 # Project specific imports
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+# Local imports
+from .streaming import detect_encoding
+
+# -----------------------------------------------------------------------------#
+# Constants
+# -----------------------------------------------------------------------------#
+# Only these tags are read, the rest of the page is not built into the tree
+PARSED_TAGS = ["title", "meta", "script"]
+
+LDJSON_TYPE = "application/ld+json"
 
 # -----------------------------------------------------------------------------#
 # Class
@@ -19,11 +30,24 @@ class Scrapper:
     Takes in the html content and scraps the information
 
     Args:
-        content (str): Content of a webpage
+        content (str | bytes): Content of a webpage. Can be only its head.
+            Bytes are parsed as is, without being decoded to text first.
+        encoding (str): Declared encoding of the content if it is bytes.
+            Optional, see `detect_encoding`.
     """
 
-    def __init__(self, content: str):
-        self.__soup = BeautifulSoup(content, "lxml")
+    def __init__(self, content: Union[str, bytes], encoding: Optional[str] = None):
+        self.__soup = BeautifulSoup(
+            content,
+            "lxml",
+            parse_only=SoupStrainer(PARSED_TAGS),
+            # The encoding is known, beautifulsoup doesn't guess it
+            from_encoding=(
+                detect_encoding(content, encoding)
+                if isinstance(content, bytes)
+                else None
+            ),
+        )
 
         # Keys we need to extract from the webpage
         self.__keys = ["url", "title", "description", "thumbnail"]
@@ -32,6 +56,13 @@ class Scrapper:
         # as a NewCard
         self.__extracted: dict[str, Optional[str]] = {}
 
+        # Candidates of each source, filled by a single walk of the tree. The
+        # first tag of a kind wins, like `soup.find` would return it.
+        self.__ldjson: Optional[Tag] = None
+        self.__og: dict[str, str] = {}
+        self.__meta: dict[str, str] = {}
+        self.__title: Optional[Tag] = None
+
     # -------------------------------------------------------------------------#
     # Methods
     # -------------------------------------------------------------------------#
@@ -47,6 +78,8 @@ class Scrapper:
         Returns:
             Dict
         """
+        self.__index()
+
         for method in (
             self.__from_ldjson,
             self.__from_og,
@@ -62,12 +95,41 @@ class Scrapper:
     # -------------------------------------------------------------------------#
     # Methods: Privates
     # -------------------------------------------------------------------------#
+    def __index(self) -> None:
+        """
+        Walks the title, meta and script tags once and keeps the candidates of
+        each source. It is a plain walk: `find_all` spends more time matching
+        the tags than walking them.
+        """
+        for tag in self.__soup.descendants:
+            if not isinstance(tag, Tag):
+                continue
+
+            if tag.name == "meta":
+                content = tag.get("content")
+                if not isinstance(content, str):
+                    continue
+
+                prop = tag.get("property")
+                if isinstance(prop, str):
+                    self.__og.setdefault(prop, content)
+
+                name = tag.get("name")
+                if isinstance(name, str):
+                    self.__meta.setdefault(name, content)
+
+            elif tag.name == "script":
+                if self.__ldjson is None and tag.get("type") == LDJSON_TYPE:
+                    self.__ldjson = tag
+
+            elif tag.name == "title" and self.__title is None:
+                self.__title = tag
+
     def __from_ldjson(self) -> None:
         """
         Extract the data from the ld+json tag
         """
-        schema = self.__soup.find("script", type="application/ld+json")
-        if not schema:
+        if not self.__ldjson:
             return
 
         mapper = {
@@ -76,7 +138,7 @@ class Scrapper:
             "description": "description",
             "thumbnail": "image",
         }
-        schema_dict = json.loads(schema.text)
+        schema_dict = json.loads(self.__ldjson.text)
         for key, schema_key in mapper.items():
             if schema_key in schema_dict:
                 self.__extracted[key] = schema_dict[schema_key]
@@ -94,14 +156,10 @@ class Scrapper:
         }
 
         for key, og_key in mapper.items():
-            if key not in self.__keys:
-                continue
-
-            prop = self.__soup.find("meta", property=og_key, content=True)
-            if not prop:
+            if key not in self.__keys or og_key not in self.__og:
                 continue
 
-            self.__extracted[key] = prop["content"]  # type: ignore
+            self.__extracted[key] = self.__og[og_key]
             self.__keys.remove(key)
 
     def __from_meta(self) -> None:
@@ -110,22 +168,18 @@ class Scrapper:
         """
         mapper = {"title": "title", "description": "description"}
         for key, meta_key in mapper.items():
-            if key not in self.__keys:
-                continue
-
-            meta = self.__soup.find("meta", attrs={"name": meta_key}, content=True)
-            if not meta:
+            if key not in self.__keys or meta_key not in self.__meta:
                 continue
 
-            self.__extracted[key] = meta["content"]  # type: ignore
+            self.__extracted[key] = self.__meta[meta_key]
             self.__keys.remove(key)
 
     def __get_title(self) -> None:
         """
         If nothing works, atleast try to retrieve the title of the page
         """
-        if "title" not in self.__keys or not self.__soup.title:
+        if "title" not in self.__keys or not self.__title:
             return
 
-        self.__extracted["title"] = self.__soup.title.text
+        self.__extracted["title"] = self.__title.text
         self.__keys.remove("title")
@@ -0,0 +1,189 @@
+"""
+Settings of the scrapper
+
+The settings are loaded from the environment, on first use.
+
+Environment Variables:
+- `SCRAPPER_BACKEND`: `httpx` (default) or `requests`. Backend used by
+                      `from_url_async`.
+- `SCRAPPER_CONNECT_TIMEOUT`: Seconds to connect to the site.
+- `SCRAPPER_READ_TIMEOUT`: Seconds to wait for each chunk of the response.
+- `SCRAPPER_TOTAL_TIMEOUT`: Seconds the whole fetch can take, redirects
+                            included.
+- `SCRAPPER_MAX_REDIRECTS`: Redirects followed before giving up.
+- `SCRAPPER_MAX_CONNECTIONS`: Connections of the shared client.
+- `SCRAPPER_MAX_KEEPALIVE_CONNECTIONS`: Idle connections kept alive.
+- `SCRAPPER_KEEPALIVE_EXPIRY`: Seconds an idle connection is kept alive.
+- `SCRAPPER_STREAM_HEAD`: Stop downloading a page once its head is read.
+                          True by default.
+- `SCRAPPER_MAX_BYTES`: Bytes of a page downloaded at most. 1 MiB by default.
+- `SCRAPPER_CACHE_TTL`: Seconds a scrapped card is reused. A day by default,
+                        0 disables the cache.
+- `SCRAPPER_CACHE_MAX_BYTES`: Size limit of the in-memory cache of the cards.
+- `SCRAPPER_BATCH_CONCURRENCY`: Pages of the batches fetched at once, all the
+                                batches together.
+- `SCRAPPER_HOST_CONCURRENCY`: Pages fetched at once from the same host,
+                               batches or not.
+- `SCRAPPER_HOST_RATE`: Pages fetched per second from the same host.
+- `SCRAPPER_BREAKER_WINDOW`: Last fetches of a host its circuit looks at.
+- `SCRAPPER_BREAKER_MIN_FETCHES`: Fetches of the window before the circuit
+                                  of a host can open.
+- `SCRAPPER_BREAKER_ERROR_RATIO`: Ratio of failed fetches of the window that
+                                  opens the circuit.
+- `SCRAPPER_BREAKER_SLOW_SECONDS`: Fetches slower than this count as failed.
+- `SCRAPPER_BREAKER_COOLDOWN_SECONDS`: Seconds a circuit stays open.
+- `SCRAPPER_BREAKER_MAX_COOLDOWN_SECONDS`: Longest a circuit stays open when
+                                          the host sends a Retry-After.
+- `SCRAPPER_PARSE_WORKERS`: Processes the pages are parsed in. 0 (default)
+                            parses them in the process of the request.
+- `SCRAPPER_PARSE_TIMEOUT`: Seconds a parse in a process can take.
+"""
+
+# Builtin imports
+import os
+from typing import Any, Final, Literal, Optional
+
+# Project specific imports
+from pydantic import BaseModel, ConfigDict, Field
+
+# -----------------------------------------------------------------------------#
+# Constants
+# -----------------------------------------------------------------------------#
+BACKEND_HTTPX: Final = "httpx"
+BACKEND_REQUESTS: Final = "requests"
+
+# Env variable of each setting
+ENV_VARS: dict[str, str] = {
+    "backend": "SCRAPPER_BACKEND",
+    "connect_timeout": "SCRAPPER_CONNECT_TIMEOUT",
+    "read_timeout": "SCRAPPER_READ_TIMEOUT",
+    "total_timeout": "SCRAPPER_TOTAL_TIMEOUT",
+    "max_redirects": "SCRAPPER_MAX_REDIRECTS",
+    "max_connections": "SCRAPPER_MAX_CONNECTIONS",
+    "max_keepalive_connections": "SCRAPPER_MAX_KEEPALIVE_CONNECTIONS",
+    "keepalive_expiry": "SCRAPPER_KEEPALIVE_EXPIRY",
+    "stream_head": "SCRAPPER_STREAM_HEAD",
+    "max_bytes": "SCRAPPER_MAX_BYTES",
+    "cache_ttl": "SCRAPPER_CACHE_TTL",
+    "cache_max_bytes": "SCRAPPER_CACHE_MAX_BYTES",
+    "batch_concurrency": "SCRAPPER_BATCH_CONCURRENCY",
+    "host_concurrency": "SCRAPPER_HOST_CONCURRENCY",
+    "host_rate": "SCRAPPER_HOST_RATE",
+    "breaker_window": "SCRAPPER_BREAKER_WINDOW",
+    "breaker_min_fetches": "SCRAPPER_BREAKER_MIN_FETCHES",
+    "breaker_error_ratio": "SCRAPPER_BREAKER_ERROR_RATIO",
+    "breaker_slow_seconds": "SCRAPPER_BREAKER_SLOW_SECONDS",
+    "breaker_cooldown_seconds": "SCRAPPER_BREAKER_COOLDOWN_SECONDS",
+    "breaker_max_cooldown_seconds": "SCRAPPER_BREAKER_MAX_COOLDOWN_SECONDS",
+    "parse_workers": "SCRAPPER_PARSE_WORKERS",
+    "parse_timeout": "SCRAPPER_PARSE_TIMEOUT",
+}
+
+# -----------------------------------------------------------------------------#
+# Models
+# -----------------------------------------------------------------------------#
+
+
+class ScrapperSettings(BaseModel):
+    """
+    Settings of the fetch of the pages
+
+    Args:
+        backend (str): `httpx` or `requests`
+        connect_timeout (float): Seconds to connect to the site
+        read_timeout (float): Seconds to wait for each chunk of the response
+        total_timeout (float): Seconds the whole fetch can take
+        max_redirects (int): Redirects followed before giving up
+        max_connections (int): Connections of the shared client
+        max_keepalive_connections (int): Idle connections kept alive
+        keepalive_expiry (float): Seconds an idle connection is kept alive
+        stream_head (bool): Stop downloading a page once its head is read
+        max_bytes (int): Bytes of a page downloaded at most
+        cache_ttl (float): Seconds a scrapped card is reused. 0 disables the
+            cache.
+        cache_max_bytes (int): Size limit of the in-memory cache of the cards
+        batch_concurrency (int): Pages of the batches fetched at once
+        host_concurrency (int): Pages fetched at once from the same host
+        host_rate (float): Pages fetched per second from the same host
+        breaker_window (int): Last fetches of a host its circuit looks at
+        breaker_min_fetches (int): Fetches of the window before the circuit
+            can open
+        breaker_error_ratio (float): Ratio of failed fetches that opens the
+            circuit
+        breaker_slow_seconds (float): Fetches slower than this count as
+            failed
+        breaker_cooldown_seconds (float): Seconds a circuit stays open
+        breaker_max_cooldown_seconds (float): Longest a circuit stays open
+            when the host sends a Retry-After
+        parse_workers (int): Processes the pages are parsed in. 0 parses
+            them in the process of the request.
+        parse_timeout (float): Seconds a parse in a process can take
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    backend: Literal["httpx", "requests"] = BACKEND_HTTPX
+    connect_timeout: float = Field(default=5.0, gt=0)
+    read_timeout: float = Field(default=10.0, gt=0)
+    total_timeout: float = Field(default=15.0, gt=0)
+    max_redirects: int = Field(default=5, ge=0)
+    max_connections: int = Field(default=100, ge=1)
+    max_keepalive_connections: int = Field(default=20, ge=0)
+    keepalive_expiry: float = Field(default=30.0, ge=0)
+    stream_head: bool = True
+    max_bytes: int = Field(default=1024 * 1024, ge=1)
+    cache_ttl: float = Field(default=24 * 60 * 60, ge=0)
+    cache_max_bytes: int = Field(default=4 * 1024 * 1024, ge=0)
+    batch_concurrency: int = Field(default=8, ge=1)
+    host_concurrency: int = Field(default=2, ge=1)
+    host_rate: float = Field(default=5.0, gt=0)
+    breaker_window: int = Field(default=20, ge=1)
+    breaker_min_fetches: int = Field(default=5, ge=1)
+    breaker_error_ratio: float = Field(default=0.5, gt=0, le=1)
+    breaker_slow_seconds: float = Field(default=5.0, gt=0)
+    breaker_cooldown_seconds: float = Field(default=30.0, ge=0)
+    breaker_max_cooldown_seconds: float = Field(default=10 * 60, ge=0)
+    parse_workers: int = Field(default=0, ge=0)
+    parse_timeout: float = Field(default=10.0, gt=0)
+
+    # -------------------------------------------------------------------------#
+    # Class Methods
+    # -------------------------------------------------------------------------#
+    @classmethod
+    def from_env(cls, **overrides: Any) -> "ScrapperSettings":
+        """
+        Loads the settings from the environment.
+
+        Args:
+            overrides: Settings that take precedence over the environment.
+
+        Returns:
+            ScrapperSettings
+
+        Raises:
+            pydantic.ValidationError if a value is not valid.
+        """
+        values: dict[str, Any] = {}
+        for name, env_var in ENV_VARS.items():
+            value = os.getenv(env_var)
+            if value:
+                values[name] = value
+
+        values.update(overrides)
+        return cls(**values)
+
+
+# -----------------------------------------------------------------------------#
+# Functions
+# -----------------------------------------------------------------------------#
+__SETTINGS: Optional[ScrapperSettings] = None
+
+
+def get_settings() -> ScrapperSettings:
+    """
+    Returns the settings of the scrapper, loading them on first use
+    """
+    global __SETTINGS
+    if __SETTINGS is None:
+        __SETTINGS = ScrapperSettings.from_env()
+    return __SETTINGS
@@ -0,0 +1,293 @@
+"""
+Reads the pages incrementally, as bytes.
+
+The scrapper only needs the `<head>` of a page: the title, the meta tags and
+the ld+json script. `PageReader` is fed the chunks of the response as they
+arrive and tells when to stop: once the head is over (an incremental lxml
+parser spots its end, even if `</head>` is missing) or once the byte cap is
+reached. The rest of the page is never downloaded.
+
+The page is handed to the parser as bytes, with its encoding found the way
+browsers do it (`detect_encoding`): the content is never decoded to text
+first, nor is its charset guessed from statistics over the bytes.
+"""
+
+# Builtin imports
+import codecs
+import re
+from datetime import datetime, timezone
+from email.message import Message
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+# Project specific imports
+from lxml import etree  # type: ignore[import-untyped]
+from pydantic import BaseModel
+
+# Local imports
+from ..exceptions import RecommendAppError
+from .exceptions import RecommendScrapperHostError
+
+# -----------------------------------------------------------------------------#
+# Constants
+# -----------------------------------------------------------------------------#
+# Size of the chunks read from a blocking response
+CHUNK_SIZE = 16 * 1024
+
+# Bytes of a page searched for a <meta> charset, as browsers do
+CHARSET_SNIFF_BYTES = 1024
+CHARSET_PATTERN = re.compile(rb"""<meta\b[^>]*charset\s*=\s*["']?\s*([\w.:-]+)""", re.I)
+
+# Encoding of the pages that declare none and are not valid utf-8
+FALLBACK_ENCODING = "windows-1252"
+
+BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+# -----------------------------------------------------------------------------#
+# Models
+# -----------------------------------------------------------------------------#
+
+
+class Page(BaseModel):
+    """
+    Content of a page, as read by a `PageReader`
+
+    Args:
+        content (bytes): Bytes of the page that were read
+        encoding (str): Charset of the Content-Type header. Optional, the
+            parser detects it from the content otherwise.
+        head_complete (bool): True if the whole head was read
+        truncated (bool): True if the read stopped at the byte cap
+        etag (str): ETag header of the response. Optional.
+        last_modified (str): Last-Modified header of the response. Optional.
+        not_modified (bool): True if the server answered a conditional fetch
+            with a 304, the page has no content then.
+    """
+
+    content: bytes
+    encoding: Optional[str] = None
+    head_complete: bool = False
+    truncated: bool = False
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
+
+# -----------------------------------------------------------------------------#
+# Class
+# -----------------------------------------------------------------------------#
+
+
+class PageReader:
+    """
+    Collects the chunks of a page until enough of it is read
+    """
+
+    def __init__(self, max_bytes: int, head_only: bool = True):
+        """
+        Initialize the reader
+
+        Args:
+            max_bytes (int): Bytes read at most
+            head_only (bool): Stop once the head of the page is over
+        """
+        self.__max_bytes = max_bytes
+        self.__parser = (
+            etree.HTMLPullParser(events=("end",), tag="head") if head_only else None
+        )
+        self.__chunks: list[bytes] = []
+        self.__size = 0
+        self.__head_complete = False
+        self.__truncated = False
+
+    ###########################################################################
+    # Properties
+    ###########################################################################
+    @property
+    def done(self) -> bool:
+        """
+        Returns True once nothing more needs to be read
+        """
+        return self.__head_complete or self.__truncated
+
+    ###########################################################################
+    # Methods
+    ###########################################################################
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Adds the next chunk of the page
+
+        Args:
+            chunk (bytes): Next bytes of the page
+
+        Returns:
+            bool: True once nothing more needs to be read
+        """
+        if self.done or not chunk:
+            return self.done
+
+        room = self.__max_bytes - self.__size
+        if len(chunk) >= room:
+            chunk = chunk[:room]
+            self.__truncated = True
+
+        self.__chunks.append(chunk)
+        self.__size += len(chunk)
+
+        if self.__parser is not None:
+            self.__parser.feed(chunk)
+            for _ in self.__parser.read_events():
+                self.__head_complete = True
+
+        return self.done
+
+    def page(
+        self,
+        content_type: Optional[str] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Page:
+        """
+        Returns the page read so far
+
+        Args:
+            content_type (str): Content-Type header of the response. Optional.
+            headers (Mapping): Headers of the response, for the validators of
+                the page. Optional.
+        """
+        headers = headers or {}
+        return Page(
+            content=b"".join(self.__chunks),
+            encoding=get_charset(content_type or headers.get("content-type")),
+            head_complete=self.__head_complete,
+            truncated=self.__truncated,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+        )
+
+
+# -----------------------------------------------------------------------------#
+# Functions
+# -----------------------------------------------------------------------------#
+
+
+def get_charset(content_type: Optional[str]) -> Optional[str]:
+    """
+    Returns the charset of a Content-Type header. None if it has none.
+    """
+    if not content_type:
+        return None
+
+    message = Message()
+    message["content-type"] = content_type
+    return message.get_content_charset()
+
+
+def get_conditional_headers(
+    etag: Optional[str] = None, last_modified: Optional[str] = None
+) -> dict[str, str]:
+    """
+    Headers of a conditional fetch of a page, from the validators of its last
+    fetch. Empty if it has none.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def not_modified(headers: Mapping[str, str]) -> Page:
+    """
+    Page of a 304 response. The validators are the ones the server sent, if
+    it sent any.
+    """
+    return Page(
+        content=b"",
+        etag=headers.get("etag"),
+        last_modified=headers.get("last-modified"),
+        not_modified=True,
+    )
+
+
+def get_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Seconds the server asks to wait before the next request, from its
+    Retry-After header (a number of seconds or a date). None if it sent none
+    or if it isn't valid.
+    """
+    value = headers.get("retry-after")
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max((date - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def get_status_error(
+    url: str, status_code: int, headers: Mapping[str, str]
+) -> RecommendAppError:
+    """
+    Error of a response that is not a 200. A 429 or a 5xx is a failure of the
+    site (`RecommendScrapperHostError`), the other codes are a failure of the
+    page.
+    """
+    message = f"{url} returned a response code - {status_code}"
+    if status_code == 429 or status_code >= 500:
+        return RecommendScrapperHostError(
+            message, status_code=status_code, retry_after=get_retry_after(headers)
+        )
+    return RecommendAppError(message)
+
+
+def detect_encoding(content: bytes, declared: Optional[str] = None) -> str:
+    """
+    Encoding of the content of a page, in the order browsers look for it:
+    the byte order mark, the declared encoding (the charset of the
+    Content-Type header), the `<meta>` charset of the first bytes, then utf-8
+    if the content is valid utf-8, windows-1252 otherwise.
+
+    Args:
+        content (bytes): Content of the page. Can be truncated.
+        declared (str): Charset of the Content-Type header. Optional.
+
+    Returns:
+        str
+    """
+    for bom, encoding in BOMS:
+        if content.startswith(bom):
+            return encoding
+
+    match = CHARSET_PATTERN.search(content, 0, CHARSET_SNIFF_BYTES)
+    candidates = (declared, match.group(1).decode("ascii") if match else None)
+    for candidate in candidates:
+        if candidate and _is_known(candidate):
+            return candidate
+
+    # The page can be cut in the middle of a character
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(content, final=False)
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+    return "utf-8"
+
+
+def _is_known(encoding: str) -> bool:
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        return False
+    return True
@@ -0,0 +1,140 @@
+"""
+Use an async httpx client to load the url and call scrapper to scrap the data.
+
+All the fetches share one client, so the connections to a site are pooled and
+kept alive between the scraps. Every fetch is bounded: connecting, reading
+each chunk and the whole fetch (redirects included) have their own timeouts.
+The body is streamed and the download stops once the head of the page is
+read, or at the byte cap. See `settings` for the environment variables.
+"""
+
+# Builtin imports
+import asyncio
+from typing import Optional
+
+# Project specific imports
+import httpx
+
+# Local imports
+from ..exceptions import RecommendAppError
+from .exceptions import RecommendScrapperHostError
+from .parsing import get_pool
+from .settings import ScrapperSettings, get_settings
+from .streaming import Page, PageReader, get_status_error, not_modified
+from .using_requests import get_request_header
+
+# -----------------------------------------------------------------------------#
+# Globals
+# -----------------------------------------------------------------------------#
+__CLIENT: Optional[httpx.AsyncClient] = None
+
+# -----------------------------------------------------------------------------#
+# Functions
+# -----------------------------------------------------------------------------#
+
+
+def create_client(settings: ScrapperSettings) -> httpx.AsyncClient:
+    """
+    Creates an async client from the settings
+
+    Args:
+        settings (ScrapperSettings): Settings of the scrapper
+
+    Returns:
+        httpx.AsyncClient
+    """
+    headers = get_request_header()
+    # httpx asks for the encodings it can decode
+    headers.pop("Accept-Encoding", None)
+
+    return httpx.AsyncClient(
+        headers=headers,
+        follow_redirects=True,
+        max_redirects=settings.max_redirects,
+        timeout=httpx.Timeout(
+            settings.read_timeout,
+            connect=settings.connect_timeout,
+            pool=settings.connect_timeout,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        ),
+    )
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Returns the client shared by the scraps, creating it on first use
+    """
+    global __CLIENT
+    if __CLIENT is None or __CLIENT.is_closed:
+        __CLIENT = create_client(get_settings())
+    return __CLIENT
+
+
+async def close() -> None:
+    """
+    Closes the shared client and its connections
+    """
+    global __CLIENT
+    if __CLIENT is not None:
+        client, __CLIENT = __CLIENT, None
+        await client.aclose()
+
+
+async def fetch(url: str, headers: Optional[dict[str, str]] = None) -> Page:
+    """
+    Fetches the page with the shared client. Only the part of the body the
+    scrapper needs is downloaded, see `PageReader`.
+
+    Args:
+        url (str): Url of the page
+        headers (dict): Headers of the request. Optional. A conditional fetch
+            (see `get_conditional_headers`) can be answered with a 304.
+
+    Returns:
+        Page: The content that was read
+
+    Raises:
+        RecommendScrapperHostError if the site can't be reached, if the fetch
+            times out, or if the response is a 429 or a 5xx.
+        RecommendAppError if the url is invalid, or if the response is not a
+            200.
+    """
+    if not isinstance(url, str):
+        raise RecommendAppError(f"Invalid URL: {url}")
+
+    settings = get_settings()
+    try:
+        async with asyncio.timeout(settings.total_timeout):
+            async with get_client().stream("GET", url, headers=headers) as response:
+                if response.status_code == 304 and headers:
+                    return not_modified(response.headers)
+                if response.status_code != 200:
+                    raise get_status_error(url, response.status_code, response.headers)
+
+                reader = PageReader(settings.max_bytes, head_only=settings.stream_head)
+                async for chunk in response.aiter_bytes():
+                    if reader.feed(chunk):
+                        break
+                # Leaving the block closes the response: the rest of the body
+                # is not downloaded
+                return reader.page(headers=response.headers)
+    except (httpx.InvalidURL, httpx.UnsupportedProtocol) as err:
+        raise RecommendAppError(f"Invalid URL: {url}") from err
+    except (TimeoutError, httpx.TimeoutException) as err:
+        raise RecommendScrapperHostError(f"{url} timed out") from err
+    except httpx.TooManyRedirects as err:
+        raise RecommendAppError(f"{url} redirected too many times") from err
+    except httpx.HTTPError as err:
+        raise RecommendScrapperHostError(f"Failed to load {url}") from err
+
+
+async def scrap(url: str) -> dict[str, Optional[str]]:
+    """
+    Use the shared httpx client to scrap the data
+    """
+    page = await fetch(url)
+    return await get_pool().parse(page, url)
@@ -6,6 +6,7 @@ requests is sufficient.
 """
 
 # Builtin imports
+import time
 from typing import Optional
 
 # Project specific imports
@@ -13,7 +14,10 @@ import requests
 
 # Local imports
 from ..exceptions import RecommendAppError
-from .scrapper import Scrapper
+from .exceptions import RecommendScrapperHostError
+from .parsing import get_pool
+from .settings import get_settings
+from .streaming import CHUNK_SIZE, Page, PageReader, get_status_error, not_modified
 
 # -----------------------------------------------------------------------------#
 # Functions
@@ -37,19 +41,69 @@ def get_request_header() -> dict[str, str]:
     return headers
 
 
-def scrap(url: str) -> dict[str, Optional[str]]:
+def fetch(url: str, headers: Optional[dict[str, str]] = None) -> Page:
     """
-    Use requests module to scrap the data
+    Fetches the page with requests.
+
+    The connection and each read are bounded by the timeouts of the settings,
+    the whole fetch by the total timeout, checked between the chunks. At most
+    `max_redirects` redirects are followed. The body is streamed and the download stops once the head of the page is
+    read, or at the byte cap.
+
+    Args:
+        url (str): Url of the page
+        headers (dict): Headers added to the request. Optional. A conditional
+            fetch (see `get_conditional_headers`) can be answered with a 304.
+
+    Returns:
+        Page: The content that was read
+
+    Raises:
+        RecommendScrapperHostError if the site can't be reached, if the fetch
+            times out, or if the response is a 429 or a 5xx.
+        RecommendAppError if the url is invalid, or if the response is not a
+            200.
     """
+    settings = get_settings()
+    deadline = time.monotonic() + settings.total_timeout
     try:
-        response = requests.get(url, headers=get_request_header())
-    except requests.exceptions.MissingSchema as err:
+        with requests.Session() as session:
+            session.max_redirects = settings.max_redirects
+            with session.get(
+                url,
+                headers={**get_request_header(), **(headers or {})},
+                timeout=(settings.connect_timeout, settings.read_timeout),
+                stream=True,
+            ) as response:
+                if response.status_code == 304 and headers:
+                    return not_modified(response.headers)
+                if response.status_code != 200:
+                    raise get_status_error(url, response.status_code, response.headers)
+
+                reader = PageReader(settings.max_bytes, head_only=settings.stream_head)
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if time.monotonic() > deadline:
+                        raise RecommendScrapperHostError(f"{url} timed out")
+                    if reader.feed(chunk):
+                        break
+                return reader.page(headers=response.headers)
+    except (
+        requests.exceptions.MissingSchema,
+        requests.exceptions.InvalidSchema,
+        requests.exceptions.InvalidURL,
+    ) as err:
         raise RecommendAppError(f"Invalid URL: {url}") from err
+    except requests.exceptions.Timeout as err:
+        raise RecommendScrapperHostError(f"{url} timed out") from err
+    except requests.exceptions.TooManyRedirects as err:
+        raise RecommendAppError(f"{url} redirected too many times") from err
+    except requests.exceptions.RequestException as err:
+        raise RecommendScrapperHostError(f"Failed to load {url}") from err
 
-    if response.status_code != 200:
-        raise RecommendAppError(
-            f"{url} returned a response code - {response.status_code}"
-        )
 
-    scrapper = Scrapper(response.text)
-    return scrapper.scrap()
+def scrap(url: str) -> dict[str, Optional[str]]:
+    """
+    Use requests module to scrap the data, see `fetch`.
+    """
+    page = fetch(url)
+    return get_pool().parse_blocking(page, url)
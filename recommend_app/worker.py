@@ -0,0 +1,88 @@
+"""
+The background jobs, in a process of their own.
+
+`python -m recommend_app worker` runs the enrichment workers (see
+`enrichment`) and the refresh scheduler (see `refresh`) until SIGINT or
+SIGTERM. `python -m recommend_app refresh` runs a single refresh pass, eg
+from a cron job.
+"""
+
+# Builtin imports
+import asyncio
+import logging
+import signal
+
+# Local imports
+from . import scrapper
+from .db import create_client
+from .enrichment import EnrichmentSettings, EnrichmentWorkers, get_cached_scrap
+from .refresh import RefreshScheduler, RefreshSettings
+from .scrapper.settings import get_settings
+
+LOGGER = logging.getLogger(__name__)
+
+# -----------------------------------------------------------------------------#
+# Functions
+# -----------------------------------------------------------------------------#
+
+
+async def main() -> None:
+    """
+    Runs the workers until SIGINT or SIGTERM. `ENRICHMENT_WORKERS` workers
+    are run, at least one, and the scheduler unless `REFRESH_INTERVAL_SECONDS`
+    is 0.
+    """
+    settings = EnrichmentSettings.from_env()
+    if not settings.workers:
+        settings = settings.model_copy(update={"workers": 1})
+    refresh_settings = RefreshSettings.from_env()
+
+    client = create_client()
+    await client.connect()
+    scrap = get_cached_scrap(scrapper.ScrapeCache(client))
+    workers = EnrichmentWorkers(client, scrap, settings)
+
+    loop = asyncio.get_running_loop()
+    stopping = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    LOGGER.info("Running %s enrichment workers", settings.workers)
+    workers.start()
+    scheduler = None
+    if refresh_settings.interval_seconds:
+        scheduler = asyncio.create_task(
+            RefreshScheduler(client, settings=refresh_settings).run(stopping)
+        )
+
+    try:
+        await stopping.wait()
+    finally:
+        await workers.stop()
+        if scheduler is not None:
+            # Stops once the fetches running are over, they are bounded by
+            # the total timeout of the scrapper
+            _, pending = await asyncio.wait(
+                [scheduler], timeout=get_settings().total_timeout
+            )
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(scheduler, return_exceptions=True)
+        await scrapper.close()
+        await client.disconnect()
+        client.hasher.shutdown()
+
+
+async def refresh() -> None:
+    """
+    Runs a single refresh pass
+    """
+    client = create_client()
+    await client.connect()
+    try:
+        stats = await RefreshScheduler(client).run_once()
+        LOGGER.info("Refreshed the stale pages: %s", stats)
+    finally:
+        await scrapper.close()
+        await client.disconnect()
+        client.hasher.shutdown()
@@ -8,6 +8,7 @@ from fastapi import status
 
 # Local imports
 from recommend_app.api import constants as Key
+from ... import utils
 
 #-----------------------------------------------------------------------------#
 # Tests
@@ -80,3 +81,30 @@ async def test_get_private_board_with_another_owner(api_client_with_boards, with
     # This should fail.
     got_response = await api_client.get(Key.ROUTES.GET_BOARD.format(board_id=board['id']))
     assert got_response.status_code == status.HTTP_403_FORBIDDEN
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_board_paginated_cards(api_client_with_boards):
+    api_client = api_client_with_boards['api_client']
+    board = api_client_with_boards['public_board']
+
+    for _ in range(2):
+        card = utils.create_card()
+        await api_client.post(Key.ROUTES.ADD_CARD.format(board_id=board['id']), json=card.model_dump())
+
+    url = Key.ROUTES.GET_BOARD.format(board_id=board['id'])
+    page1 = (await api_client.get(url, params={'limit': 2})).json()
+    assert len(page1['cards']) == 2
+    assert page1['next_cursor'] == page1['cards'][-1]['id']
+
+    page2 = (await api_client.get(url, params={'limit': 2, 'after': page1['next_cursor']})).json()
+    page1_ids = {c['id'] for c in page1['cards']}
+    assert not page1_ids.intersection(c['id'] for c in page2['cards'])
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_board_invalid_cursor(api_client_with_boards):
+    api_client = api_client_with_boards['api_client']
+    board = api_client_with_boards['public_board']
+
+    url = Key.ROUTES.GET_BOARD.format(board_id=board['id'])
+    response = await api_client.get(url, params={'after': 'not-a-cursor'})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
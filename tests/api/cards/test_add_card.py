@@ -9,6 +9,7 @@ Signed in User
             Add card - works
 
         Add same card in two diff boards - works
+        Add a bare url - works, enriched in the background
     
     Wrong Board
         Public Board
@@ -22,7 +23,10 @@ import pytest
 from fastapi import status
 
 # Local imports
-from recommend_app.api import constants as Key
+from recommend_app.api import constants as Key, dependencies
+from recommend_app.db.models.card import NewCard
+from recommend_app.enrichment import EnrichmentWorker
+from recommend_app.scrapper import Revalidation
 
 from ... import utils
 
@@ -70,6 +74,30 @@ async def test_add_same_cards_two_different_boards(api_client_with_boards):
     assert response1.status_code == status.HTTP_201_CREATED
     assert response2.status_code == status.HTTP_201_CREATED
 
+@pytest.mark.asyncio(loop_scope="session")
+async def test_add_bare_url(api_client_with_boards):
+    api_client = api_client_with_boards['api_client']
+    board = api_client_with_boards['public_board']
+    db_client = dependencies.get_db_client()
+
+    # Drain the jobs left by the other tests
+    while await db_client.claim_enrichment_job('drain', lease_seconds=3600):
+        pass
+
+    url = f"https://{utils.get_random_name()}.com"
+    response = await api_client.post(Key.ROUTES.ADD_CARD.format(board_id = board['id']), json={'url': url})
+    assert response.status_code == status.HTTP_201_CREATED
+    card = response.json()
+    assert card['title'] is None
+
+    async def scrap(url):
+        return Revalidation(card=NewCard(url=url, title='Scrapped title'))
+
+    assert await EnrichmentWorker(db_client, scrap).run_once()
+
+    response = await api_client.get(Key.ROUTES.GET_CARD.format(card_id = card['id']))
+    assert response.json()['card']['title'] == 'Scrapped title'
+
 @pytest.mark.asyncio(loop_scope="session")
 async def test_add_card_to_board_of_different_user(api_client_with_boards, with_different_user):
     api_client = api_client_with_boards['api_client']
@@ -113,3 +141,26 @@ async def test_add_card_to_non_existent_board(api_client_with_boards):
     card = utils.create_card()
     response = await api_client.post(Key.ROUTES.ADD_CARD.format(board_id = '1234'), json=card.model_dump())
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_add_cards_in_bulk(api_client_with_boards):
+    api_client = api_client_with_boards['api_client']
+    board = api_client_with_boards['public_board']
+
+    card = utils.create_card().model_dump()
+    cards = [card, utils.create_card().model_dump(), card]
+    response = await api_client.post(Key.ROUTES.ADD_CARDS.format(board_id = board['id']), json=cards)
+    assert response.status_code == status.HTTP_200_OK
+
+    data = response.json()
+    assert len(data['cards']) == 2
+    assert [failure['index'] for failure in data['failures']] == [2]
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_add_cards_in_bulk_to_board_of_different_user(api_client_with_boards, with_different_user):
+    api_client = api_client_with_boards['api_client']
+    board = api_client_with_boards['public_board']
+
+    cards = [utils.create_card().model_dump()]
+    response = await api_client.post(Key.ROUTES.ADD_CARDS.format(board_id = board['id']), json=cards)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
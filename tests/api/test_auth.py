@@ -10,6 +10,8 @@ import pytest
 
 # Local imports
 from recommend_app.api import auth
+from recommend_app.api import constants as Key
+from recommend_app.db.types import ReadPreference
 
 from .. import utils
 
@@ -48,6 +50,43 @@ def test_invalid_access_token():
     user = auth._decode_token("MyInvalidAccessToken")
     assert not user
 
+def test_verified_token_is_cached(authenticated_user, mocker):
+    token = auth.create_access_token(authenticated_user, timedelta(minutes=1))
+    stats = auth.get_token_cache_stats()
+
+    user = auth._decode_token(token.access_token)
+    decode = mocker.spy(auth.jwt, "decode")
+    assert auth._decode_token(token.access_token) == user
+    decode.assert_not_called()
+
+    assert auth.get_token_cache_stats().hits == stats.hits + 1
+    assert auth.get_token_cache_stats().misses == stats.misses + 1
+
+def test_cached_user_is_copied(authenticated_user):
+    token = auth.create_access_token(authenticated_user, timedelta(minutes=1))
+
+    # A request changing its user doesn't change the others'
+    user = auth._decode_token(token.access_token)
+    user.access_token = "Reissued"
+    again = auth._decode_token(token.access_token)
+    assert again.access_token == token.access_token
+    again.first_name = "Changed"
+    assert auth._decode_token(token.access_token).first_name == authenticated_user.first_name
+
+def test_expired_token_is_not_cached(authenticated_user):
+    token = auth.create_access_token(authenticated_user, timedelta(minutes=-1))
+    assert auth._decode_token(token.access_token) is None
+    assert auth._decode_token(token.access_token) is None
+
+def test_token_lifetimes(monkeypatch):
+    monkeypatch.delenv("ACCESS_TOKEN_EXPIRE_MINUTES", raising=False)
+    monkeypatch.setenv("REFRESH_TOKEN_EXPIRE_DAYS", "30")
+    assert auth.get_access_token_expires() == timedelta(minutes=Key.ACCESS_TOKEN_EXPIRE_MINUTES)
+    assert auth.get_refresh_token_expires() == timedelta(days=30)
+
+    monkeypatch.setenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15")
+    assert auth.get_access_token_expires() == timedelta(minutes=15)
+
 #-----------------------------------------------------------------------------#
 # Get token from header
 #-----------------------------------------------------------------------------#
@@ -125,3 +164,7 @@ async def test_OAUTH2_SCHEME_no_token_atall():
     request.cookies = {"accesstoken": "cookie_token"}
     result = await auth.OAUTH2_SCHEME(request)
     assert not result
+
+def test_read_preference(authenticated_user):
+    assert auth.get_read_preference(None) == ReadPreference.SECONDARY_PREFERRED
+    assert auth.get_read_preference(authenticated_user) == ReadPreference.PRIMARY
@@ -2,12 +2,26 @@
 Test the scrapper endpoint
 """
 
+# Builtin imports
+import json
+
 # Project specific imports
 import pytest
 from fastapi import status
 
 # Local imports
 from recommend_app.api import constants as Key
+from recommend_app.exceptions import RecommendAppError
+from recommend_app.scrapper.exceptions import RecommendScrapperHostError
+from recommend_app.scrapper.streaming import Page
+
+#-----------------------------------------------------------------------------#
+# Helpers
+#-----------------------------------------------------------------------------#
+
+def create_page(url, title):
+    content = f'<html><head><meta property="og:url" content="{url}"><meta property="og:title" content="{title}"></head></html>'
+    return Page(content=content.encode())
 
 #-----------------------------------------------------------------------------#
 # Tests
@@ -25,10 +39,60 @@ async def test_scrapper_an_invalid_url(api_client):
 
 @pytest.mark.asyncio(loop_scope="session")
 async def test_scrapper_mocked(api_client, mocker):
-    func1_mock = mocker.patch("recommend_app.scrapper.using_requests.scrap")
-    func1_mock.return_value = {'url': 'https://www.netflix.com/gb/title/1234', 'title':'Godzilla Minus One'}
+    func1_mock = mocker.patch("recommend_app.scrapper.using_httpx.fetch")
+    func1_mock.return_value = create_page('https://www.netflix.com/gb/title/1234', 'Godzilla Minus One')
 
     response = await api_client.get(Key.ROUTES.SCRAP.format(url='https://www.netflix.com/gb/title/1234'))
     assert response.status_code == status.HTTP_200_OK
     card = response.json()
     assert card['url'] == 'https://www.netflix.com/gb/title/1234'
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_scrapper_cached(api_client, mocker):
+    func1_mock = mocker.patch("recommend_app.scrapper.using_httpx.fetch")
+    func1_mock.return_value = create_page('https://www.netflix.com/gb/title/5678', 'Godzilla Minus One')
+
+    for url in ['https://www.netflix.com/gb/title/5678', 'https://www.netflix.com/gb/title/5678?utm_source=share']:
+        response = await api_client.get(Key.ROUTES.SCRAP.format(url=url))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['title'] == 'Godzilla Minus One'
+    assert func1_mock.call_count == 1
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_scrapper_batch(api_client, mocker):
+    def fetch(url):
+        if 'invalid' in url:
+            raise RecommendAppError(f"Invalid URL: {url}")
+        return create_page(url, 'Godzilla Minus One')
+    mocker.patch("recommend_app.scrapper.using_httpx.fetch", side_effect=fetch)
+
+    urls = ['https://www.netflix.com/gb/title/1', 'https://www.netflix.com/gb/title/2', 'https://invalid.com/']
+    response = await api_client.post(Key.ROUTES.SCRAP_BATCH, json=urls)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+
+    results = {result['url']: result for result in map(json.loads, response.text.splitlines())}
+    assert results.keys() == set(urls)
+    assert results[urls[0]]['card']['title'] == 'Godzilla Minus One'
+    assert results[urls[2]]['error'] == 'Invalid URL: https://invalid.com/'
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_scrapper_batch_limits(api_client):
+    response = await api_client.post(Key.ROUTES.SCRAP_BATCH, json=[])
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    response = await api_client.post(Key.ROUTES.SCRAP_BATCH, json=['https://www.netflix.com/'] * 51)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_scrapper_throttled_host(api_client, mocker):
+    func1_mock = mocker.patch("recommend_app.scrapper.using_httpx.fetch")
+    func1_mock.side_effect = RecommendScrapperHostError("Too many requests", status_code=429)
+
+    response = await api_client.get(Key.ROUTES.SCRAP.format(url='https://www.throttled.com/title/1'))
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    # The host asked to slow down: not fetched again for now
+    response = await api_client.get(Key.ROUTES.SCRAP.format(url='https://www.throttled.com/title/2'))
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert func1_mock.call_count == 1
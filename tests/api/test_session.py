@@ -8,6 +8,8 @@ from fastapi import status
 
 # Local imports
 from recommend_app.api import constants as Key
+from recommend_app.api import auth, dependencies
+from recommend_app.db.hashing import Hasher, create_context
 from .. import utils
 
 #-----------------------------------------------------------------------------#
@@ -129,6 +131,29 @@ async def test_refresh_session(api_client):
     assert data['email_address'] == refresh_data['email_address']
     assert refresh_data['access_token']
 
+@pytest.mark.asyncio(loop_scope="session")
+async def test_refresh_session_reads_the_user_once(api_client, mocker):
+    new_user = utils.create_user()
+    password = new_user.password
+    await api_client.post(Key.ROUTES.ADD_USER, json=new_user.model_dump())
+    response = await api_client.post(Key.ROUTES.CREATE_SESSION,
+                               data={"username": new_user.user_name,
+                                     "password": password,
+                                     "grant_type": "password"},
+                               headers={"content-type": "application/x-www-form-urlencoded"})
+    headers = {"RefreshToken": "Bearer " + response.json()['refresh_token']}
+
+    get_user = mocker.spy(dependencies.get_db_client(), "get_user")
+    for _ in range(3):
+        refresh_response = await api_client.get(Key.ROUTES.REFRESH_SESSION, headers=headers)
+        assert refresh_response.status_code == status.HTTP_200_OK
+    assert get_user.call_count == 1
+
+    # Updating the user drops it from the cache
+    auth.invalidate_refresh_user(new_user.email_address)
+    await api_client.get(Key.ROUTES.REFRESH_SESSION, headers=headers)
+    assert get_user.call_count == 2
+
 @pytest.mark.asyncio(loop_scope="session")
 async def test_refresh_session_invalid_token(api_client):
     refresh_response = await api_client.get(Key.ROUTES.REFRESH_SESSION,
@@ -162,3 +187,26 @@ async def test_session_logout_without_cookie(api_client):
     # Logout
     response = await api_client.delete(Key.ROUTES.LOGOUT)
     assert not response.cookies.get("access_token")
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_session_post_rehashes_the_password(api_client, db_client, monkeypatch):
+    new_user = utils.create_user()
+    password = new_user.password
+    await api_client.post(Key.ROUTES.ADD_USER, json=new_user.model_dump())
+
+    # The cost changes after the user signed up
+    monkeypatch.setattr(Hasher, "CONTEXT", create_context(5))
+    user = await db_client.get_user(user_name=new_user.user_name)
+    assert Hasher.needs_update(user.password)
+
+    # Login. The password is hashed again once the response is sent.
+    response = await api_client.post(Key.ROUTES.CREATE_SESSION_WITH_COOKIE,
+                               data={"username": new_user.user_name,
+                                     "password": password,
+                                     "grant_type": "password"},
+                               headers={"content-type": "application/x-www-form-urlencoded"})
+    assert response.status_code == status.HTTP_200_OK
+
+    user = await db_client.get_user(user_name=new_user.user_name)
+    assert not Hasher.needs_update(user.password)
+    assert Hasher.verify_password(password, user.password)
@@ -0,0 +1,197 @@
+"""
+Test the read-through cache of the db
+
+The cache is tested against an in-memory db that counts the reads reaching it.
+"""
+
+# Builtin imports
+import uuid
+
+# Project specific imports
+import pytest
+
+# Local imports
+from recommend_app.db.abstracts.abstract_db import AbstractRecommendDB
+from recommend_app.db.cache import CachedRecommendDB, MemoryCacheBackend, create_cache_backend
+from recommend_app.db.client import RecommendDbClient
+from recommend_app.db.exceptions import RecommendDBModelNotFound, RecommendDBConnectionError
+from recommend_app.db.models.board import BoardInDb, UpdateBoard
+from recommend_app.db.models.card import CardInDb, UpdateCard
+from recommend_app.db.models.user import UserInDb
+from recommend_app.db.types import RecommendModelType, ReadPreference
+
+from ... import utils
+
+#-----------------------------------------------------------------------------#
+# In-memory db
+#-----------------------------------------------------------------------------#
+
+MODELS = {
+    RecommendModelType.USER: UserInDb,
+    RecommendModelType.BOARD: BoardInDb,
+    RecommendModelType.CARD: CardInDb,
+}
+
+class MemoryDB(AbstractRecommendDB):
+    def __init__(self):
+        super().__init__()
+        self.models = {}
+        self.reads = 0
+        self.read_preferences = []
+
+    async def connect(self):
+        return True
+
+    async def ping(self):
+        return True
+
+    async def disconnect(self, clear_db=False):
+        return True
+
+    async def add(self, model):
+        data = model.model_dump()
+        data["id"] = uuid.uuid4().hex
+        result = MODELS[model.model_type](**data)
+        self.models[result.id] = result
+        return result
+
+    async def add_many(self, models):
+        return [await self.add(model) for model in models], []
+
+    async def get(self, model_type, attrs_dict, read_preference=ReadPreference.PRIMARY):
+        self.reads += 1
+        self.read_preferences.append(read_preference)
+        for model in self.models.values():
+            if model.model_type == model_type and all(getattr(model, key) == value for key, value in attrs_dict.items()):
+                return model
+        raise RecommendDBModelNotFound(f"No {model_type.value} found")
+
+    async def get_all(self, model_type, attrs_dict, limit=None, after=None, read_preference=ReadPreference.PRIMARY):
+        self.reads += 1
+        self.read_preferences.append(read_preference)
+        return [model for model in self.models.values()
+                if model.model_type == model_type and all(getattr(model, key) == value for key, value in attrs_dict.items())]
+
+    async def get_board_with_cards(self, board_id, owner_id=None, limit=None, after=None, read_preference=ReadPreference.PRIMARY):
+        board = await self.get(RecommendModelType.BOARD, {"id": board_id}, read_preference)
+        cards = await self.get_all(RecommendModelType.CARD, {"board_id": board_id}, read_preference=read_preference)
+        self.reads -= 1
+        self.read_preferences.pop()
+        return board, cards
+
+    async def update(self, obj_id, update_model, attrs_dict=None):
+        data = self.models[obj_id].model_dump()
+        data.update({key: value for key, value in update_model.model_dump().items() if value is not None})
+        self.models[obj_id] = MODELS[update_model.model_type](**data)
+        return self.models[obj_id]
+
+    async def remove(self, model_type, obj_id, attrs_dict=None):
+        return self.models.pop(obj_id, None) is not None
+
+
+@pytest.fixture()
+def cached_db():
+    memory_db = MemoryDB()
+    cached = CachedRecommendDB(memory_db, MemoryCacheBackend(max_bytes=100_000))
+    return memory_db, cached, RecommendDbClient(cached)
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_is_cached(cached_db):
+    memory_db, cached, client = cached_db
+    board = await client.add_board(utils.create_public_board(), "owner")
+
+    await client.get_board(board.id)
+    await client.get_board(board.id)
+    assert memory_db.reads == 1
+    assert cached.stats.hits == 1
+    assert cached.stats.misses == 1
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_update_invalidates_the_model(cached_db):
+    memory_db, cached, client = cached_db
+    board = await client.add_board(utils.create_public_board(), "owner")
+    await client.get_board(board.id)
+
+    await client.update_board(board.id, UpdateBoard(name="Updated"))
+    got = await client.get_board(board.id)
+    assert got.name == "Updated"
+    assert memory_db.reads == 2
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_writes_invalidate_the_card_list(cached_db):
+    memory_db, cached, client = cached_db
+    board = await client.add_board(utils.create_public_board(), "owner")
+    card = await client.add_card(utils.create_card(), board.id)
+
+    _, cards = await client.get_board_with_cards(board.id)
+    assert len(cards) == 1
+    assert len(await client.get_all_cards(board.id)) == 1
+
+    # Add
+    await client.add_card(utils.create_card(), board.id)
+    _, cards = await client.get_board_with_cards(board.id)
+    assert len(cards) == 2
+    assert len(await client.get_all_cards(board.id)) == 2
+
+    # Update
+    await client.update_card(card.id, UpdateCard(title="Updated"))
+    _, cards = await client.get_board_with_cards(board.id)
+    assert cards[0].title == "Updated"
+
+    # Remove
+    await client.remove_card(card.id)
+    _, cards = await client.get_board_with_cards(board.id)
+    assert len(cards) == 1
+    assert len(await client.get_all_cards(board.id)) == 1
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_secondary_reads_are_cached_apart(cached_db):
+    memory_db, cached, client = cached_db
+    board = await client.add_board(utils.create_public_board(), "owner")
+
+    await client.get_board(board.id, read_preference=ReadPreference.SECONDARY_PREFERRED)
+    await client.get_board(board.id, read_preference=ReadPreference.SECONDARY_PREFERRED)
+    assert memory_db.read_preferences == [ReadPreference.SECONDARY_PREFERRED]
+
+    # A primary read doesn't get the result read from a secondary
+    await client.get_board(board.id)
+    assert memory_db.read_preferences == [ReadPreference.SECONDARY_PREFERRED, ReadPreference.PRIMARY]
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_not_found_is_not_cached(cached_db):
+    memory_db, cached, client = cached_db
+    with pytest.raises(RecommendDBModelNotFound):
+        await client.get_card("1234")
+    with pytest.raises(RecommendDBModelNotFound):
+        await client.get_card("1234")
+    assert memory_db.reads == 2
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_size_limit(cached_db):
+    memory_db = MemoryDB()
+    cached = CachedRecommendDB(memory_db, MemoryCacheBackend(max_bytes=500))
+    client = RecommendDbClient(cached)
+
+    for _ in range(10):
+        board = await client.add_board(utils.create_public_board(), "owner")
+        await client.get_board(board.id)
+
+    assert cached.stats.size_bytes <= 500
+    assert cached.stats.evictions > 0
+
+def test_create_cache_backend(monkeypatch):
+    monkeypatch.delenv("DB_CACHE_BACKEND", raising=False)
+    monkeypatch.delenv("DB_CACHE_MAX_BYTES", raising=False)
+    assert create_cache_backend() is None
+
+    monkeypatch.setenv("DB_CACHE_MAX_BYTES", "1000")
+    assert isinstance(create_cache_backend(), MemoryCacheBackend)
+
+    monkeypatch.setenv("DB_CACHE_BACKEND", "redis")
+    monkeypatch.delenv("DB_CACHE_URL", raising=False)
+    with pytest.raises(RecommendDBConnectionError):
+        create_cache_backend()
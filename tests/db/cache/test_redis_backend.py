@@ -0,0 +1,116 @@
+"""
+Test the redis cache backend against fakeredis, with two workers sharing
+the same server.
+"""
+
+# Builtin imports
+import asyncio
+
+# Project specific imports
+import pytest
+import pytest_asyncio
+
+# Local imports
+from recommend_app.db.cache import CachedRecommendDB, MemoryCacheBackend, RedisCacheBackend
+from recommend_app.db.client import RecommendDbClient
+from recommend_app.db.models.board import UpdateBoard
+
+from ... import utils
+from .test_cached_db import MemoryDB
+
+fakeredis = pytest.importorskip("fakeredis")
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def workers():
+    """
+    Two workers on the same db and the same redis server
+    """
+    memory_db = MemoryDB()
+    server = fakeredis.FakeServer()
+
+    clients = []
+    for _ in range(2):
+        backend = RedisCacheBackend(fakeredis.FakeAsyncRedis(server=server),
+                                    ttl=60,
+                                    local=MemoryCacheBackend(max_bytes=100_000))
+        client = RecommendDbClient(CachedRecommendDB(memory_db, backend))
+        await client.connect()
+        clients.append(client)
+
+    yield memory_db, clients
+
+    for client in clients:
+        await client.disconnect()
+
+async def wait_for(predicate):
+    for _ in range(100):
+        if await predicate():
+            return True
+        await asyncio.sleep(0.01)
+    return False
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_reads_are_shared(workers):
+    memory_db, (worker1, worker2) = workers
+    board = await worker1.add_board(utils.create_public_board(), "owner")
+    card = await worker1.add_card(utils.create_card(), board.id)
+
+    await worker1.get_board(board.id)
+    got_board, cards = await worker1.get_board_with_cards(board.id)
+    reads = memory_db.reads
+
+    # Served from redis
+    assert (await worker2.get_board(board.id)).name == board.name
+    got_board, cards = await worker2.get_board_with_cards(board.id)
+    assert got_board.id == board.id
+    assert [c.id for c in cards] == [card.id]
+    assert memory_db.reads == reads
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_invalidation_reaches_every_worker(workers):
+    memory_db, (worker1, worker2) = workers
+    board = await worker1.add_board(utils.create_public_board(), "owner")
+
+    # Both workers hold a local copy
+    await worker1.get_board(board.id)
+    await worker2.get_board(board.id)
+
+    await worker2.update_board(board.id, UpdateBoard(name="Updated"))
+
+    async def worker1_is_fresh():
+        return (await worker1.get_board(board.id)).name == "Updated"
+
+    assert await wait_for(worker1_is_fresh)
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_read_racing_with_a_write_is_not_cached(workers):
+    memory_db, (worker1, worker2) = workers
+    board = await worker1.add_board(utils.create_public_board(), "owner")
+
+    # worker2 updates the board while worker1 reads it
+    read = memory_db.get
+    async def racing_get(*args, **kwargs):
+        memory_db.get = read
+        model = await read(*args, **kwargs)
+        await worker2.update_board(board.id, UpdateBoard(name="Updated"))
+        return model
+    memory_db.get = racing_get
+
+    assert (await worker1.get_board(board.id)).name == board.name
+    assert (await worker2.get_board(board.id)).name == "Updated"
+    assert (await worker1.get_board(board.id)).name == "Updated"
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_users_are_not_shared(workers):
+    memory_db, (worker1, worker2) = workers
+    user = await worker1.add_user(utils.create_user())
+    reads = memory_db.reads
+
+    await worker1.get_user(id=user.id)
+    await worker1.get_user(id=user.id)
+    await worker2.get_user(id=user.id)
+    assert memory_db.reads == reads + 3
@@ -2,9 +2,14 @@
 
 """
 
+# Project specific imports
+from bson import ObjectId
+
 # Local imports
 from recommend_app.db.models.user import UserInDb
+from recommend_app.db.models.card import CardInDb
 from recommend_app.db.impl.documents.user import UserDocument
+from recommend_app.db.impl.documents.base import model_from_raw, get_projection
 from recommend_app.db.hashing import Hasher
 
 from ... import utils
@@ -27,3 +32,21 @@ def test_document_to_model(db_client):
     assert isinstance(user, UserInDb)
     assert user.email_address == new_user.email_address
     assert Hasher.verify_password(pwd, user.password)
+
+def test_raw_to_model():
+    raw = {'_id': ObjectId(),
+           'url': 'https://www.netflix.com/gb/title/81767635',
+           'title': 'Godzilla Minus One',
+           'board_id': '6744a0ddee62a60d03f06d99',
+           'revision_id': None}
+    card = model_from_raw(CardInDb, raw)
+    assert isinstance(card, CardInDb)
+    assert card.id == str(raw['_id'])
+    assert card.title == raw['title']
+    assert card.description is None
+    assert card == CardInDb(id=str(raw['_id']), url=raw['url'], title=raw['title'], board_id=raw['board_id'])
+
+def test_projection():
+    projection = get_projection(CardInDb)
+    assert 'id' not in projection
+    assert set(projection) == {'url', 'title', 'description', 'thumbnail', 'board_id'}
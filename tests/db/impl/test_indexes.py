@@ -0,0 +1,36 @@
+"""
+Test that the canonical queries are backed by indexes
+"""
+
+# Project specific imports
+import pytest
+
+# Local imports
+from recommend_app.db.types import RecommendModelType
+from recommend_app.db.impl.indexes import has_collection_scan, find_collection_scans
+from recommend_app.db.impl.documents.user import UserDocument
+from recommend_app.db.impl.documents.board import BoardDocument
+from recommend_app.db.impl.documents.card import CardDocument
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+def test_collection_scan_detected():
+    plan = {"stage": "SORT", "inputStage": {"stage": "COLLSCAN", "direction": "forward"}}
+    assert has_collection_scan(plan)
+
+def test_index_scan_not_flagged():
+    plan = {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "board_id_1__id_1"}}
+    assert not has_collection_scan(plan)
+
+def test_nested_or_plan_detected():
+    plan = {"stage": "OR", "inputStages": [{"stage": "IXSCAN"}, {"stage": "COLLSCAN"}]}
+    assert has_collection_scan(plan)
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_canonical_queries_use_indexes(db_client):
+    documents = {RecommendModelType.USER: UserDocument,
+                 RecommendModelType.BOARD: BoardDocument,
+                 RecommendModelType.CARD: CardDocument}
+    assert await find_collection_scans(documents) == []
@@ -0,0 +1,50 @@
+"""
+Test the settings of the motor client
+"""
+
+# Project specific imports
+import pytest
+from pydantic import ValidationError
+
+# Local imports
+from recommend_app.db.impl.settings import MotorClientSettings
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+def test_no_settings(monkeypatch):
+    for env_var in ("DB_SERVERSELECTIONTIMEOUT", "DB_MAX_POOL_SIZE", "DB_MIN_POOL_SIZE", "DB_COMPRESSORS", "DB_READ_MAX_STALENESS_SECONDS"):
+        monkeypatch.delenv(env_var, raising=False)
+    assert MotorClientSettings.from_env().to_client_kwargs() == {}
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.setenv("DB_SERVERSELECTIONTIMEOUT", "5000")
+    monkeypatch.setenv("DB_MAX_POOL_SIZE", "50")
+    monkeypatch.setenv("DB_MIN_POOL_SIZE", "5")
+    monkeypatch.setenv("DB_COMPRESSORS", "zstd, snappy")
+    monkeypatch.setenv("DB_APP_NAME", "recommend")
+
+    settings = MotorClientSettings.from_env(max_pool_size=20)
+    assert settings.min_pool_size == 5
+    assert settings.to_client_kwargs() == {
+        "serverSelectionTimeoutMS": 5000,
+        "maxPoolSize": 20,
+        "minPoolSize": 5,
+        "compressors": "zstd,snappy",
+        "appname": "recommend",
+    }
+
+def test_invalid_settings():
+    with pytest.raises(ValidationError):
+        MotorClientSettings(max_pool_size=-1)
+
+def test_max_staleness(monkeypatch):
+    monkeypatch.setenv("DB_READ_MAX_STALENESS_SECONDS", "120")
+    settings = MotorClientSettings.from_env()
+    assert settings.max_staleness_seconds == 120
+    # Only applies to the reads routed to the secondaries
+    assert "maxStalenessSeconds" not in settings.to_client_kwargs()
+
+    with pytest.raises(ValidationError):
+        MotorClientSettings(max_staleness_seconds=10)
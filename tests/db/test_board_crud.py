@@ -8,6 +8,7 @@ import pytest
 # Local imports
 from recommend_app.db.models.board import NewBoard, BoardInDb, UpdateBoard
 from recommend_app.db.exceptions import RecommendAppDbError, RecommendDBModelNotFound
+from recommend_app.db.types import ReadPreference
 
 from .. import utils
 
@@ -103,6 +104,70 @@ async def test_get_all_boards(db_client):
     boards = await db_client.get_all_boards(user.id)
     assert len(boards) == 5
 
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_all_public_boards_paginated(db_client):
+    new_user = utils.create_user()
+    user = await db_client.add_user(new_user)
+
+    for private in (False, True, False, True, False):
+        new_board = NewBoard(name='Movies to watch', private=private)
+        await db_client.add_board(new_board, user.id)
+
+    page1 = await db_client.get_all_boards(user.id, only_public=True, limit=2)
+    page2 = await db_client.get_all_boards(user.id, only_public=True, limit=2, after=page1[-1].id)
+    assert len(page1) == 2
+    assert len(page2) == 1
+    assert not any(board.private for board in page1 + page2)
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_board_with_cards(db_client):
+    user = await db_client.add_user(utils.create_user())
+    board = await db_client.add_board(NewBoard(name='Movies to watch'), user.id)
+    for _ in range(3):
+        await db_client.add_card(utils.create_card(), board.id, user.id)
+
+    got, page1 = await db_client.get_board_with_cards(board.id, limit=2)
+    assert got.id == board.id
+    assert len(page1) == 2
+    assert all(card.board_id == board.id for card in page1)
+
+    _, page2 = await db_client.get_board_with_cards(board.id, limit=2, after=page1[-1].id)
+    assert len(page2) == 1
+    assert page2[0].id not in [card.id for card in page1]
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_private_board_with_cards(db_client):
+    user = await db_client.add_user(utils.create_user())
+    board = await db_client.add_board(NewBoard(name='Movies to watch', private=True), user.id)
+
+    got, cards = await db_client.get_board_with_cards(board.id, user.id)
+    assert got.id == board.id
+    assert cards == []
+
+    with pytest.raises(RecommendAppDbError):
+        await db_client.get_board_with_cards(board.id)
+
+    with pytest.raises(RecommendAppDbError):
+        await db_client.get_board_with_cards(board.id, 'someone_else')
+
+    with pytest.raises(RecommendDBModelNotFound):
+        await db_client.get_board_with_cards('6744a0ddee62a60d03f06d98', user.id)
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_board_from_secondary(db_client):
+    user = await db_client.add_user(utils.create_user())
+    board = await db_client.add_board(NewBoard(name='Movies to watch'), user.id)
+    await db_client.add_card(utils.create_card(), board.id, user.id)
+
+    secondary = ReadPreference.SECONDARY_PREFERRED
+    got = await db_client.get_board(board.id, read_preference=secondary)
+    assert got.id == board.id
+    got, cards = await db_client.get_board_with_cards(board.id, read_preference=secondary)
+    assert got.id == board.id
+    assert len(cards) == 1
+    boards = await db_client.get_all_boards(user.id, only_public=True, read_preference=secondary)
+    assert [b.id for b in boards] == [board.id]
+
 @pytest.mark.asyncio(loop_scope="session")
 async def test_get_all_boards_of_non_existent_owner(db_client):
     boards = await db_client.get_all_boards('6744a0ddee62a60d03f06d98')
@@ -153,6 +218,26 @@ async def test_update_non_existent_board(db_client):
         data = UpdateBoard(private=True)
         await db_client.update_board('1234', data)
 
+@pytest.mark.asyncio(loop_scope="session")
+async def test_update_board_of_different_owner(db_client):
+    user = await db_client.add_user(utils.create_user())
+    board = await db_client.add_board(NewBoard(name='Movies to watch'), user.id)
+
+    with pytest.raises(RecommendAppDbError):
+        await db_client.update_board(board.id, UpdateBoard(name="Test"), 'someone_else')
+
+    updated = await db_client.update_board(board.id, UpdateBoard(name="Test"), user.id)
+    assert updated.name == "Test"
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_delete_board_of_different_owner(db_client):
+    user = await db_client.add_user(utils.create_user())
+    board = await db_client.add_board(NewBoard(name='Movies to watch'), user.id)
+
+    with pytest.raises(RecommendAppDbError):
+        await db_client.remove_board(board.id, 'someone_else')
+    assert await db_client.remove_board(board.id, user.id)
+
 @pytest.mark.asyncio(loop_scope="session")
 async def test_delete_public_board(db_client):
     new_user = utils.create_user()
@@ -8,7 +8,7 @@ import pytest_asyncio
 
 # Local imports
 from recommend_app.db.models.card import CardInDb, UpdateCard
-from recommend_app.db.exceptions import RecommendDBModelCreationError, RecommendDBModelNotFound
+from recommend_app.db.exceptions import RecommendDBModelCreationError, RecommendDBModelNotFound, RecommendAppDbError
 from .. import utils
 
 @pytest_asyncio.fixture(loop_scope="session")
@@ -100,6 +100,33 @@ async def test_get_all_cards(db_client_with_user_and_boards):
     cards = await db_client.get_all_cards(board.id)
     assert len(cards) == 4
 
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_all_cards_paginated(db_client_with_user_and_boards):
+    db_client = db_client_with_user_and_boards['db_client']
+
+    user = await db_client.add_user(utils.create_user())
+    board = await db_client.add_board(utils.create_public_board(), user.id)
+
+    for _ in range(5):
+        await db_client.add_card(utils.create_card(), board.id)
+
+    page1 = await db_client.get_all_cards(board.id, limit=2)
+    page2 = await db_client.get_all_cards(board.id, limit=2, after=page1[-1].id)
+    page3 = await db_client.get_all_cards(board.id, limit=2, after=page2[-1].id)
+    assert [len(page) for page in (page1, page2, page3)] == [2, 2, 1]
+
+    ids = [card.id for card in page1 + page2 + page3]
+    assert len(set(ids)) == 5
+    assert ids == [card.id for card in await db_client.get_all_cards(board.id)]
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_all_cards_invalid_cursor(db_client_with_user_and_boards):
+    db_client = db_client_with_user_and_boards['db_client']
+    board = db_client_with_user_and_boards['pub_board']
+
+    with pytest.raises(RecommendAppDbError):
+        await db_client.get_all_cards(board.id, limit=2, after='1234')
+
 @pytest.mark.asyncio(loop_scope="session")
 async def test_get_all_cards_from_non_existent_board(db_client_with_user_and_boards):
     db_client = db_client_with_user_and_boards['db_client']
@@ -155,3 +182,55 @@ async def test_remove_invalid_card(db_client_with_user_and_boards):
 
     with pytest.raises(RecommendDBModelNotFound):
         await db_client.remove_card('1234')
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_update_card_by_owner(db_client_with_user_and_boards):
+    db_client = db_client_with_user_and_boards['db_client']
+    user = db_client_with_user_and_boards['user']
+    pub_board = db_client_with_user_and_boards['pub_board']
+
+    card = await db_client.add_card(utils.create_card(), pub_board.id, user.id)
+    updated = await db_client.update_card(card.id, UpdateCard(title='UpdatedTitle'), user.id)
+    assert updated.title == 'UpdatedTitle'
+
+    with pytest.raises(RecommendAppDbError):
+        await db_client.update_card(card.id, UpdateCard(title='Other'), 'someone_else')
+
+    with pytest.raises(RecommendAppDbError):
+        await db_client.remove_card(card.id, 'someone_else')
+    assert await db_client.remove_card(card.id, user.id)
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_update_card_without_stored_owner(db_client_with_user_and_boards):
+    db_client = db_client_with_user_and_boards['db_client']
+    user = db_client_with_user_and_boards['user']
+    pub_board = db_client_with_user_and_boards['pub_board']
+
+    # Cards added without an owner fall back to the owner of their board
+    card = await db_client.add_card(utils.create_card(), pub_board.id)
+    updated = await db_client.update_card(card.id, UpdateCard(title='UpdatedTitle'), user.id)
+    assert updated.title == 'UpdatedTitle'
+
+    with pytest.raises(RecommendAppDbError):
+        await db_client.remove_card(card.id, 'someone_else')
+    assert await db_client.remove_card(card.id, user.id)
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_add_cards(db_client_with_user_and_boards):
+    db_client = db_client_with_user_and_boards['db_client']
+    board = db_client_with_user_and_boards['pub_board']
+
+    existing = await db_client.add_card(utils.create_card(), board.id)
+    first = utils.create_card()
+    duplicate = utils.create_card()
+    duplicate.url = existing.url
+    new_cards = [first, duplicate, first, utils.create_card()]
+
+    cards, failures = await db_client.add_cards(board.id, new_cards)
+    assert len(cards) == 2
+    assert all(isinstance(card, CardInDb) and card.board_id == board.id for card in cards)
+    assert [failure.index for failure in failures] == [1, 2]
+
+    # The created cards can be read back
+    card = await db_client.get_card(cards[0].id)
+    assert card.url == first.url
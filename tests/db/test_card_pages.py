@@ -0,0 +1,49 @@
+"""
+Test the validators of the pages of the cards
+"""
+
+# Builtin imports
+from datetime import datetime, timedelta, timezone
+
+# Project specific imports
+import pytest
+
+# Local imports
+from .. import utils
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_stale_pages(db_client):
+    user = await db_client.add_user(utils.create_user())
+    board = await db_client.add_board(utils.create_public_board(), user.id)
+    old = await db_client.add_card(utils.create_card(), board.id)
+    fresh = await db_client.add_card(utils.create_card(), board.id)
+    never = await db_client.add_card(utils.create_card(), board.id)
+
+    now = datetime.now(timezone.utc)
+    assert await db_client.set_page_validators(old.id, '"v1"', None, now - timedelta(days=30))
+    assert await db_client.set_page_validators(fresh.id, '"v2"', 'Wed, 21 Oct 2015 07:28:00 GMT', now)
+
+    # Added just now: not stale yet
+    pages = await db_client.get_stale_pages(now - timedelta(days=1), limit=10_000)
+    ids = [page.card_id for page in pages]
+    assert old.id in ids
+    assert fresh.id not in ids
+    assert never.id not in ids
+
+    page = pages[ids.index(old.id)]
+    assert page.url == old.url
+    assert page.title == old.title
+    assert page.etag == '"v1"'
+
+    # Never checked cards come first
+    pages = await db_client.get_stale_pages(now + timedelta(days=1), limit=10_000)
+    ids = [page.card_id for page in pages]
+    assert ids.index(never.id) < ids.index(old.id) < ids.index(fresh.id)
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_validators_of_missing_card(db_client):
+    assert not await db_client.set_page_validators('6749b1cbbe5aa922be16c31f', None, None)
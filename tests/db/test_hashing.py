@@ -0,0 +1,84 @@
+"""
+Test the async password hasher
+"""
+
+# Builtin imports
+import asyncio
+
+# Project specific imports
+import pytest
+
+# Local imports
+from recommend_app.db.hashing import AsyncHasher, Hasher, calibrate, create_context
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_hash_and_verify():
+    hasher = AsyncHasher(max_concurrency=2)
+    hashed = await hasher.hash_password("mySecretPassword")
+    assert Hasher.verify_password("mySecretPassword", hashed)
+    assert await hasher.verify_password("mySecretPassword", hashed)
+    assert not await hasher.verify_password("wrongPassword", hashed)
+    assert hasher.stats.completed == 3
+    hasher.shutdown()
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_concurrency_cap():
+    hasher = AsyncHasher(max_concurrency=1)
+    await asyncio.gather(*(hasher.hash_password("password") for _ in range(3)))
+
+    stats = hasher.stats
+    assert stats.max_concurrency == 1
+    assert stats.max_waiting == 2
+    assert stats.waiting == 0
+    assert stats.in_flight == 0
+    assert stats.completed == 3
+    hasher.shutdown()
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_event_loop_is_not_blocked():
+    hasher = AsyncHasher(max_concurrency=1)
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    ticker = asyncio.create_task(tick())
+    await asyncio.gather(*(hasher.hash_password("password") for _ in range(2)))
+    ticker.cancel()
+
+    assert ticks > 2
+    hasher.shutdown()
+
+def test_invalid_concurrency():
+    with pytest.raises(ValueError):
+        AsyncHasher(max_concurrency=0)
+
+def test_rounds():
+    old = create_context(4).hash("password")
+    context = create_context(5)
+    assert context.needs_update(old)
+    assert not context.needs_update(context.hash("password"))
+    assert context.verify("password", old)
+
+    with pytest.raises(ValueError):
+        create_context(3)
+
+def test_rounds_from_env(monkeypatch):
+    monkeypatch.setenv("HASHER_BCRYPT_ROUNDS", "5")
+    assert create_context().hash("password").startswith("$2b$05$")
+
+def test_calibrate():
+    result = calibrate(target_ms=1000, samples=1, max_rounds=6)
+    assert list(result.timings_ms) == [4, 5, 6]
+    assert result.recommended_rounds == 6
+
+    result = calibrate(target_ms=0, samples=1, max_rounds=6)
+    assert list(result.timings_ms) == [4]
+    assert result.recommended_rounds == 4
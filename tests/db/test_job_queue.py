@@ -0,0 +1,102 @@
+"""
+Test the queue of the enrichment jobs
+"""
+
+# Builtin imports
+from datetime import datetime, timedelta, timezone
+
+# Project specific imports
+import pytest
+import pytest_asyncio
+
+# Local imports
+from recommend_app.db.types import JobStatus
+from .. import utils
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def queued_card(db_client):
+    # Drain the jobs left by the other tests
+    while await db_client.claim_enrichment_job('drain', lease_seconds=3600):
+        pass
+
+    user = await db_client.add_user(utils.create_user())
+    board = await db_client.add_board(utils.create_public_board(), user.id)
+    card = await db_client.add_card(utils.create_card(), board.id)
+    assert await db_client.enqueue_enrichment([card]) == 1
+    return card
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_claim_and_complete(db_client, queued_card):
+    job = await db_client.claim_enrichment_job('worker-1', lease_seconds=60)
+    assert job.card_id == queued_card.id
+    assert job.url == queued_card.url
+    assert job.status == JobStatus.LEASED
+    assert job.attempts == 1
+    assert job.worker_id == 'worker-1'
+
+    # Leased: nobody else gets it
+    assert await db_client.claim_enrichment_job('worker-2', lease_seconds=60) is None
+
+    # Only the worker holding the lease completes it
+    assert not await db_client.complete_enrichment_job(job.id, 'worker-2')
+    assert await db_client.complete_enrichment_job(job.id, 'worker-1')
+    assert await db_client.claim_enrichment_job('worker-2', lease_seconds=60) is None
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_expired_lease(db_client, queued_card):
+    job = await db_client.claim_enrichment_job('worker-1', lease_seconds=-1)
+
+    # The worker died, another one takes over
+    reclaimed = await db_client.claim_enrichment_job('worker-2', lease_seconds=60)
+    assert reclaimed.id == job.id
+    assert reclaimed.attempts == 2
+
+    # The first worker lost the lease
+    assert not await db_client.complete_enrichment_job(job.id, 'worker-1')
+    assert await db_client.complete_enrichment_job(job.id, 'worker-2')
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_expired_lease_max_attempts(db_client, queued_card):
+    # The job kills its worker on every attempt
+    for attempt in range(1, 4):
+        job = await db_client.claim_enrichment_job('worker-1', lease_seconds=-1, max_attempts=3)
+        assert job.attempts == attempt
+
+    # Dead once the lease of its last attempt expired
+    assert await db_client.claim_enrichment_job('worker-2', lease_seconds=60, max_attempts=3) is None
+    assert await db_client.claim_enrichment_job('worker-2', lease_seconds=60) is None
+    assert not await db_client.complete_enrichment_job(job.id, 'worker-1')
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_retry(db_client, queued_card):
+    job = await db_client.claim_enrichment_job('worker-1', lease_seconds=60)
+
+    retry_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    assert await db_client.fail_enrichment_job(job.id, 'worker-1', 'Timed out', retry_at)
+    # Not due yet
+    assert await db_client.claim_enrichment_job('worker-1', lease_seconds=60) is None
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_retry_when_due(db_client, queued_card):
+    job = await db_client.claim_enrichment_job('worker-1', lease_seconds=60)
+
+    retry_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    assert await db_client.fail_enrichment_job(job.id, 'worker-1', 'Timed out', retry_at)
+
+    retried = await db_client.claim_enrichment_job('worker-1', lease_seconds=60)
+    assert retried.id == job.id
+    assert retried.attempts == 2
+    assert retried.last_error == 'Timed out'
+    await db_client.complete_enrichment_job(job.id, 'worker-1')
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_dead(db_client, queued_card):
+    job = await db_client.claim_enrichment_job('worker-1', lease_seconds=60)
+    assert await db_client.fail_enrichment_job(job.id, 'worker-1', 'Not found')
+
+    # Never retried
+    assert await db_client.claim_enrichment_job('worker-1', lease_seconds=60) is None
@@ -0,0 +1,33 @@
+"""
+Test the scrapes stored in the db
+"""
+
+# Project specific imports
+import pytest
+
+# Local imports
+from recommend_app.db.models.card import NewCard
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_add_and_get_scrape(db_client):
+    url = 'https://www.netflix.com/gb/title/81767635'
+    card = NewCard(url=url, title='Godzilla Minus One')
+
+    assert await db_client.get_scrape(url) is None
+    await db_client.add_scrape(url, card, ttl=60)
+    assert await db_client.get_scrape(url) == card
+
+    # Replaces the previous one
+    updated = NewCard(url=url, title='Godzilla Minus One', description='Japan, 1945')
+    await db_client.add_scrape(url, updated, ttl=60)
+    assert await db_client.get_scrape(url) == updated
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_expired_scrape(db_client):
+    url = 'https://www.primevideo.com/detail/the-batman'
+    await db_client.add_scrape(url, NewCard(url=url, title='The Batman'), ttl=-1)
+    assert await db_client.get_scrape(url) is None
@@ -115,3 +115,18 @@ async def test_update_first_and_lastname(db_client):
     assert updated_user.first_name == user.first_name
     assert updated_user.last_name == user.last_name
     assert updated_user.user_name == user.user_name
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_rehash_password(db_client):
+    new_user = utils.create_user()
+    password = new_user.password
+    user = await db_client.add_user(new_user)
+
+    rehashed = await db_client.rehash_password(user.id, password, user.password)
+    assert rehashed.password != user.password
+    assert Hasher.verify_password(password, rehashed.password)
+
+    # The password changed in the meantime
+    with pytest.raises(RecommendAppDbError):
+        await db_client.rehash_password(user.id, password, user.password)
@@ -0,0 +1,97 @@
+"""
+Test scrapping a batch of pages
+"""
+
+# Builtin imports
+import asyncio
+from collections import Counter
+from urllib.parse import urlsplit
+
+# Project specific imports
+import pytest
+
+# Local imports
+from recommend_app.db.models.card import NewCard
+from recommend_app.exceptions import RecommendAppError
+from recommend_app.scrapper.batch import BatchLimiter, scrap_many
+from recommend_app.scrapper.guard import HostGuard
+from recommend_app.scrapper.settings import ScrapperSettings
+
+#-----------------------------------------------------------------------------#
+# Fakes
+#-----------------------------------------------------------------------------#
+
+class Scrap:
+    """
+    Records how many scraps run at once, overall and per host
+    """
+    def __init__(self, delays=None, guard=None):
+        self.delays = delays or {}
+        self.guard = guard
+        self.running = Counter()
+        self.max_running = Counter()
+        self.max_total = 0
+
+    async def __call__(self, url):
+        if self.guard is None:
+            return await self.scrap(url)
+        # Like `from_url_async`, the fetch takes a slot of its host
+        async with self.guard.slot(url):
+            return await self.scrap(url)
+
+    async def scrap(self, url):
+        host = urlsplit(url).hostname
+        self.running[host] += 1
+        self.max_running[host] = max(self.max_running[host], self.running[host])
+        self.max_total = max(self.max_total, sum(self.running.values()))
+        try:
+            await asyncio.sleep(self.delays.get(url, 0.01))
+            if 'fail' in url:
+                raise RecommendAppError(f"Failed to load {url}")
+            return NewCard(url=url, title=url)
+        finally:
+            self.running[host] -= 1
+
+async def collect(urls, scrap, limiter):
+    return [result async for result in scrap_many(urls, scrap, limiter)]
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_limits():
+    urls = [f'https://www.netflix.com/title/{i}' for i in range(6)]
+    urls += [f'https://www.primevideo.com/detail/{i}' for i in range(6)]
+    urls += [f'https://www.disneyplus.com/movies/{i}' for i in range(6)]
+    scrap = Scrap(guard=HostGuard(ScrapperSettings(host_concurrency=2, host_rate=1000)))
+
+    results = await collect(urls, scrap, BatchLimiter(max_concurrency=4))
+    assert sorted(result.index for result in results) == list(range(len(urls)))
+    assert all(result.card.url == urls[result.index] for result in results)
+    assert max(scrap.max_running.values()) == 2
+    assert scrap.max_total == 4
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_results_as_they_complete():
+    urls = ['https://slow.com/', 'https://fast.com/', 'https://fail.com/']
+    scrap = Scrap(delays={'https://slow.com/': 0.2})
+
+    results = await collect(urls, scrap, BatchLimiter(max_concurrency=4))
+    assert [result.url for result in results][-1] == 'https://slow.com/'
+
+    failed = next(result for result in results if result.url == 'https://fail.com/')
+    assert failed.card is None
+    assert failed.error == 'Failed to load https://fail.com/'
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_stopping_early_cancels_the_scraps():
+    urls = ['https://fast.com/', 'https://slow.com/']
+    scrap = Scrap(delays={'https://slow.com/': 10})
+
+    results = scrap_many(urls, scrap, BatchLimiter(max_concurrency=4))
+    assert (await anext(results)).url == 'https://fast.com/'
+    await results.aclose()
+
+    await asyncio.sleep(0)
+    assert sum(scrap.running.values()) == 0
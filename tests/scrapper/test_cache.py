@@ -0,0 +1,159 @@
+"""
+Test the cache of the scrapped cards
+"""
+
+# Builtin imports
+import asyncio
+
+# Project specific imports
+import pytest
+
+# Local imports
+from recommend_app.db.exceptions import RecommendAppDbError
+from recommend_app.db.models.card import NewCard
+from recommend_app.exceptions import RecommendAppError
+from recommend_app.scrapper.cache import ScrapeCache, normalize_url
+from recommend_app.scrapper.settings import ScrapperSettings
+
+URL = 'https://www.netflix.com/gb/title/81767635'
+
+#-----------------------------------------------------------------------------#
+# Fakes
+#-----------------------------------------------------------------------------#
+
+class Fetcher:
+    """
+    Counts the fetches, optionally holding them until released
+    """
+    def __init__(self, error=None):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+        self.error = error
+
+    async def __call__(self, url):
+        self.calls += 1
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return NewCard(url=url, title='Godzilla Minus One')
+
+class Store:
+    """
+    Stores the scrapes in a dict
+    """
+    def __init__(self, fail=False):
+        self.scrapes = {}
+        self.fail = fail
+
+    async def get_scrape(self, url):
+        if self.fail:
+            raise RecommendAppDbError("DB is down")
+        return self.scrapes.get(url)
+
+    async def add_scrape(self, url, card, ttl):
+        if self.fail:
+            raise RecommendAppDbError("DB is down")
+        self.scrapes[url] = card
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+@pytest.mark.parametrize("url, normalized", [
+    ('HTTPS://WWW.Netflix.com/gb/title/81767635', 'https://www.netflix.com/gb/title/81767635'),
+    ('https://www.netflix.com:443/gb/title/81767635#details', 'https://www.netflix.com/gb/title/81767635'),
+    ('https://www.netflix.com', 'https://www.netflix.com/'),
+    ('https://www.netflix.com/title?b=2&utm_source=x&a=1&fbclid=y', 'https://www.netflix.com/title?a=1&b=2'),
+    ('http://localhost:8000/page', 'http://localhost:8000/page'),
+    ('dkakasdkjdjakdjadjfalskdjfalk', 'dkakasdkjdjakdjadjfalskdjfalk'),
+])
+def test_normalize_url(url, normalized):
+    assert normalize_url(url) == normalized
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cached():
+    fetch = Fetcher()
+    cache = ScrapeCache()
+
+    card = await cache.get(URL, fetch)
+    assert card.title == 'Godzilla Minus One'
+    assert await cache.get(URL + '#details', fetch) == card
+    assert fetch.calls == 1
+    assert cache.stats.hits == 1
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_concurrent_scraps_share_a_fetch():
+    fetch = Fetcher()
+    fetch.release.clear()
+    cache = ScrapeCache()
+
+    scraps = [asyncio.create_task(cache.get(URL, fetch)) for _ in range(10)]
+    await asyncio.sleep(0)
+    assert cache.stats.in_flight == 1
+
+    fetch.release.set()
+    cards = await asyncio.gather(*scraps)
+    assert fetch.calls == 1
+    assert all(card.title == 'Godzilla Minus One' for card in cards)
+    assert cache.stats.coalesced == 9
+    assert cache.stats.in_flight == 0
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cancelled_scrap_does_not_cancel_the_fetch():
+    fetch = Fetcher()
+    fetch.release.clear()
+    cache = ScrapeCache()
+
+    first = asyncio.create_task(cache.get(URL, fetch))
+    second = asyncio.create_task(cache.get(URL, fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    fetch.release.set()
+    assert (await second).title == 'Godzilla Minus One'
+    assert fetch.calls == 1
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_failures_are_not_cached():
+    fetch = Fetcher(error=RecommendAppError("Failed to load"))
+    cache = ScrapeCache()
+
+    for _ in range(2):
+        with pytest.raises(RecommendAppError):
+            await cache.get(URL, fetch)
+    assert fetch.calls == 2
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_stored():
+    store = Store()
+    fetch = Fetcher()
+
+    await ScrapeCache(store).get(URL, fetch)
+    assert URL in store.scrapes
+
+    # Another worker reads it from the store
+    cache = ScrapeCache(store)
+    assert (await cache.get(URL, fetch)).title == 'Godzilla Minus One'
+    assert fetch.calls == 1
+    assert cache.stats.stored == 1
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_failing_store():
+    fetch = Fetcher()
+    cache = ScrapeCache(Store(fail=True))
+
+    assert (await cache.get(URL, fetch)).title == 'Godzilla Minus One'
+    assert await cache.get(URL, fetch)
+    assert fetch.calls == 1
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_disabled():
+    store = Store()
+    fetch = Fetcher()
+    cache = ScrapeCache(store, ScrapperSettings(cache_ttl=0))
+
+    await cache.get(URL, fetch)
+    await cache.get(URL, fetch)
+    assert fetch.calls == 2
+    assert not store.scrapes
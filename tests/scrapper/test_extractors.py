@@ -0,0 +1,73 @@
+"""
+Test the extractors of the known sites
+"""
+
+# Project specific imports
+import pytest
+
+# Local imports
+from recommend_app.scrapper.extractors import (
+    NetflixExtractor,
+    OpenGraphExtractor,
+    extract,
+    get_extractor,
+    register,
+)
+from recommend_app.scrapper.scrapper import Scrapper
+from .test_scrapper import get_html_content, get_resource
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+def test_get_extractor():
+    assert isinstance(get_extractor('https://www.netflix.com/gb/title/81767635'), NetflixExtractor)
+    assert isinstance(get_extractor('https://NETFLIX.com/title/1'), NetflixExtractor)
+    assert get_extractor('https://notnetflix.com/title/1') is None
+    assert get_extractor('https://netflix.com.evil.org/') is None
+    assert get_extractor('not a url') is None
+    assert get_extractor(None) is None
+
+@pytest.mark.parametrize('filename, url', [
+    ('netflix.html', 'https://www.netflix.com/gb/title/81767635'),
+    ('netflix_og.html', 'https://www.netflix.com/gb/title/81767635'),
+    ('prime.html', 'https://www.primevideo.com/detail/0LFTUUH6Q7ZCJJ9TWV4ZAZW9QN'),
+    ('disney.html', 'https://www.disneyplus.com/movies/the-batman'),
+    ('dplus.html', 'https://www.discoveryplus.com/gb/show/grand-designs'),
+])
+def test_same_as_generic(filename, url):
+    content = get_html_content(get_resource(filename))
+    expected = Scrapper(content).scrap()
+    assert extract(content, url=url) == expected
+    assert extract(content.encode('utf-8'), url=url) == expected
+
+def test_fallback_to_generic():
+    # Only the title in ld+json, the rest from the meta tags
+    content = ('<html><head><title>Page</title>'
+               '<meta name="description" content="From &amp; meta">'
+               '<script type="application/ld+json">{"name": "Site title"}</script>'
+               '</head></html>')
+    data = extract(content, url='https://www.netflix.com/title/1')
+    assert data == {'title': 'Site title', 'description': 'From & meta'}
+
+def test_same_order_as_generic():
+    # The ld+json, then the og tags, then the meta tags, whatever the site
+    content = ('<html><head><title>Page</title>'
+               '<meta name="title" content="Meta title">'
+               '<meta name="description" content="Meta description">'
+               '<meta property="og:title" content="Og title">'
+               '<script type="application/ld+json">{"description": "Ld description"}</script>'
+               '</head></html>')
+    expected = {'title': 'Og title', 'description': 'Ld description'}
+    assert Scrapper(content).scrap() == expected
+    assert extract(content, url='https://www.primevideo.com/detail/1') == expected
+
+def test_register():
+    content = ('<html><head><title>Generic</title>'
+               '<meta content=\'Og title\' property="og:title" /></head></html>')
+    url = 'https://videos.example.com/1'
+    assert extract(content, url=url) == {'title': 'Og title'}
+
+    register(OpenGraphExtractor('example.com'))
+    assert isinstance(get_extractor(url), OpenGraphExtractor)
+    assert extract(content, url=url) == {'title': 'Og title'}
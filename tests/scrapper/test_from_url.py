@@ -2,8 +2,13 @@
 Test scrapper from_url
 """
 
+# Project specific imports
+import pytest
+
 # Local imports
 from recommend_app import scrapper
+from recommend_app.scrapper.settings import ScrapperSettings
+from recommend_app.scrapper.streaming import Page
 from recommend_app.db.models.card import NewCard
 
 #-----------------------------------------------------------------------------#
@@ -29,3 +34,17 @@ def test_from_url_no_returned_url(mocker):
     assert card.url == 'https://www.netflix.com/gb/title/81767635'
     assert not card.title
     assert not card.description
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("backend", ["httpx", "requests"])
+async def test_from_url_async(mocker, backend):
+    mocker.patch("recommend_app.scrapper.get_settings", return_value=ScrapperSettings(backend=backend))
+    page = Page(content=b'<html><head><title>Godzilla Minus One</title></head></html>')
+    httpx_mock = mocker.patch("recommend_app.scrapper.using_httpx.fetch", return_value=page)
+    requests_mock = mocker.patch("recommend_app.scrapper.using_requests.fetch", return_value=page)
+
+    card = await scrapper.from_url_async('https://www.netflix.com/gb/title/81767635')
+    assert card.url == 'https://www.netflix.com/gb/title/81767635'
+    assert card.title == 'Godzilla Minus One'
+    assert (httpx_mock if backend == "httpx" else requests_mock).call_count == 1
+    assert (requests_mock if backend == "httpx" else httpx_mock).call_count == 0
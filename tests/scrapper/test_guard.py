@@ -0,0 +1,123 @@
+"""
+Test the guard of the fetches of each host
+"""
+
+# Builtin imports
+import asyncio
+from collections import Counter
+
+# Project specific imports
+import pytest
+
+# Local imports
+from recommend_app.exceptions import RecommendAppError
+from recommend_app.scrapper.exceptions import RecommendScrapperHostError, RecommendScrapperHostUnavailable
+from recommend_app.scrapper.guard import HostGuard
+from recommend_app.scrapper.settings import ScrapperSettings
+
+SETTINGS = ScrapperSettings(
+    host_concurrency=2,
+    host_rate=1000,
+    breaker_window=4,
+    breaker_min_fetches=4,
+    breaker_cooldown_seconds=60,
+)
+
+#-----------------------------------------------------------------------------#
+# Helpers
+#-----------------------------------------------------------------------------#
+
+async def fetch(guard, url, error=None, delay=0):
+    async with guard.slot(url):
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+
+async def fail(guard, url, error):
+    with pytest.raises(type(error)):
+        await fetch(guard, url, error)
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_host_failures_open_circuit():
+    guard = HostGuard(SETTINGS)
+    url = 'https://www.slow.com/title/1'
+    for _ in range(4):
+        await fail(guard, url, RecommendScrapperHostError(f"{url} timed out"))
+
+    # Fails fast, the other hosts go through
+    with pytest.raises(RecommendScrapperHostUnavailable) as err:
+        await fetch(guard, url)
+    assert 59 < err.value.retry_after <= 60
+    await fetch(guard, 'https://www.netflix.com/title/1')
+
+    stats = guard.stats
+    assert stats.hosts == 2
+    assert stats.open == ['www.slow.com']
+    assert stats.rejected == 1
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_page_failures_keep_circuit_closed():
+    guard = HostGuard(SETTINGS)
+    url = 'https://www.netflix.com/title/not-found'
+    for _ in range(8):
+        await fail(guard, url, RecommendAppError(f"{url} returned a response code - 404"))
+
+    await fetch(guard, url)
+    assert guard.stats.open == []
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_throttled():
+    guard = HostGuard(SETTINGS)
+    url = 'https://www.busy.com/title/1'
+    await fail(guard, url, RecommendScrapperHostError("Too many", status_code=429, retry_after=0.05))
+    assert guard.stats.open == ['www.busy.com']
+    assert guard.stats.throttled == 1
+    with pytest.raises(RecommendScrapperHostUnavailable):
+        await fetch(guard, url)
+
+    # Open for as long as the site asked, then probed
+    await asyncio.sleep(0.06)
+    await fetch(guard, url)
+    assert guard.stats.open == []
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_slow_fetches_open_circuit():
+    guard = HostGuard(SETTINGS.model_copy(update={"breaker_slow_seconds": 0.01}))
+    url = 'https://www.slow.com/title/1'
+    for _ in range(4):
+        await fetch(guard, url, delay=0.02)
+
+    assert guard.stats.open == ['www.slow.com']
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_concurrency_per_host():
+    guard = HostGuard(SETTINGS)
+    running = Counter()
+    max_running = Counter()
+
+    async def fetch_host(host):
+        async with guard.slot(f'https://{host}/title'):
+            running[host] += 1
+            max_running[host] = max(max_running[host], running[host])
+            await asyncio.sleep(0.01)
+            running[host] -= 1
+
+    await asyncio.gather(*(fetch_host(host) for host in ['a.com', 'b.com'] * 5))
+    assert max_running == {'a.com': 2, 'b.com': 2}
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_busy_host():
+    guard = HostGuard(SETTINGS.model_copy(update={"host_concurrency": 1, "total_timeout": 0.05}))
+    url = 'https://www.netflix.com/title/1'
+    slow = asyncio.create_task(fetch(guard, url, delay=0.2))
+    await asyncio.sleep(0)
+
+    # No slot within the timeout, the host is not blamed for it
+    with pytest.raises(RecommendAppError):
+        await fetch(guard, url)
+    await slow
+    assert guard.stats.open == []
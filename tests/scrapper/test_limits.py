@@ -0,0 +1,123 @@
+"""
+Test the limits of the rate of the fetches
+"""
+
+# Builtin imports
+import time
+
+# Project specific imports
+import pytest
+
+# Local imports
+from recommend_app.scrapper.limits import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, TokenBucket
+
+#-----------------------------------------------------------------------------#
+# Fakes
+#-----------------------------------------------------------------------------#
+
+class Clock:
+    """
+    Time that only moves when told to
+    """
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def create_breaker(clock):
+    return CircuitBreaker(window=4, min_fetches=4, error_ratio=0.5, cooldown=30, clock=clock)
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_try_acquire():
+    bucket = TokenBucket(rate=1, capacity=2)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    # Empty, the next token comes in a second
+    assert not bucket.try_acquire()
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_acquire_waits():
+    bucket = TokenBucket(rate=20, capacity=1)
+    start = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+
+    # The first token is there, the other 4 come every 50ms
+    assert time.monotonic() - start >= 0.19
+
+def test_breaker_opens():
+    breaker = create_breaker(Clock())
+    breaker.failure()
+    breaker.failure()
+    # Not enough fetches yet
+    assert breaker.state == CLOSED
+
+    breaker.success()
+    breaker.failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+def test_breaker_window():
+    breaker = create_breaker(Clock())
+    for _ in range(10):
+        breaker.success()
+        breaker.failure()
+        breaker.success()
+        breaker.success()
+
+    # The failures of the window are under the ratio
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+def test_breaker_probe():
+    clock = Clock()
+    breaker = create_breaker(clock)
+    breaker.trip()
+    clock.now = 30
+    assert breaker.state == HALF_OPEN
+
+    # A single probe at a time
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.success()
+    assert breaker.state == CLOSED
+
+def test_breaker_failed_probe():
+    clock = Clock()
+    breaker = create_breaker(clock)
+    breaker.trip(seconds=5)
+    clock.now = 5
+    assert breaker.allow()
+    breaker.failure()
+    assert breaker.state == OPEN
+
+    # Open for the whole cooldown again
+    clock.now = 34
+    assert breaker.state == OPEN
+    clock.now = 35
+    assert breaker.state == HALF_OPEN
+
+def test_breaker_cancelled_probe():
+    clock = Clock()
+    breaker = create_breaker(clock)
+    breaker.trip()
+    clock.now = 30
+    assert breaker.allow()
+    breaker.cancel()
+    # The next fetch probes the site instead
+    assert breaker.allow()
+
+def test_breaker_retry_after():
+    clock = Clock()
+    breaker = create_breaker(clock)
+    assert breaker.retry_after == 0
+    breaker.trip(seconds=10)
+    clock.now = 4
+    assert breaker.retry_after == 6
+    clock.now = 12
+    assert breaker.retry_after == 0
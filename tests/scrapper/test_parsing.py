@@ -0,0 +1,76 @@
+"""
+Test parsing the pages in a pool of processes
+"""
+
+# Builtin imports
+import threading
+
+# Project specific imports
+import pytest
+
+# Local imports
+from recommend_app import scrapper
+from recommend_app.exceptions import RecommendAppError
+from recommend_app.scrapper import parsing
+from recommend_app.scrapper.parsing import ParsePool, parse_page
+from recommend_app.scrapper.streaming import Page
+
+from .test_scrapper import get_resource
+
+URL = 'https://www.netflix.com/gb/title/81767635'
+
+#-----------------------------------------------------------------------------#
+# Fixtures
+#-----------------------------------------------------------------------------#
+
+@pytest.fixture()
+def page():
+    with open(get_resource('netflix.html'), 'rb') as f:
+        return Page(content=f.read(), encoding='utf-8')
+
+@pytest.fixture()
+def pool():
+    pool = ParsePool(max_workers=1, timeout=30)
+    yield pool
+    pool.shutdown()
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_inline(page):
+    pool = ParsePool(max_workers=0, timeout=30)
+    data = await pool.parse(page, URL)
+    assert data == parse_page(page.content, page.encoding)
+    assert pool.parse_blocking(page, URL) == data
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_pool(page, pool):
+    expected = parse_page(page.content, page.encoding)
+    assert await pool.parse(page, URL) == expected
+    assert pool.parse_blocking(page, URL) == expected
+
+    # Created again after a shutdown
+    pool.shutdown()
+    assert await pool.parse(page, URL) == expected
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_timeout(page):
+    # Spawning the process alone takes longer than that
+    pool = ParsePool(max_workers=1, timeout=0.001)
+    try:
+        with pytest.raises(RecommendAppError, match="timed out"):
+            await pool.parse(page, URL)
+        with pytest.raises(RecommendAppError, match="timed out"):
+            pool.parse_blocking(page, URL)
+    finally:
+        pool.shutdown()
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_close_waits_off_the_loop(monkeypatch):
+    # The processes are waited for without blocking the event loop
+    threads = []
+    monkeypatch.setattr(parsing, "shutdown", lambda: threads.append(threading.current_thread()))
+    await scrapper.close()
+    assert threads and threads[0] is not threading.main_thread()
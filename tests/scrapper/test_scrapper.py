@@ -61,3 +61,23 @@ def test_no_data_extracted():
     s = Scrapper(text)
     data = s.scrap()
     assert not data
+
+def test_first_tag_wins():
+    text = ('<html><head><title>First</title><title>Second</title>'
+            '<meta property="og:url">'
+            '<meta property="og:url" content="https://first.com">'
+            '<meta property="og:url" content="https://second.com">'
+            '<meta name="description" content="First description">'
+            '<meta name="description" content="Second description">'
+            '<script>var x = 1;</script>'
+            '<script type="application/ld+json">{"image": "https://first.com/image.jpg"}</script>'
+            '<script type="application/ld+json">{"image": "https://second.com/image.jpg"}</script>'
+            '</head></html>')
+    data = Scrapper(text).scrap()
+
+    assert data == {
+        'thumbnail': 'https://first.com/image.jpg',
+        'url': 'https://first.com',
+        'description': 'First description',
+        'title': 'First',
+    }
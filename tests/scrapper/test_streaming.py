@@ -0,0 +1,122 @@
+"""
+Test reading the pages incrementally
+"""
+
+# Builtin imports
+import codecs
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+# Project specific imports
+import pytest
+
+# Local imports
+from recommend_app.scrapper.scrapper import Scrapper
+from recommend_app.scrapper.streaming import PageReader, detect_encoding, get_charset, get_retry_after
+
+from .test_scrapper import get_resource
+
+HEAD = (b'<html><head><title>Page</title>'
+        b'<meta property="og:title" content="Streamed title"></head>')
+BODY = b'<body>' + b'<p>filler</p>' * 10_000 + b'</body></html>'
+
+#-----------------------------------------------------------------------------#
+# Functions
+#-----------------------------------------------------------------------------#
+
+def chunks(content, size=64):
+    for i in range(0, len(content), size):
+        yield content[i:i + size]
+
+def read(reader, content):
+    fed = 0
+    for chunk in chunks(content):
+        fed += len(chunk)
+        if reader.feed(chunk):
+            break
+    return fed
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+def test_stops_after_the_head():
+    reader = PageReader(max_bytes=1024 * 1024)
+    fed = read(reader, HEAD + BODY)
+
+    page = reader.page()
+    assert page.head_complete
+    assert not page.truncated
+    assert fed < len(HEAD) + 1024
+    assert Scrapper(page.content).scrap()['title'] == 'Streamed title'
+
+def test_head_without_closing_tag():
+    content = HEAD.replace(b'</head>', b'') + BODY
+    reader = PageReader(max_bytes=1024 * 1024)
+    fed = read(reader, content)
+
+    assert reader.page().head_complete
+    assert fed < len(HEAD) + 1024
+
+def test_byte_cap():
+    content = b'<html><head>' + b'<meta name="x" content="y">' * 1000
+    reader = PageReader(max_bytes=1000)
+    read(reader, content)
+
+    page = reader.page()
+    assert page.truncated
+    assert not page.head_complete
+    assert len(page.content) == 1000
+
+def test_whole_page():
+    reader = PageReader(max_bytes=1024 * 1024, head_only=False)
+    read(reader, HEAD + BODY)
+
+    page = reader.page()
+    assert page.content == HEAD + BODY
+    assert not page.head_complete
+    assert not page.truncated
+
+def test_scrap_bytes():
+    with open(get_resource('netflix.html'), 'rb') as f:
+        reader = PageReader(max_bytes=1024 * 1024)
+        read(reader, f.read())
+
+    data = Scrapper(reader.page().content, encoding='utf-8').scrap()
+    assert data['title'] == 'Godzilla Minus One'
+
+@pytest.mark.parametrize("content_type, charset", [
+    ('text/html; charset=ISO-8859-1', 'iso-8859-1'),
+    ('text/html', None),
+    (None, None),
+])
+def test_get_charset(content_type, charset):
+    assert get_charset(content_type) == charset
+
+@pytest.mark.parametrize("content, declared, encoding", [
+    (codecs.BOM_UTF8 + b'<html>', 'iso-8859-1', 'utf-8'),
+    (b'<html><meta charset="utf-8">', 'iso-8859-1', 'iso-8859-1'),
+    (b'<html><meta charset="utf-8">', 'not-a-charset', 'utf-8'),
+    (b'<meta http-equiv="Content-Type" content="text/html; charset=Shift_JIS">', None, 'Shift_JIS'),
+    ('<title>Café</title>'.encode('utf-8'), None, 'utf-8'),
+    # Cut in the middle of a character
+    ('<title>Café</title>'.encode('utf-8')[:11], None, 'utf-8'),
+    ('<title>Café</title>'.encode('latin-1'), None, 'windows-1252'),
+])
+def test_detect_encoding(content, declared, encoding):
+    assert detect_encoding(content, declared) == encoding
+
+def test_scrap_undeclared_encoding():
+    content = '<html><head><title>Café crème</title></head></html>'
+    assert Scrapper(content.encode('latin-1')).scrap()['title'] == 'Café crème'
+    assert Scrapper(content.encode('utf-8')).scrap()['title'] == 'Café crème'
+
+def test_retry_after():
+    assert get_retry_after({'retry-after': '120'}) == 120
+    assert get_retry_after({}) is None
+    assert get_retry_after({'retry-after': 'soon'}) is None
+
+    date = datetime.now(timezone.utc) + timedelta(minutes=2)
+    assert 100 < get_retry_after({'retry-after': format_datetime(date, usegmt=True)}) <= 120
+    # A date in the past asks for no delay
+    assert get_retry_after({'retry-after': 'Wed, 21 Oct 2015 07:28:00 GMT'}) == 0
@@ -0,0 +1,175 @@
+"""
+Test the async httpx backend of the scrapper
+"""
+
+# Builtin imports
+import asyncio
+
+# Project specific imports
+import httpx
+import pytest
+
+# Local imports
+from recommend_app.exceptions import RecommendAppError
+from recommend_app.scrapper import using_httpx
+from recommend_app.scrapper.exceptions import RecommendScrapperHostError
+from recommend_app.scrapper.settings import ScrapperSettings
+from recommend_app.scrapper.streaming import get_conditional_headers
+
+from .test_scrapper import get_html_content, get_resource
+
+#-----------------------------------------------------------------------------#
+# Fixtures
+#-----------------------------------------------------------------------------#
+
+@pytest.fixture()
+def serve(monkeypatch):
+    """
+    Serves the requests of the scrapper with the given handler
+    """
+    def _serve(handler, **settings):
+        settings = ScrapperSettings(**settings)
+        client = using_httpx.create_client(settings)
+        client._transport = httpx.MockTransport(handler)
+        monkeypatch.setattr(using_httpx, "get_client", lambda: client)
+        monkeypatch.setattr(using_httpx, "get_settings", lambda: settings)
+        return client
+    return _serve
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_scrap(serve):
+    html = get_html_content(get_resource('netflix.html'))
+    serve(lambda request: httpx.Response(200, text=html))
+
+    data = await using_httpx.scrap('https://www.netflix.com/gb/title/81767635')
+    assert data['title'] == 'Godzilla Minus One'
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_not_found(serve):
+    serve(lambda request: httpx.Response(404))
+    with pytest.raises(RecommendAppError):
+        await using_httpx.scrap('https://www.netflix.com/title/not-found')
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("url", ['/data/Python.html', 532, 'dkakasdkjdjakdjadjfalskdjfalk'])
+async def test_invalid_urls(url):
+    with pytest.raises(RecommendAppError):
+        await using_httpx.scrap(url)
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_read_timeout(serve):
+    def handler(request):
+        raise httpx.ReadTimeout("Too slow", request=request)
+
+    serve(handler)
+    with pytest.raises(RecommendAppError, match="timed out"):
+        await using_httpx.scrap('https://www.example.com/')
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_total_timeout(serve):
+    async def handler(request):
+        await asyncio.sleep(1)
+        return httpx.Response(200)
+
+    serve(handler, total_timeout=0.05)
+    with pytest.raises(RecommendAppError, match="timed out"):
+        await using_httpx.scrap('https://www.example.com/')
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_redirect_limit(serve):
+    serve(lambda request: httpx.Response(302, headers={"Location": str(request.url) + "x"}),
+          max_redirects=2)
+    with pytest.raises(RecommendAppError, match="redirected"):
+        await using_httpx.scrap('https://www.example.com/')
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.setenv("SCRAPPER_BACKEND", "requests")
+    monkeypatch.setenv("SCRAPPER_TOTAL_TIMEOUT", "3.5")
+    settings = ScrapperSettings.from_env(max_redirects=1)
+    assert settings.backend == "requests"
+    assert settings.total_timeout == 3.5
+    assert settings.max_redirects == 1
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_stops_after_the_head(serve):
+    sent = []
+
+    async def body():
+        for chunk in [b'<html><head><title>Streamed</title></head>']:
+            sent.append(chunk)
+            yield chunk
+        for _ in range(1000):
+            chunk = b'<p>filler</p>' * 1000
+            sent.append(chunk)
+            yield chunk
+
+    serve(lambda request: httpx.Response(200, content=body()))
+    data = await using_httpx.scrap('https://www.example.com/')
+    assert data['title'] == 'Streamed'
+    assert len(sent) < 10
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_byte_cap(serve):
+    html = b'<html><head><title>Capped</title>' + b'<meta name="x" content="y">' * 10_000
+    serve(lambda request: httpx.Response(200, content=html), max_bytes=1024)
+
+    page = await using_httpx.fetch('https://www.example.com/')
+    assert page.truncated
+    assert len(page.content) == 1024
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_conditional_fetch(serve):
+    html = get_html_content(get_resource('netflix.html'))
+
+    def handler(request):
+        if request.headers.get('If-None-Match') == '"v1"':
+            return httpx.Response(304, headers={'ETag': '"v1"'})
+        return httpx.Response(200, text=html, headers={
+            'ETag': '"v1"', 'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'})
+
+    serve(handler)
+    page = await using_httpx.fetch('https://www.example.com/')
+    assert page.etag == '"v1"'
+    assert page.last_modified == 'Wed, 21 Oct 2015 07:28:00 GMT'
+    assert not page.not_modified
+
+    page = await using_httpx.fetch('https://www.example.com/', get_conditional_headers(etag='"v1"'))
+    assert page.not_modified
+    assert page.content == b''
+    assert page.etag == '"v1"'
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_unexpected_not_modified(serve):
+    serve(lambda request: httpx.Response(304))
+    with pytest.raises(RecommendAppError):
+        await using_httpx.fetch('https://www.example.com/')
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("status_code,retry_after", [(429, 120.0), (503, 120.0), (500, None)])
+async def test_host_errors(serve, status_code, retry_after):
+    headers = {'Retry-After': '120'} if retry_after else {}
+    serve(lambda request: httpx.Response(status_code, headers=headers))
+    with pytest.raises(RecommendScrapperHostError) as err:
+        await using_httpx.fetch('https://www.example.com/')
+    assert err.value.status_code == status_code
+    assert err.value.retry_after == retry_after
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_page_errors(serve):
+    serve(lambda request: httpx.Response(404))
+    with pytest.raises(RecommendAppError) as err:
+        await using_httpx.fetch('https://www.example.com/')
+    assert not isinstance(err.value, RecommendScrapperHostError)
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_timeout_is_host_error(serve):
+    def handler(request):
+        raise httpx.ConnectTimeout("Timed out", request=request)
+
+    serve(handler)
+    with pytest.raises(RecommendScrapperHostError):
+        await using_httpx.fetch('https://www.example.com/')
@@ -0,0 +1,87 @@
+"""
+Test the blocking requests backend of the scrapper
+"""
+
+# Builtin imports
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Project specific imports
+import pytest
+
+# Local imports
+from recommend_app.exceptions import RecommendAppError
+from recommend_app.scrapper import using_requests
+from recommend_app.scrapper.exceptions import RecommendScrapperHostError
+from recommend_app.scrapper.settings import ScrapperSettings
+
+#-----------------------------------------------------------------------------#
+# Fixtures
+#-----------------------------------------------------------------------------#
+
+class Handler(BaseHTTPRequestHandler):
+    """
+    Redirects the /redirect paths forever, trickles the body of the others
+    """
+    paths = []
+
+    def do_GET(self):
+        self.paths.append(self.path)
+        if self.path.startswith('/redirect'):
+            self.send_response(302)
+            self.send_header('Location', f'/redirect/{len(self.paths)}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.end_headers()
+        try:
+            for _ in range(20):
+                self.wfile.write(b'<p>' + b'a' * 1024 * 16 + b'</p>')
+                self.wfile.flush()
+                time.sleep(0.05)
+        except OSError:
+            pass
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture()
+def serve(monkeypatch):
+    """
+    Serves the requests of the scrapper with `Handler` and the given settings
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    Handler.paths = []
+
+    def _serve(**settings):
+        settings = ScrapperSettings(**settings)
+        monkeypatch.setattr(using_requests, "get_settings", lambda: settings)
+        return f'http://127.0.0.1:{server.server_address[1]}'
+
+    yield _serve
+    server.shutdown()
+    server.server_close()
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+def test_total_timeout(serve):
+    url = serve(total_timeout=0.2, stream_head=False, max_bytes=10 * 1024 * 1024)
+    started = time.monotonic()
+    with pytest.raises(RecommendScrapperHostError):
+        using_requests.fetch(f'{url}/slow')
+    assert time.monotonic() - started < 0.5
+
+def test_max_redirects(serve):
+    url = serve(max_redirects=2)
+    with pytest.raises(RecommendAppError, match='redirected too many times'):
+        using_requests.fetch(f'{url}/redirect')
+    assert len(Handler.paths) == 3
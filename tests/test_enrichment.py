@@ -0,0 +1,126 @@
+"""
+Test the enrichment workers
+"""
+
+# Builtin imports
+from datetime import datetime, timedelta, timezone
+
+# Project specific imports
+import pytest
+import pytest_asyncio
+
+# Local imports
+from recommend_app.db.models.card import NewCard
+from recommend_app.enrichment import (
+    EnrichmentSettings,
+    EnrichmentWorker,
+    get_backoff,
+    needs_enrichment,
+)
+from recommend_app.exceptions import RecommendAppError
+from recommend_app.scrapper import Revalidation
+from recommend_app.scrapper.exceptions import RecommendScrapperHostUnavailable
+from . import utils
+
+SETTINGS = EnrichmentSettings(max_attempts=2, backoff_seconds=0)
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def bare_card(db_client):
+    # Drain the jobs left by the other tests
+    while await db_client.claim_enrichment_job('drain', lease_seconds=3600):
+        pass
+
+    user = await db_client.add_user(utils.create_user())
+    board = await db_client.add_board(utils.create_public_board(), user.id)
+    card = await db_client.add_card(NewCard(url=f"https://{utils.get_random_name()}.com"), board.id)
+    await db_client.enqueue_enrichment([card])
+    return card
+
+class FakeScrap:
+    """
+    Scraps the urls without fetching them
+    """
+    def __init__(self, error=None, unavailable=0):
+        self.error = error
+        self.unavailable = unavailable
+        self.urls = []
+
+    async def __call__(self, url):
+        self.urls.append(url)
+        if len(self.urls) <= self.unavailable:
+            raise RecommendScrapperHostUnavailable("Failing host", retry_after=0)
+        if self.error:
+            raise RecommendAppError(self.error)
+        card = NewCard(url=url, title='Scrapped title', thumbnail='https://img.com/a.png')
+        return Revalidation(card=card, etag='"v1"')
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+def test_needs_enrichment():
+    assert needs_enrichment(NewCard(url='https://a.com'))
+    assert not needs_enrichment(NewCard(url='https://a.com', title='A'))
+
+def test_backoff():
+    settings = EnrichmentSettings(backoff_seconds=30, max_backoff_seconds=100)
+    assert [get_backoff(settings, attempts) for attempts in (1, 2, 3, 4)] == [30, 60, 100, 100]
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_enrich(db_client, bare_card):
+    scrap = FakeScrap()
+    worker = EnrichmentWorker(db_client, scrap, SETTINGS)
+    assert await worker.run_once()
+    assert scrap.urls == [bare_card.url]
+
+    card = await db_client.get_card(bare_card.id)
+    assert card.title == 'Scrapped title'
+    assert card.thumbnail == 'https://img.com/a.png'
+    assert card.description is None
+
+    # The page is kept for the refresh
+    pages = await db_client.get_stale_pages(datetime.now(timezone.utc) + timedelta(days=1), limit=10_000)
+    page = next(page for page in pages if page.card_id == bare_card.id)
+    assert page.etag == '"v1"'
+    assert page.scraped.title == 'Scrapped title'
+    assert page.scraped_at > datetime.now() - timedelta(minutes=1)
+
+    # Done
+    assert not await worker.run_once()
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_retry_then_dead(db_client, bare_card):
+    scrap = FakeScrap(error='Timed out')
+    worker = EnrichmentWorker(db_client, scrap, SETTINGS)
+
+    # Retried right away, no backoff
+    assert await worker.run_once()
+    assert await worker.run_once()
+    # Dead after max_attempts
+    assert not await worker.run_once()
+    assert len(scrap.urls) == 2
+
+    card = await db_client.get_card(bare_card.id)
+    assert card.title is None
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_removed_card(db_client, bare_card):
+    await db_client.remove_card(bare_card.id)
+
+    scrap = FakeScrap()
+    worker = EnrichmentWorker(db_client, scrap, SETTINGS)
+    assert await worker.run_once()
+    assert not scrap.urls
+    assert not await worker.run_once()
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_host_unavailable(db_client, bare_card):
+    # Rejected more times than the job has attempts
+    scrap = FakeScrap(unavailable=3)
+    worker = EnrichmentWorker(db_client, scrap, SETTINGS)
+    for _ in range(4):
+        assert await worker.run_once()
+    assert len(scrap.urls) == 4
+
+    card = await db_client.get_card(bare_card.id)
+    assert card.title == 'Scrapped title'
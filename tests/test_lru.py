@@ -0,0 +1,68 @@
+"""
+Test the LRU cache
+"""
+
+# Local imports
+from recommend_app.lru import LRUCache
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+def test_get_and_set():
+    cache = LRUCache(max_bytes=100, sizeof=len)
+    cache.set("a", "xx")
+    assert cache.get("a") == "xx"
+    assert cache.get("b") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+    assert cache.size_bytes == 2
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(max_bytes=6, sizeof=len)
+    cache.set("a", "xx")
+    cache.set("b", "xx")
+    cache.set("c", "xx")
+
+    # "a" is now the most recently used
+    cache.get("a")
+    cache.set("d", "xx")
+
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache and "d" in cache
+    assert cache.stats.evictions == 1
+    assert cache.size_bytes == 6
+
+def test_value_bigger_than_cache():
+    cache = LRUCache(max_bytes=2, sizeof=len)
+    assert not cache.set("a", "xxx")
+    assert len(cache) == 0
+
+def test_ttl():
+    now = [0.0]
+    cache = LRUCache(max_bytes=100, ttl=10, sizeof=len, clock=lambda: now[0])
+    cache.set("a", "xx")
+    now[0] = 9
+    assert cache.get("a") == "xx"
+    now[0] = 10
+    assert cache.get("a") is None
+    assert cache.size_bytes == 0
+
+def test_ttl_per_value():
+    now = [0.0]
+    cache = LRUCache(max_bytes=100, ttl=10, sizeof=len, clock=lambda: now[0])
+    cache.set("a", "xx", ttl=2)
+    cache.set("b", "xx")
+    now[0] = 2
+    assert cache.get("a") is None
+    assert cache.get("b") == "xx"
+
+def test_on_remove():
+    removed = []
+    cache = LRUCache(max_bytes=2, sizeof=len, on_remove=lambda key, value: removed.append(key))
+    cache.set("a", "x")
+    cache.set("b", "x")
+    cache.set("c", "x")
+    cache.pop("b")
+    cache.clear()
+    assert removed == ["a", "b", "c"]
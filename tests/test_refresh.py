@@ -0,0 +1,163 @@
+"""
+Test the refresh of the stale cards
+"""
+
+# Builtin imports
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+# Project specific imports
+import pytest
+import pytest_asyncio
+
+# Local imports
+from recommend_app.db.models.card import NewCard, UpdateCard
+from recommend_app.db.models.page import ScrapedFields
+from recommend_app.exceptions import RecommendAppError
+from recommend_app.refresh import RefreshScheduler, RefreshSettings
+from recommend_app.scrapper import Revalidation
+from recommend_app.scrapper.exceptions import RecommendScrapperHostUnavailable
+from . import utils
+
+SETTINGS = RefreshSettings(rate=1000, batch_size=10_000)
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def stale_cards(db_client):
+    """
+    Two boards with a card of the same page, fetched a month ago
+    """
+    user = await db_client.add_user(utils.create_user())
+    url = f"https://www.{utils.get_random_name()}.com/title/1"
+    cards = []
+    for _ in range(2):
+        board = await db_client.add_board(utils.create_public_board(), user.id)
+        card = await db_client.add_card(NewCard(url=url, title='Old title', description='Old description'), board.id)
+        await db_client.set_page_validators(
+            card.id, '"v1"', None, datetime.now(timezone.utc) - timedelta(days=30),
+            scraped=ScrapedFields(title='Old title', description='Old description'))
+        cards.append(card)
+    return cards
+
+class FakeRevalidate:
+    """
+    Answers the fetches of the page of the cards, lets the others through
+    """
+    def __init__(self, url, result):
+        self.url = url
+        self.result = result
+        self.calls = []
+
+    async def __call__(self, url, etag, last_modified):
+        if url != self.url:
+            return Revalidation(etag=etag, last_modified=last_modified)
+
+        self.calls.append((url, etag, last_modified))
+        if isinstance(self.result, BaseException):
+            raise self.result
+        return self.result
+
+async def get_page(db_client, card_id):
+    # The page was checked: it isn't stale anymore
+    pages = await db_client.get_stale_pages(datetime.now(timezone.utc) + timedelta(days=1), limit=10_000)
+    return next(page for page in pages if page.card_id == card_id)
+
+#-----------------------------------------------------------------------------#
+# Tests
+#-----------------------------------------------------------------------------#
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_not_modified(db_client, stale_cards):
+    url = stale_cards[0].url
+    revalidate = FakeRevalidate(url, Revalidation(etag='"v1"'))
+    await RefreshScheduler(db_client, revalidate, SETTINGS).run_once()
+
+    # One fetch for both cards, with the validators of the last one
+    assert revalidate.calls == [(url, '"v1"', None)]
+    for card in stale_cards:
+        assert (await db_client.get_card(card.id)).title == 'Old title'
+        page = await get_page(db_client, card.id)
+        assert page.scraped_at > datetime.now() - timedelta(minutes=1)
+
+    # Not stale anymore
+    await RefreshScheduler(db_client, revalidate, SETTINGS).run_once()
+    assert len(revalidate.calls) == 1
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_modified(db_client, stale_cards):
+    url = stale_cards[0].url
+    card = NewCard(url=url, title='New title', thumbnail='https://img.com/a.png')
+    revalidate = FakeRevalidate(url, Revalidation(card=card, etag='"v2"'))
+    stats = await RefreshScheduler(db_client, revalidate, SETTINGS).run_once()
+    assert stats.updated >= 2
+
+    for stale in stale_cards:
+        refreshed = await db_client.get_card(stale.id)
+        assert refreshed.title == 'New title'
+        assert refreshed.thumbnail == 'https://img.com/a.png'
+        assert (await get_page(db_client, stale.id)).etag == '"v2"'
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_user_edits_kept(db_client, stale_cards):
+    edited, untouched = stale_cards
+    await db_client.update_card(edited.id, UpdateCard(description='My own notes'))
+
+    url = edited.url
+    card = NewCard(url=url, title='Old title', description='New description')
+    revalidate = FakeRevalidate(url, Revalidation(card=card, etag='"v2"'))
+    await RefreshScheduler(db_client, revalidate, SETTINGS).run_once()
+
+    assert (await db_client.get_card(edited.id)).description == 'My own notes'
+    assert (await db_client.get_card(untouched.id)).description == 'New description'
+    assert (await get_page(db_client, edited.id)).scraped.description == 'New description'
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_never_scraped(db_client):
+    # Added with the data the user typed, never scrapped
+    user = await db_client.add_user(utils.create_user())
+    board = await db_client.add_board(utils.create_public_board(), user.id)
+    url = f"https://www.{utils.get_random_name()}.com/title/1"
+    card = await db_client.add_card(NewCard(url=url, title='Typed title'), board.id)
+    await db_client.set_page_validators(card.id, None, None, datetime.now(timezone.utc) - timedelta(days=30))
+
+    revalidate = FakeRevalidate(url, Revalidation(card=NewCard(url=url, title='New title')))
+    await RefreshScheduler(db_client, revalidate, SETTINGS).run_once()
+    assert (await db_client.get_card(card.id)).title == 'Typed title'
+    assert (await get_page(db_client, card.id)).scraped.title == 'New title'
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_failed(db_client, stale_cards):
+    url = stale_cards[0].url
+    revalidate = FakeRevalidate(url, RecommendAppError("Timed out"))
+    await RefreshScheduler(db_client, revalidate, SETTINGS).run_once()
+    assert len(revalidate.calls) == 1
+
+    # Left as is, checked again once stale again
+    page = await get_page(db_client, stale_cards[0].id)
+    assert page.etag == '"v1"'
+    await RefreshScheduler(db_client, revalidate, SETTINGS).run_once()
+    assert len(revalidate.calls) == 1
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_stopped(db_client, stale_cards):
+    url = stale_cards[0].url
+    revalidate = FakeRevalidate(url, Revalidation(etag='"v1"'))
+    stop = asyncio.Event()
+    stop.set()
+
+    # Nothing fetched, the pages are left for the next pass
+    stats = await RefreshScheduler(db_client, revalidate, SETTINGS).run_once(stop)
+    assert stats.pages == 0
+    assert not revalidate.calls
+    page = await get_page(db_client, stale_cards[0].id)
+    assert page.scraped_at < datetime.now() - timedelta(days=1)
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_host_unavailable(db_client, stale_cards):
+    revalidate = FakeRevalidate(stale_cards[0].url, RecommendScrapperHostUnavailable("Failing host"))
+    stats = await RefreshScheduler(db_client, revalidate, SETTINGS).run_once()
+    assert stats.unavailable == 1
+    assert stats.failed == 0
+
+    # Not fetched: still stale
+    page = await get_page(db_client, stale_cards[0].id)
+    assert page.scraped_at < datetime.now() - timedelta(days=1)